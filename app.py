@@ -1,101 +1,87 @@
 import os
+import sys
 import streamlit as st
-import pandas as pd
-import joblib
 
 
 st.title("🏨 Hotel Booking Cancellation Predictor")
 ROOT = os.path.dirname(__file__)
-MODEL_PATH = os.path.join(ROOT, "notebooks", "artifacts", "best_model.joblib")
+MODEL_PATH = os.path.join(ROOT, "artifacts", "best_model.joblib")
+COMPILED_PATH = os.path.join(ROOT, "artifacts", "best_model.npz")
 
+# The saved pipeline references the preprocessing module in src/
+sys.path.insert(0, os.path.join(ROOT, "src"))
+from prediction_cache import CachedPipeline, PredictionCache  # noqa: E402
+from scoring import compiled_is_current, predict_with_threshold, risk_level, warm_up  # noqa: E402
 
-@st.cache_resource
-def load_model():
-    model = joblib.load(MODEL_PATH)
-    return model
 
+def artifact_state(path):
+    """(size, mtime) of path, or None when it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
 
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
-    """Preprocess hotel booking data for prediction"""
-    X = df.copy()
-    
-    # Create derived features
-    X['total_guests'] = X['adults'] + X['children'].fillna(0) + X['babies'].fillna(0)
-    X['total_nights'] = X['stays_in_weekend_nights'] + X['stays_in_week_nights']
-    
-    # Convert numeric columns
-    numeric_cols = ['lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
-                    'adults', 'children', 'babies', 'is_repeated_guest',
-                    'previous_cancellations', 'previous_bookings_not_canceled',
-                    'booking_changes', 'days_in_waiting_list', 'adr',
-                    'required_car_parking_spaces', 'total_of_special_requests',
-                    'total_guests', 'total_nights']
-    
-    for col in numeric_cols:
-        if col in X.columns:
-            X[col] = pd.to_numeric(X[col], errors='coerce')
-    
-    # One-hot encode categorical variables
-    categorical_cols = ['hotel', 'arrival_date_month', 'meal', 'country',
-                        'market_segment', 'distribution_channel', 'reserved_room_type',
-                        'assigned_room_type', 'deposit_type', 'customer_type']
-    
-    X_enc = pd.get_dummies(X, columns=categorical_cols, drop_first=True)
-    
-    # Fill missing values with 0
-    X_enc = X_enc.fillna(0)
-    
-    # Select only numeric columns for prediction
-    X_numeric = X_enc.select_dtypes(include=['number'])
-    
-    return X_numeric
+
+@st.cache_resource(max_entries=1)
+def load_model(model_state, compiled_state):
+    """Load the preprocessor + model pipeline once per version of the artifacts
+
+    The arguments only key the cache: a retrain changes best_model.joblib
+    and deletes the stale best_model.npz, so the next rerun loads the new
+    model. The NumPy-only export (03_model_training.py --export-compiled) is
+    used when it was exported from the current best_model.joblib, so the app
+    starts without importing scikit-learn; checking that hashes the joblib,
+    which happens here rather than on every rerun.
+
+    Wrapped in a prediction cache so re-uploading the same bookings is cheap;
+    the pipeline is reloaded when the artifact on disk changes. A warm-up
+    batch runs here so the first upload isn't the slow one.
+    """
+    path = COMPILED_PATH if compiled_is_current(COMPILED_PATH, MODEL_PATH) else MODEL_PATH
+    model = CachedPipeline.from_path(path, PredictionCache(max_entries=100_000))
+    warm_up(model.pipeline)
+    return model
 
 
 st.sidebar.markdown("### 📤 Upload CSV File")
 st.sidebar.markdown("Upload a CSV with the same columns as hotel_bookings.csv")
 uploaded = st.sidebar.file_uploader("CSV file", type=["csv"])
 
-if not os.path.exists(MODEL_PATH):
+if not (os.path.exists(MODEL_PATH) or os.path.exists(COMPILED_PATH)):
     st.warning(f"❌ Model not found at {MODEL_PATH}")
-    st.info("💡 Run the training notebook (03_model_training.ipynb) to create it.")
+    st.info("💡 Run src/02_feature_engineering.py and src/03_model_training.py to create it.")
 else:
-    model = load_model()
+    model = load_model(artifact_state(MODEL_PATH), artifact_state(COMPILED_PATH))
     st.success("✅ Model loaded successfully!")
+    cache_stats = model.cache.metrics()
+    if cache_stats['hit_rate'] is not None:
+        st.sidebar.caption(f"Prediction cache: {cache_stats['entries']} entries, "
+                           f"{cache_stats['hit_rate']*100:.0f}% hit rate")
     
     if uploaded is not None:
+        # pandas is only needed once there is a file to read
+        import pandas as pd
+        from schema import apply_schema
+
         try:
             # Read uploaded data
-            df = pd.read_csv(uploaded)
+            df = apply_schema(pd.read_csv(uploaded))
             st.write(f"**📊 Uploaded Data:** {len(df)} bookings")
             
             # Show preview
             with st.expander("👀 Preview uploaded data"):
                 st.dataframe(df.head(10))
             
-            # Preprocess
-            with st.spinner("Processing data..."):
-                X = preprocess(df)
-            
-            # Get model's expected features
-            try:
-                model_features = model.feature_names_in_
-                X_aligned = X.reindex(columns=model_features, fill_value=0)
-            except AttributeError:
-                # If model doesn't have feature_names_in_, use all columns
-                X_aligned = X
-            
-            # Make predictions
+            # Make predictions (the pipeline encodes and scales raw rows)
             with st.spinner("Making predictions..."):
-                preds = model.predict(X_aligned)
-                probs = model.predict_proba(X_aligned)[:, 1]
+                preds, probs = predict_with_threshold(model, df)
             
             # Add predictions to output
             out = df.copy()
             out["cancellation_prediction"] = preds
             out["cancellation_probability"] = probs
-            out["risk_level"] = pd.cut(probs, 
-                                       bins=[0, 0.3, 0.7, 1.0], 
-                                       labels=['Low', 'Medium', 'High'])
+            out["risk_level"] = risk_level(probs)
             
             # Display summary metrics
             st.markdown("---")
@@ -147,7 +133,9 @@ else:
         - `stays_in_weekend_nights`, `stays_in_week_nights`
         - `adults`, `children`, `babies`
         - `meal`, `market_segment`, `distribution_channel`
-        - `is_repeated_guest`, `previous_cancellations`, `booking_changes`
+        - `reserved_room_type`, `assigned_room_type`
+        - `is_repeated_guest`, `previous_cancellations`, `previous_bookings_not_canceled`
+        - `booking_changes`, `days_in_waiting_list`
         - `deposit_type`, `customer_type`
         - `adr`, `required_car_parking_spaces`, `total_of_special_requests`
         
@@ -0,0 +1,91 @@
+"""
+Benchmark - per-row feature construction vs the vectorized feature builders
+
+Times the derived-column code that 02_feature_engineering.py used to run
+(month dict .map, season via .apply, pandas flag columns, string encoding)
+against features.build_features and the fitted BookingPreprocessor, on rows
+resampled from the dataset. Costs are reported in seconds per million rows.
+
+Usage:
+    python benchmarks/feature_builders.py --data data/hotel_bookings.csv --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+
+from features import build_features, required_columns  # noqa: E402
+from preprocessing import BookingPreprocessor  # noqa: E402
+from schema import MONTH_NAMES, apply_schema  # noqa: E402
+
+
+def get_season(month):
+    if month in [12, 1, 2]:
+        return 'Winter'
+    elif month in [3, 4, 5]:
+        return 'Spring'
+    elif month in [6, 7, 8]:
+        return 'Summer'
+    else:
+        return 'Fall'
+
+
+def legacy_features(df):
+    """The original step 4-5 code of 02_feature_engineering.py"""
+    out = pd.DataFrame(index=df.index)
+    month_map = {name: i + 1 for i, name in enumerate(MONTH_NAMES)}
+    out['arrival_month_num'] = df['arrival_date_month'].astype(object).map(month_map)
+    out['season'] = out['arrival_month_num'].apply(get_season)
+    out['total_nights'] = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
+    out['total_guests'] = df['adults'] + df['children'] + df['babies']
+    out['has_children'] = (df['children'] > 0).astype(int)
+    out['has_babies'] = (df['babies'] > 0).astype(int)
+    out['has_special_requests'] = (df['total_of_special_requests'] > 0).astype(int)
+    return out
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(PROJECT_DIR, 'data', 'hotel_bookings.csv'))
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    sample = pd.read_csv(args.data, usecols=required_columns(extra_features=True))
+    rng = np.random.default_rng(0)
+    raw = sample.iloc[rng.integers(0, len(sample), args.rows)].reset_index(drop=True)
+    typed = apply_schema(raw.copy())
+    preprocessor = BookingPreprocessor().fit(typed.iloc[:100_000])
+    per_million = 1_000_000 / len(raw)
+
+    cases = [
+        ('legacy: map + apply(get_season)', lambda: legacy_features(raw)),
+        ('build_features (object columns)', lambda: build_features(raw)),
+        ('build_features (typed columns)', lambda: build_features(typed)),
+        ('build_features + calendar', lambda: build_features(typed, extra_features=True)),
+        ('BookingPreprocessor.transform (typed)', lambda: preprocessor.transform(typed)),
+    ]
+    print(f"Rows: {len(raw):,} | best of {args.repeat}")
+    print(f"{'case':<40} {'s / 1M rows':>12}")
+    for name, fn in cases:
+        seconds = best_time(fn, args.repeat)
+        print(f"{name:<40} {seconds * per_million:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark - load generator for the HTTP scoring service
+
+Fires single-booking POST /predict requests from many keep-alive client
+threads at a running scoring_service.py and reports requests/second and
+client-side p50/p99 latency.
+
+Usage:
+    python src/scoring_service.py --port 8000 &
+    python benchmarks/load_test_service.py --data test_data/test_mixed.csv --clients 64 --seconds 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def client_loop(host, port, bodies, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection(host, port)
+    headers = {'Content-Type': 'application/json'}
+    i = 0
+    while time.perf_counter() < stop_at:
+        body = bodies[i % len(bodies)]
+        i += 1
+        start = time.perf_counter()
+        conn.request('POST', '/predict', body, headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            errors.append(response.status)
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=os.path.join(PROJECT_DIR, 'test_data', 'test_mixed.csv'))
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    bodies = [df.iloc[[i]].to_json(orient='records')[1:-1] for i in range(len(df))]
+
+    per_client = [[] for _ in range(args.clients)]
+    errors = []
+    stop_at = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=client_loop,
+                         args=(args.host, args.port, bodies, stop_at, per_client[i], errors))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([np.array(l) for l in per_client]) * 1000.0
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"Requests: {len(latencies):,} in {elapsed:.1f} s ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"Errors: {len(errors)}")
+    print(f"Client latency p50: {p50:.2f} ms | p99: {p99:.2f} ms")
+
+    conn = http.client.HTTPConnection(args.host, args.port)
+    conn.request('GET', '/metrics')
+    print("Server metrics:", json.dumps(json.loads(conn.getresponse().read()), indent=2))
+
+
+if __name__ == '__main__':
+    main()
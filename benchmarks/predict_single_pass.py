@@ -0,0 +1,62 @@
+"""
+Benchmark - predict() + predict_proba() vs a single predict_proba pass
+
+Times the two-call scoring that app.py used to do against
+scoring.predict_with_threshold on the same rows, and checks that both
+produce identical labels.
+
+Usage:
+    python benchmarks/predict_single_pass.py --data data/hotel_bookings.csv --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+
+from scoring import MODEL_PATH, load_pipeline, predict_with_threshold  # noqa: E402
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(PROJECT_DIR, 'data', 'hotel_bookings.csv'))
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    pipeline = load_pipeline(args.model)
+    df = pd.read_csv(args.data, nrows=args.rows)
+    print(f"Model: {type(pipeline[-1]).__name__} | rows: {len(df):,} | best of {args.repeat}")
+
+    def two_passes():
+        return pipeline.predict(df), pipeline.predict_proba(df)[:, 1]
+
+    def single_pass():
+        return predict_with_threshold(pipeline, df)
+
+    assert np.array_equal(two_passes()[0], single_pass()[0]), "labels differ"
+
+    t_two = best_time(two_passes, args.repeat)
+    t_one = best_time(single_pass, args.repeat)
+    print(f"predict + predict_proba : {t_two * 1000:9.1f} ms")
+    print(f"predict_with_threshold  : {t_one * 1000:9.1f} ms")
+    print(f"speedup                 : {t_two / t_one:9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+"""
+Benchmark - pipeline and scoring suite with regression tracking
+
+Generates synthetic bookings (src/synthetic.py) with the hotel_bookings.csv
+schema at each requested size and times:
+  - load: CSV parse with the declared dtypes, and a warm columnar-cache load
+  - features: BookingPreprocessor fit and transform
+  - fit: each model trained by 03_model_training.py, including the
+    out-of-core SGD model (up to --fit-max-rows)
+  - predict: pipeline predict_proba latency and throughput per batch size,
+    for the joblib pipeline and its compiled NumPy-only export
+  - startup: cold start of a fresh Python process that imports the scoring
+    helpers, loads the model and scores one booking, for both artifacts
+and, once per run, the import time of each scoring entry point (python
+-X importtime), with its heaviest imports printed.
+
+Every run is appended to benchmarks/history.jsonl. With a baseline saved
+(--save-baseline writes benchmarks/baseline.json), any timing more than
+--threshold slower than its baseline value is reported and the suite exits
+with status 1. It also exits with status 1 if a compiled model's cold start
+exceeds --cold-start-target (COLD_START_TARGET_S, 1 second).
+
+Usage:
+    python benchmarks/suite.py --sizes 10k,100k,1M
+    python benchmarks/suite.py --sizes 10k,100k,1M,10M --fit-max-rows 1M --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(PROJECT_DIR, 'benchmarks')
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+
+import sklearn  # noqa: E402
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier  # noqa: E402
+from sklearn.linear_model import LogisticRegression, SGDClassifier  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from compiled_model import CompiledModel  # noqa: E402
+from data_store import load_dataset  # noqa: E402
+from model_export import export  # noqa: E402
+from scoring import save_artifact  # noqa: E402
+from preprocessing import BookingPreprocessor  # noqa: E402
+from schema import CSV_DTYPES, apply_schema  # noqa: E402
+import streaming  # noqa: E402
+import synthetic  # noqa: E402
+
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+HISTORY_PATH = os.path.join(BENCH_DIR, 'history.jsonl')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+BATCH_SIZES = [1, 32, 1024, 65536]
+
+# Entry points whose import time is tracked
+STARTUP_MODULES = ['scoring', 'compiled_model', 'scoring_service', 'async_scoring_service',
+                   'batch_scoring']
+# A compiled model must be scoring within this many seconds of process start
+COLD_START_TARGET_S = 1.0
+COLD_START_SCRIPT = """
+import sys
+from scoring import booking_rows, load_pipeline, predict_with_threshold
+import json
+pipeline = load_pipeline(sys.argv[1])
+predict_with_threshold(pipeline, booking_rows([json.loads(sys.argv[2])], pipeline))
+"""
+
+# Same settings as 03_model_training.py
+MODELS = {
+    'lr': lambda: LogisticRegression(max_iter=1000, random_state=42, class_weight='balanced'),
+    'rf': lambda: RandomForestClassifier(n_estimators=100, max_depth=15, min_samples_split=10,
+                                         min_samples_leaf=5, random_state=42,
+                                         class_weight='balanced', n_jobs=-1),
+    'hgb': lambda: HistGradientBoostingClassifier(max_iter=300, learning_rate=0.1,
+                                                  class_weight='balanced', early_stopping=True,
+                                                  random_state=42),
+    # Trained with streaming.fit_sgd (chunked partial_fit epochs), as 03 does
+    'sgd': lambda: SGDClassifier(**streaming.SGD_PARAMS),
+}
+
+
+def size_label(n):
+    return f'{n // 10**6}M' if n >= 10**6 and n % 10**6 == 0 else (
+        f'{n // 10**3}k' if n % 10**3 == 0 else str(n))
+
+
+def dataset_path(n, profile, profile_name='default', seed=0):
+    """Synthetic CSV with n rows, generated once and reused across runs"""
+    path = os.path.join(DATA_DIR, f'bookings_{profile_name}_{size_label(n)}_s{seed}.csv')
+    if not os.path.exists(path):
+        synthetic.write(profile, n, path, seed=seed)
+    return path
+
+
+def timed(fn, repeat=1):
+    """(best wall time in seconds, result of the last call)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_predict(pipeline, df, batch_sizes, budget_seconds=1.0):
+    """Per-batch latency (p50, ms) and throughput (rows/s) per batch size"""
+    results = {}
+    for batch in batch_sizes:
+        if batch > len(df):
+            continue
+        latencies, rows, start = [], 0, time.perf_counter()
+        offset = 0
+        while time.perf_counter() - start < budget_seconds or len(latencies) < 3:
+            if offset + batch > len(df):
+                offset = 0
+            rows_batch = df.iloc[offset:offset + batch]
+            t0 = time.perf_counter()
+            pipeline.predict_proba(rows_batch)
+            latencies.append(time.perf_counter() - t0)
+            rows += batch
+            offset += batch
+        results[batch] = {'p50_ms': float(np.median(latencies) * 1e3),
+                          'rows_per_second': rows / sum(latencies)}
+    return results
+
+
+def _src_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.join(PROJECT_DIR, 'src'),
+                                                      env.get('PYTHONPATH')]))
+    return env
+
+
+def import_times(module, repeat=3):
+    """(best cumulative import seconds, heaviest top-level imports) from -X importtime"""
+    best, heaviest = float('inf'), []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                env=_src_env(), capture_output=True, text=True, check=True)
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((int(cumulative) / 1e6, depth, name.strip()))
+        seconds = rows[-1][0]
+        if seconds < best:
+            # Children are listed before their parent: the entry point's direct
+            # imports are the depth-1 rows after the previous top-level import
+            start = max((i for i, row in enumerate(rows[:-1]) if row[1] == 0), default=-1) + 1
+            direct = [(t, name) for t, depth, name in rows[start:-1] if depth == 1]
+            best, heaviest = seconds, sorted(direct, reverse=True)[:5]
+    return best, heaviest
+
+
+def cold_start(model_path, booking_json, repeat=3):
+    """Best wall time of a fresh process that imports, loads and scores one booking"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', COLD_START_SCRIPT, model_path, booking_json],
+                       env=_src_env(), check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_startup(repeat):
+    metrics = {}
+    print("\n[startup] import time per entry point")
+    for module in STARTUP_MODULES:
+        seconds, heaviest = import_times(module, repeat)
+        metrics[f'startup/import/{module}_s'] = seconds
+        print(f"  {module:<24} {seconds:>8.3f} s   "
+              + ', '.join(f'{name} {t:.3f}' for t, name in heaviest))
+    return metrics
+
+
+def run_size(n, profile, profile_name, fit_max_rows, batch_sizes, repeat):
+    """All timings for one dataset size, as {metric name: value}"""
+    label = size_label(n)
+    metrics = {}
+    path = dataset_path(n, profile, profile_name)
+    print(f"\n[{label}] {path}")
+
+    seconds, df = timed(lambda: apply_schema(pd.read_csv(path, dtype=CSV_DTYPES)))
+    metrics[f'{label}/load/csv_s'] = seconds
+    load_dataset(path, typed=True)  # build the columnar cache
+    seconds, df = timed(lambda: load_dataset(path, typed=True), repeat)
+    metrics[f'{label}/load/cached_s'] = seconds
+
+    booking_json = df.drop(columns='is_canceled').head(1).to_json(orient='records')[1:-1]
+    y = df['is_canceled'].to_numpy()
+    seconds, preprocessor = timed(lambda: BookingPreprocessor().fit(df))
+    metrics[f'{label}/features/fit_s'] = seconds
+    seconds, X = timed(lambda: preprocessor.transform(df), repeat)
+    metrics[f'{label}/features/transform_s'] = seconds
+
+    if n <= fit_max_rows:
+        for name, make_model in MODELS.items():
+            model = make_model()
+            step = preprocessor
+            X_fit = X
+            if name == 'hgb':
+                step = preprocessor.with_categorical_codes()
+                X_fit = preprocessor.restore_codes(X)
+                model.set_params(categorical_features=preprocessor.categorical_mask())
+            if name == 'sgd':
+                seconds, model = timed(lambda: streaming.fit_sgd(X_fit, y))
+            else:
+                seconds, _ = timed(lambda: model.fit(X_fit, y))
+            metrics[f'{label}/fit/{name}_s'] = seconds
+
+            pipeline = Pipeline([('preprocessor', step), ('model', model)])
+            compiled_path = os.path.join(DATA_DIR, f'{name}_{label}.npz')
+            export(pipeline, compiled_path)
+            joblib_path = os.path.join(DATA_DIR, f'{name}_{label}.joblib')
+            save_artifact(pipeline, joblib_path)
+            metrics[f'{label}/startup/{name}_s'] = cold_start(joblib_path, booking_json, repeat)
+            metrics[f'{label}/startup/{name}_compiled_s'] = cold_start(compiled_path, booking_json, repeat)
+            scorers = {name: pipeline, f'{name}_compiled': CompiledModel.load(compiled_path)}
+            for scorer_name, scorer in scorers.items():
+                for batch, result in bench_predict(scorer, df, batch_sizes).items():
+                    prefix = f'{label}/predict/{scorer_name}/batch_{batch}'
+                    metrics[f'{prefix}/p50_ms'] = result['p50_ms']
+                    metrics[f'{prefix}/rows_per_second'] = result['rows_per_second']
+
+    for key, value in metrics.items():
+        print(f"  {key:<46} {value:>14.4f}")
+    return metrics
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {'host': platform.node(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'python': platform.python_version(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'sklearn': sklearn.__version__}
+
+
+def higher_is_better(metric):
+    return metric.endswith('rows_per_second')
+
+
+def find_regressions(metrics, baseline, threshold):
+    """Metrics that are more than threshold worse than the baseline"""
+    regressions = []
+    for key, value in metrics.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        change = (base - value) / base if higher_is_better(key) else (value - base) / base
+        if change > threshold:
+            regressions.append((key, base, value, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k,1M',
+                        help="Comma-separated dataset sizes (e.g. 10k,100k,1M,10M)")
+    parser.add_argument('--fit-max-rows', default='1M',
+                        help="Skip model fits and predictions above this size")
+    parser.add_argument('--profile',
+                        help="Generator profile JSON (src/synthetic.py --save-profile); default built-in")
+    parser.add_argument('--batch-sizes', default=','.join(map(str, BATCH_SIZES)))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Repeats for the cheaper timings (best is kept)")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    parser.add_argument('--history', default=HISTORY_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store this run as the new baseline")
+    parser.add_argument('--cold-start-target', type=float, default=COLD_START_TARGET_S,
+                        help="Longest allowed cold start of a compiled model, in seconds")
+    args = parser.parse_args(argv)
+
+    sizes = [synthetic.parse_rows(s) for s in args.sizes.split(',')]
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+    fit_max_rows = synthetic.parse_rows(args.fit_max_rows)
+    if args.profile:
+        profile = synthetic.load_profile(args.profile)
+        profile_name = os.path.splitext(os.path.basename(args.profile))[0]
+    else:
+        profile, profile_name = synthetic.default_profile(), 'default'
+
+    metrics = run_startup(args.repeat)
+    for n in sizes:
+        metrics.update(run_size(n, profile, profile_name, fit_max_rows, batch_sizes, args.repeat))
+
+    record = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': git_commit(),
+              'environment': environment(), 'metrics': metrics}
+    with open(args.history, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    print(f"\n✓ Appended results to {args.history}")
+
+    status = 0
+    slow = {key: value for key, value in metrics.items()
+            if '/startup/' in key and key.endswith('_compiled_s') and value > args.cold_start_target}
+    if slow:
+        status = 1
+        print(f"✗ Cold start above the {args.cold_start_target:.2f} s target:")
+        for key, value in slow.items():
+            print(f"  {key:<46} {value:>12.4f}")
+    else:
+        print(f"✓ Compiled cold starts within the {args.cold_start_target:.2f} s target")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(record, f, indent=2)
+        print(f"✓ Saved baseline to {args.baseline}")
+        return status
+    if not os.path.exists(args.baseline):
+        print("No baseline yet (run with --save-baseline to create one)")
+        return status
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['environment'].get('host') != record['environment']['host']:
+        print(f"⚠️  Baseline was recorded on {baseline['environment'].get('host')}")
+    regressions = find_regressions(metrics, baseline['metrics'], args.threshold)
+    if not regressions:
+        print(f"✓ No regressions beyond {args.threshold:.0%} vs baseline {baseline.get('commit')}")
+        return status
+    print(f"✗ {len(regressions)} regressions beyond {args.threshold:.0%} vs baseline {baseline.get('commit')}:")
+    for key, base, value, change in regressions:
+        print(f"  {key:<46} {base:>12.4f} -> {value:>12.4f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
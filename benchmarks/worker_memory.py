@@ -0,0 +1,102 @@
+"""
+Benchmark - memory per scoring worker
+
+Starts --workers processes that each score a batch of bookings and reports
+their memory from /proc/<pid>/smaps_rollup (Linux only) in three modes:
+  - fork:   the parent loads the pipeline, the workers inherit it
+            (batch_scoring.py --workers on platforms with fork)
+  - mmap:   every worker loads the pipeline itself with mmap_mode='r'
+            (scoring.load_pipeline, as the services do)
+  - nommap: every worker loads it with a plain joblib.load
+
+Private memory is what each additional worker costs. All workers are forked
+from a parent that has already imported scikit-learn, so library code is
+shared in every mode and the difference is the model itself.
+
+Usage:
+    python benchmarks/worker_memory.py --model artifacts/best_model.joblib --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import numpy as np
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+
+import synthetic  # noqa: E402
+from schema import apply_schema  # noqa: E402
+from scoring import MODEL_PATH, load_pipeline  # noqa: E402
+
+MODES = ['fork', 'mmap', 'nommap']
+
+# Set in the parent for mode 'fork' only
+_pipeline = None
+
+
+def memory_mb():
+    """Rss, Pss and Private (clean + dirty) of this process in MB"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty'):
+                fields[name] = int(value.split()[0]) / 1024
+    return {'rss': fields['Rss'], 'pss': fields['Pss'],
+            'private': fields['Private_Clean'] + fields['Private_Dirty']}
+
+
+def _worker(mode, model_path, rows, measured, results):
+    pipeline = _pipeline
+    if mode != 'fork':
+        pipeline = load_pipeline(model_path, mmap_mode='r' if mode == 'mmap' else None)
+    pipeline.predict_proba(rows)
+    results.put(memory_mb())
+    # Stay alive until every worker has measured, so PSS splits shared pages between all of them
+    measured.wait()
+
+
+def measure(mode, model_path, rows, workers):
+    """Mean memory of `workers` processes scoring rows in the given mode"""
+    global _pipeline
+    _pipeline = load_pipeline(model_path) if mode == 'fork' else None
+    ctx = multiprocessing.get_context('fork')
+    results, measured = ctx.Queue(), ctx.Event()
+    processes = [ctx.Process(target=_worker, args=(mode, model_path, rows, measured, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    measured.set()
+    for process in processes:
+        process.join()
+    _pipeline = None
+    return {key: float(np.mean([s[key] for s in samples])) for key in samples[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=2000, help="Synthetic bookings each worker scores")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists('/proc/self/smaps_rollup') or \
+            'fork' not in multiprocessing.get_all_start_methods():
+        sys.exit("worker_memory.py needs Linux (fork and /proc/<pid>/smaps_rollup)")
+
+    rows = apply_schema(synthetic.generate(synthetic.default_profile(), args.rows, seed=0))
+    # Imports scikit-learn in the parent, so every mode starts from the same shared libraries
+    load_pipeline(args.model).predict_proba(rows.head(10))
+    print(f"Model: {args.model} ({os.path.getsize(args.model) / 1024**2:.1f} MB) | "
+          f"{args.workers} workers | {len(rows):,} rows each")
+    print(f"{'mode':<8} {'private MB':>11} {'PSS MB':>9} {'RSS MB':>9}   (mean per worker)")
+    for mode in MODES:
+        m = measure(mode, args.model, rows, args.workers)
+        print(f"{mode:<8} {m['private']:>11.1f} {m['pss']:>9.1f} {m['rss']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,33 +6,48 @@ This script explores the hotel booking dataset and creates initial features.
 Goal: Understand the dataset and create basic features for further analysis
 """
 
+import argparse
 import pandas as pd
 import numpy as np
+from aggregates import DERIVED_COLUMNS, Aggregates, store_aggregates
+from data_store import load_dataset, save_dataset
+from profiling import StepRecorder, add_profiling_args
+from schema import memory_report
 import warnings
 warnings.filterwarnings('ignore')
 
+parser = argparse.ArgumentParser(description="Explore the bookings dataset")
+add_profiling_args(parser)
+args = parser.parse_args()
+steps = StepRecorder.from_args('data_exploration', args)
+
 print("=" * 70)
 print("HOTEL BOOKING DEMAND - DATA EXPLORATION")
 print("=" * 70)
 
 # Import Libraries
-print("\n1. Importing libraries...")
+steps.start("1. Importing libraries...")
 print("✓ Libraries imported successfully!")
 
 # Load Data
-print("\n2. Loading dataset...")
-df = pd.read_csv('../data/hotel_bookings.csv')
+steps.start("2. Loading dataset...")
+# Typed load: categoricals and compact numeric widths from schema.py
+df = load_dataset('data/hotel_bookings.csv', typed=True)
 print(f"✓ Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns")
+# Counts and cancellations per value of every analysed column in one pass;
+# steps 5-13 read these instead of the rows, and the EDA figures reuse the cache
+agg = Aggregates.from_frame(df)
+store_aggregates(agg, 'data/hotel_bookings.csv')
 
 # Basic Info
-print("\n3. Dataset Overview:")
+steps.start("3. Dataset Overview:")
 print("=" * 70)
 print(df.head())
 print(f"\nDataset shape: {df.shape}")
-print(f"Memory usage: {df.memory_usage().sum() / 1024**2:.2f} MB")
+print(f"Memory usage: {memory_report(df)}")
 
 # Check Missing Values
-print("\n4. Missing Values Analysis:")
+steps.start("4. Missing Values Analysis:")
 print("=" * 70)
 missing = df.isnull().sum()
 missing_pct = (missing / len(df)) * 100
@@ -48,83 +63,82 @@ else:
     print("✓ No missing values found!")
 
 # Analyze Cancellations
-print("\n5. Cancellation Analysis:")
+steps.start("5. Cancellation Analysis:")
 print("=" * 70)
-cancellation_rate = df['is_canceled'].mean() * 100
+cancellation_rate = agg.n_canceled / agg.n_rows * 100
 print(f"Overall cancellation rate: {cancellation_rate:.2f}%")
-print(f"Total bookings: {len(df)}")
-print(f"Canceled: {df['is_canceled'].sum()}")
-print(f"Not canceled: {(df['is_canceled'] == 0).sum()}")
+print(f"Total bookings: {agg.n_rows}")
+print(f"Canceled: {agg.n_canceled}")
+print(f"Not canceled: {agg.n_rows - agg.n_canceled}")
 
 # Analyze Hotel Types
-print("\n6. Hotel Types Analysis:")
+steps.start("6. Hotel Types Analysis:")
 print("=" * 70)
-hotel_counts = df['hotel'].value_counts()
+hotel_counts = agg.value_counts('hotel')
 print(hotel_counts)
 print(f"\nCancellation rate by hotel:")
-for hotel in df['hotel'].unique():
-    rate = df[df['hotel'] == hotel]['is_canceled'].mean() * 100
-    print(f"  {hotel}: {rate:.2f}%")
+for hotel, rate in agg.cancel_rate('hotel').items():
+    print(f"  {hotel}: {rate * 100:.2f}%")
 
 # Analyze Guests
-print("\n7. Guest Analysis:")
+steps.start("7. Guest Analysis:")
 print("=" * 70)
-print(f"Average adults per booking: {df['adults'].mean():.2f}")
-print(f"Average children per booking: {df['children'].mean():.2f}")
-print(f"Average babies per booking: {df['babies'].mean():.2f}")
-total_guests = df['adults'] + df['children'].fillna(0) + df['babies']
-print(f"Average total guests per booking: {total_guests.mean():.2f}")
+print(f"Average adults per booking: {agg.stats('adults')['mean']:.2f}")
+print(f"Average children per booking: {agg.stats('children')['mean']:.2f}")
+print(f"Average babies per booking: {agg.stats('babies')['mean']:.2f}")
+print(f"Average total guests per booking: {agg.stats('total_guests')['mean']:.2f}")
 
 # Analyze Temporal Patterns
-print("\n8. Temporal Patterns:")
+steps.start("8. Temporal Patterns:")
 print("=" * 70)
 print("Bookings by arrival month:")
-print(df['arrival_date_month'].value_counts().sort_index())
+print(agg.table('arrival_date_month')['bookings'].rename('count'))
 print(f"\nBookings by year:")
-print(df['arrival_date_year'].value_counts().sort_index())
+print(agg.table('arrival_date_year')['bookings'].rename('count'))
 
 # Analyze Stay Duration
-print("\n9. Stay Duration Analysis:")
+steps.start("9. Stay Duration Analysis:")
 print("=" * 70)
-print(f"Average weekend nights: {df['stays_in_weekend_nights'].mean():.2f}")
-print(f"Average week nights: {df['stays_in_week_nights'].mean():.2f}")
-total_nights = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
-print(f"Average total nights: {total_nights.mean():.2f}")
-print(f"Max total nights: {total_nights.max()}")
+print(f"Average weekend nights: {agg.stats('stays_in_weekend_nights')['mean']:.2f}")
+print(f"Average week nights: {agg.stats('stays_in_week_nights')['mean']:.2f}")
+total_nights = agg.stats('total_nights')
+print(f"Average total nights: {total_nights['mean']:.2f}")
+print(f"Max total nights: {total_nights['max']}")
 
 # Analyze Lead Time
-print("\n10. Lead Time Analysis:")
+steps.start("10. Lead Time Analysis:")
 print("=" * 70)
-print(f"Average lead time: {df['lead_time'].mean():.2f} days")
-print(f"Median lead time: {df['lead_time'].median():.2f} days")
-print(f"Max lead time: {df['lead_time'].max()} days")
+lead_time = agg.stats('lead_time')
+print(f"Average lead time: {lead_time['mean']:.2f} days")
+print(f"Median lead time: {lead_time['median']:.2f} days")
+print(f"Max lead time: {lead_time['max']} days")
 
 # Analyze ADR (Average Daily Rate)
-print("\n11. ADR (Average Daily Rate) Analysis:")
+steps.start("11. ADR (Average Daily Rate) Analysis:")
 print("=" * 70)
-adr_data = df[df['adr'] > 0]['adr']
-print(f"Average ADR: ${adr_data.mean():.2f}")
-print(f"Median ADR: ${adr_data.median():.2f}")
-print(f"Min ADR: ${adr_data.min():.2f}")
-print(f"Max ADR: ${adr_data.max():.2f}")
+adr_data = agg.stats('adr', mask_fn=lambda adr: adr > 0)
+print(f"Average ADR: ${adr_data['mean']:.2f}")
+print(f"Median ADR: ${adr_data['median']:.2f}")
+print(f"Min ADR: ${adr_data['min']:.2f}")
+print(f"Max ADR: ${adr_data['max']:.2f}")
 
 # Analyze Market Segment
-print("\n12. Market Segment Analysis:")
+steps.start("12. Market Segment Analysis:")
 print("=" * 70)
-print(df['market_segment'].value_counts())
+print(agg.value_counts('market_segment'))
 
 # Create Additional Features
-print("\n13. Creating Additional Features:")
+steps.start("13. Creating Additional Features:")
 print("=" * 70)
-df['total_guests'] = df['adults'] + df['children'].fillna(0) + df['babies']
-df['total_nights'] = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
+for name, derive in DERIVED_COLUMNS.items():
+    df[name] = derive(df)
 print("✓ Created features:")
-print(f"  - total_guests: Average {df['total_guests'].mean():.2f}")
-print(f"  - total_nights: Average {df['total_nights'].mean():.2f}")
+print(f"  - total_guests: Average {agg.stats('total_guests')['mean']:.2f}")
+print(f"  - total_nights: Average {agg.stats('total_nights')['mean']:.2f}")
 
 # Save Explored Data
-print("\n14. Saving explored data...")
-df.to_csv('data/hotel_bookings_explored.csv', index=False)
+steps.start("14. Saving explored data...")
+save_dataset(df, 'data/hotel_bookings_explored.csv', typed=True)
 print("✓ Data saved to: data/hotel_bookings_explored.csv")
 
 print("\n" + "=" * 70)
@@ -132,6 +146,8 @@ print("DATA EXPLORATION COMPLETE!")
 print("=" * 70)
 print(f"✓ Dataset: {df.shape[0]} rows, {df.shape[1]} columns")
 print(f"✓ Cancellation rate: {cancellation_rate:.2f}%")
-print(f"✓ Average guests: {df['total_guests'].mean():.2f}")
-print(f"✓ Average nights: {df['total_nights'].mean():.2f}")
+print(f"✓ Average guests: {agg.stats('total_guests')['mean']:.2f}")
+print(f"✓ Average nights: {agg.stats('total_nights')['mean']:.2f}")
 print("✓ Ready for feature engineering!")
+
+steps.finish()
@@ -4,206 +4,189 @@ Hotel Booking Demand - Feature Engineering
 This script creates features from the hotel booking dataset to prepare for machine learning.
 
 Goal: Transform raw data into meaningful features for cancellation prediction
+
+Usage:
+    python src/02_feature_engineering.py [--export-csv] [--extra-features] [--chunk-rows 100000]
+
+The train/test matrices go to data/features/ as float32 .npy files;
+--export-csv also writes the old data/X_*.csv / y_*.csv copies for debugging.
+
+The dataset is read from its memory-mapped columnar cache one chunk of
+--chunk-rows rows at a time, so memory is bounded by the chunk size:
+  - pass 1 builds each chunk's features once, updates the preprocessing
+    pipeline with its training rows (partial_fit) and writes the encoded,
+    unscaled rows into the feature store,
+  - pass 2 scales the stored matrices in place with the final statistics.
+Test rows are encoded against the labels seen so far in the test split and
+mapped onto the training categories in pass 2, so the pipeline is fitted on
+training rows only and unseen test categories get -1, as in transform().
+(Building the columnar cache of a new CSV still parses it in one go.)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 import joblib
+from data_store import open_dataset
+from feature_store import FEATURE_DIR, finish_matrices, open_matrices
+from features import build_features, required_columns, take_rows
+from preprocessing import BookingPreprocessor, CATEGORICAL_COLUMNS, check_columns, model_features
+from profiling import StepRecorder, add_profiling_args
+from streaming import DEFAULT_CHUNK_ROWS, chunk_bounds
 import warnings
 warnings.filterwarnings('ignore')
 
+parser = argparse.ArgumentParser(description="Build model features")
+parser.add_argument('--export-csv', action='store_true',
+                    help="Also write scaled features as CSV (debug output)")
+parser.add_argument('--extra-features', action='store_true',
+                    help="Add arrival weekday and day-of-year to the model features")
+parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                    help="Rows read, featurized and written at a time")
+add_profiling_args(parser)
+args = parser.parse_args()
+steps = StepRecorder.from_args('feature_engineering', args)
+
 print("=" * 70)
 print("HOTEL BOOKING DEMAND - FEATURE ENGINEERING")
 print("=" * 70)
 
 # Import Libraries
-print("\n1. Importing libraries...")
+steps.start("1. Importing libraries...")
 print("✓ Libraries imported successfully!")
 
-# Load Data
-print("\n2. Loading explored dataset...")
-df = pd.read_csv('data/hotel_bookings_explored.csv')
-print(f"✓ Dataset loaded: {df.shape}")
-print(df.head())
-
-# Handle Missing Values
-print("\n3. Handling missing values...")
-# Fill missing children with 0
-if 'children' in df.columns:
-    df['children'].fillna(0, inplace=True)
-
-# Fill missing country with 'Unknown'
-if 'country' in df.columns:
-    df['country'].fillna('Unknown', inplace=True)
-
-# Fill missing agent with 0
-if 'agent' in df.columns:
-    df['agent'].fillna(0, inplace=True)
-
-# Fill missing company with 0
-if 'company' in df.columns:
-    df['company'].fillna(0, inplace=True)
-
-print("✓ Missing values handled")
-print(f"Remaining missing values: {df.isnull().sum().sum()}")
-
-# Feature Engineering - Temporal Features
-print("\n4. Creating temporal features...")
-# Map months to numbers
-month_map = {
-    'January': 1, 'February': 2, 'March': 3, 'April': 4,
-    'May': 5, 'June': 6, 'July': 7, 'August': 8,
-    'September': 9, 'October': 10, 'November': 11, 'December': 12
-}
-df['arrival_month_num'] = df['arrival_date_month'].map(month_map)
-
-# Create season feature
-def get_season(month):
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Spring'
-    elif month in [6, 7, 8]:
-        return 'Summer'
-    else:
-        return 'Fall'
-
-df['season'] = df['arrival_month_num'].apply(get_season)
-
-print("✓ Temporal features created")
-print(f"  - arrival_month_num")
-print(f"  - season")
-
-# Feature Engineering - Booking Features
-print("\n5. Creating booking features...")
-# Total stay in nights (if not already created)
-if 'total_nights' not in df.columns:
-    df['total_nights'] = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
-
-# Total guests (if not already created)
-if 'total_guests' not in df.columns:
-    df['total_guests'] = df['adults'] + df['children'] + df['babies']
-
-# Has children flag
-df['has_children'] = (df['children'] > 0).astype(int)
-
-# Has babies flag
-df['has_babies'] = (df['babies'] > 0).astype(int)
-
-# Special requests flag
-df['has_special_requests'] = (df['total_of_special_requests'] > 0).astype(int)
-
-# Is repeated guest flag already exists in original data
-
-print("✓ Booking features created")
-print(f"  - total_nights: {df['total_nights'].mean():.2f} avg")
-print(f"  - total_guests: {df['total_guests'].mean():.2f} avg")
-print(f"  - has_children: {df['has_children'].sum()} bookings")
-print(f"  - has_babies: {df['has_babies'].sum()} bookings")
-print(f"  - has_special_requests: {df['has_special_requests'].sum()} bookings")
-
-# Select Features for Modeling
-print("\n6. Selecting features for modeling...")
-# Select relevant features
-feature_columns = [
-    'hotel', 'lead_time', 'arrival_month_num', 'season',
-    'stays_in_weekend_nights', 'stays_in_week_nights', 'total_nights',
-    'adults', 'children', 'babies', 'total_guests',
-    'meal', 'market_segment', 'distribution_channel',
-    'is_repeated_guest', 'previous_cancellations',
-    'previous_bookings_not_canceled', 'reserved_room_type',
-    'assigned_room_type', 'booking_changes', 'deposit_type',
-    'days_in_waiting_list', 'customer_type', 'adr',
-    'required_car_parking_spaces', 'total_of_special_requests',
-    'has_children', 'has_babies', 'has_special_requests'
-]
-
-# Keep only features that exist
-feature_columns = [col for col in feature_columns if col in df.columns]
-
-X = df[feature_columns].copy()
-y = df['is_canceled'].copy()
-
-print(f"✓ Selected {len(feature_columns)} features")
+# Open Data
+steps.start("2. Opening explored dataset...")
+# Only the columns the pipeline uses are mapped from the columnar cache;
+# rows are converted to pandas one chunk at a time
+table = open_dataset('data/hotel_bookings_explored.csv',
+                     columns=required_columns(args.extra_features) + ['is_canceled'], typed=True)
+check_columns(table.slice(0, 0).to_pandas(), args.extra_features)
+n_rows = table.num_rows
+feature_columns = model_features(args.extra_features)
+y = pd.Series(table.column('is_canceled').to_numpy(), name='is_canceled')
+print(f"✓ Dataset opened: {n_rows} rows x {table.num_columns} columns")
+print(f"✓ {len(chunk_bounds(n_rows, args.chunk_rows))} chunk(s) of up to {args.chunk_rows:,} rows")
 print(f"✓ Target variable: is_canceled")
-print(f"✓ Dataset shape: {X.shape}")
-
-# Encode Categorical Variables
-print("\n7. Encoding categorical variables...")
-# Identify categorical columns
-categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
-
-print(f"Encoding {len(categorical_cols)} categorical columns:")
-print(categorical_cols)
-
-# Encode categorical variables
-encoders = {}
-for col in categorical_cols:
-    le = LabelEncoder()
-    X[col] = le.fit_transform(X[col].astype(str))
-    encoders[col] = le
-
-print(f"\n✓ All categorical variables encoded")
-print(f"✓ Encoders saved: {len(encoders)}")
 
 # Train-Test Split
-print("\n8. Performing train-test split...")
-# Split data
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
+steps.start("3. Performing train-test split...")
+# Split row positions (only the labels are read) so the pipeline is fitted
+# on training data only
+train_pos, test_pos, y_train, y_test = train_test_split(
+    np.arange(n_rows), y, test_size=0.2, random_state=42, stratify=y
 )
+# Row of each source row in the stored matrix of its split (-1 in the other one)
+train_slot = np.full(n_rows, -1, dtype=np.int64)
+train_slot[train_pos] = np.arange(len(train_pos))
+test_slot = np.full(n_rows, -1, dtype=np.int64)
+test_slot[test_pos] = np.arange(len(test_pos))
 
 print("Train-Test Split:")
 print("=" * 50)
-print(f"Training set: {X_train.shape[0]} samples")
-print(f"Test set: {X_test.shape[0]} samples")
+print(f"Training set: {len(train_pos)} samples")
+print(f"Test set: {len(test_pos)} samples")
 print(f"\nTraining set cancellation rate: {y_train.mean()*100:.2f}%")
 print(f"Test set cancellation rate: {y_test.mean()*100:.2f}%")
 
-# Feature Scaling
-print("\n9. Scaling features...")
-# Scale numerical features
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
+# Build Features and Fit Preprocessing Pipeline
+steps.start("4. Building features and fitting the preprocessing pipeline chunk by chunk...")
+preprocessor = BookingPreprocessor(extra_features=args.extra_features)
+# Collects the test split's category labels, so test rows can be encoded
+# before the training categories are final
+test_vocabulary = BookingPreprocessor(scale=False, extra_features=args.extra_features)
+matrices = open_matrices(len(train_pos), len(test_pos), len(feature_columns))
+missing = 0
+totals = dict.fromkeys(['total_nights', 'total_guests', 'has_children', 'has_babies',
+                        'has_special_requests'], 0.0)
+
+for lo, hi in chunk_bounds(n_rows, args.chunk_rows):
+    chunk = table.slice(lo, hi - lo).to_pandas()
+    missing += int(chunk.isnull().sum().sum())
+    # All derived columns are built in one vectorized pass (features.py):
+    # months and seasons come from NumPy lookup tables instead of a per-row apply
+    features = build_features(chunk, extra_features=args.extra_features)
+    for col in totals:
+        totals[col] += float(features[col].sum())
+
+    in_train = train_slot[lo:hi] >= 0
+    train_features = take_rows(features, np.flatnonzero(in_train))
+    test_features = take_rows(features, np.flatnonzero(~in_train))
+    # Categories are only ever appended, so rows encoded now keep their codes
+    if in_train.any():
+        preprocessor.partial_fit(train_features)
+        matrices['X_train'][train_slot[lo:hi][in_train]] = preprocessor.encode(train_features)
+    if not in_train.all():
+        test_vocabulary.partial_fit(test_features)
+        matrices['X_test'][test_slot[lo:hi][~in_train]] = test_vocabulary.encode(test_features)
+
+print(f"✓ Missing values in model inputs: {missing} (filled with 0, or the 'nan' category)")
+print("✓ Temporal features created")
+print(f"  - arrival_month_num")
+print(f"  - season")
+if args.extra_features:
+    print(f"  - arrival_weekday, arrival_day_of_year")
+print("✓ Booking features created")
+print(f"  - total_nights: {totals['total_nights'] / n_rows:.2f} avg")
+print(f"  - total_guests: {totals['total_guests'] / n_rows:.2f} avg")
+print(f"  - has_children: {int(totals['has_children'])} bookings")
+print(f"  - has_babies: {int(totals['has_babies'])} bookings")
+print(f"  - has_special_requests: {int(totals['has_special_requests'])} bookings")
+print(f"Encoding {len(CATEGORICAL_COLUMNS)} categorical columns:")
+print(CATEGORICAL_COLUMNS)
+print(f"✓ Selected {len(feature_columns)} features")
+print("✓ Categories and scaling statistics fitted on training set")
 
-# Convert back to DataFrame
-X_train_scaled = pd.DataFrame(X_train_scaled, columns=X_train.columns, index=X_train.index)
-X_test_scaled = pd.DataFrame(X_test_scaled, columns=X_test.columns, index=X_test.index)
+# Scale Features
+steps.start("5. Scaling features...")
+for name, X in matrices.items():
+    for lo, hi in chunk_bounds(len(X), args.chunk_rows):
+        X_chunk = np.asarray(X[lo:hi], dtype=np.float64)
+        if name == 'X_test':
+            preprocessor.recode(X_chunk, test_vocabulary.categories_)
+        X[lo:hi] = preprocessor.scale_encoded(X_chunk)
 
-print("✓ Features scaled using StandardScaler")
-print(f"✓ Training set shape: {X_train_scaled.shape}")
-print(f"✓ Test set shape: {X_test_scaled.shape}")
+print("✓ Features encoded and scaled chunk by chunk")
+print(f"✓ Training set shape: {matrices['X_train'].shape}")
+print(f"✓ Test set shape: {matrices['X_test'].shape}")
 
 # Save Processed Data and Artifacts
-print("\n10. Saving processed data and artifacts...")
-# Save datasets
-X_train_scaled.to_csv('data/X_train.csv', index=False)
-X_test_scaled.to_csv('data/X_test.csv', index=False)
-y_train.to_csv('data/y_train.csv', index=False, header=True)
-y_test.to_csv('data/y_test.csv', index=False, header=True)
-
-# Save scaler and encoders
-joblib.dump(scaler, 'artifacts/scaler.joblib')
-joblib.dump(encoders, 'artifacts/encoders.joblib')
+steps.start("6. Saving processed data and artifacts...")
+# Matrices are float32 .npy files (memory-mapped by model training)
+finish_matrices(matrices, y_train, y_test, feature_columns,
+                train_index=train_pos, test_index=test_pos)
+
+# Optional CSV copies for inspection
+if args.export_csv:
+    for name, X in matrices.items():
+        for i, (lo, hi) in enumerate(chunk_bounds(len(X), args.chunk_rows)):
+            pd.DataFrame(X[lo:hi], columns=feature_columns).to_csv(
+                f'data/{name}.csv', mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    y_train.to_csv('data/y_train.csv', index=False, header=True)
+    y_test.to_csv('data/y_test.csv', index=False, header=True)
+
+# Save fitted preprocessing pipeline
+joblib.dump(preprocessor, 'artifacts/preprocessor.joblib')
 
 # Save feature names
-feature_names = X_train.columns.tolist()
+feature_names = feature_columns
 joblib.dump(feature_names, 'artifacts/feature_names.joblib')
 
 print("✓ Data saved successfully!")
 print("\nSaved files:")
-print("  - data/X_train.csv")
-print("  - data/X_test.csv")
-print("  - data/y_train.csv")
-print("  - data/y_test.csv")
-print("  - artifacts/scaler.joblib")
-print("  - artifacts/encoders.joblib")
+print(f"  - {FEATURE_DIR}/X_train.npy, X_test.npy (float32)")
+print(f"  - {FEATURE_DIR}/y_train.npy, y_test.npy")
+print(f"  - {FEATURE_DIR}/train_index.npy, test_index.npy")
+print(f"  - {FEATURE_DIR}/metadata.json")
+if args.export_csv:
+    print("  - data/X_train.csv, data/X_test.csv, data/y_train.csv, data/y_test.csv")
+print("  - artifacts/preprocessor.joblib")
 print("  - artifacts/feature_names.joblib")
 
 print("\n" + "=" * 70)
 print("FEATURE ENGINEERING COMPLETE!")
 print("=" * 70)
 print(f"✓ Ready for model training with {len(feature_names)} features!")
+
+steps.finish()
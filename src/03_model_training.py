@@ -4,32 +4,86 @@ Hotel Booking Demand - Model Training
 This script trains machine learning models to predict hotel booking cancellations.
 
 Goal: Build and compare models for cancellation prediction
+
+Usage:
+    python src/03_model_training.py [--tune] [--workers N] [--n-candidates N]
+    python src/03_model_training.py --streaming [--chunk-rows N] [--sgd-epochs N]
+
+--tune searches the model hyperparameters with successive halving over
+stratified k-fold CV in a process pool (tuning.py) before training the final
+models. Fold results are kept in artifacts/tuning_results.jsonl, so an
+interrupted search resumes where it stopped.
+
+Besides the in-memory models, a logistic regression is trained out of core
+with SGD (streaming.py), reading the memory-mapped feature store in chunks
+of --chunk-rows rows, and competes for best_model.joblib like the others.
+--streaming trains only that model, for training sets larger than RAM: peak
+memory then depends on the chunk size rather than the number of bookings.
+It replaces best_model.joblib only if its Test F1-Score beats the best one
+recorded in artifacts/model_metrics.csv by the previous run.
 """
 
+import argparse
+import json
+import os
+import time
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from sklearn.pipeline import Pipeline
 import joblib
+from feature_store import load_matrices
+from scoring import DEFAULT_THRESHOLD, predict_with_threshold, save_artifact, save_best_model
+from model_export import export as export_compiled
+from tuning import RESULTS_PATH, tune
+from profiling import StepRecorder, add_profiling_args
+import streaming
 import warnings
 warnings.filterwarnings('ignore')
 
+parser = argparse.ArgumentParser(description="Train and compare models")
+parser.add_argument('--tune', action='store_true',
+                    help="Search hyperparameters with cross-validation before training")
+parser.add_argument('--workers', type=int, default=0,
+                    help="Processes for the tuning folds (0 = all cores)")
+parser.add_argument('--n-candidates', type=int, default=27,
+                    help="Candidates per model in the first tuning rung")
+parser.add_argument('--cv-folds', type=int, default=5,
+                    help="Stratified folds per tuning candidate")
+parser.add_argument('--export-compiled', action='store_true',
+                    help="Also save the best model as a NumPy-only artifacts/best_model.npz")
+parser.add_argument('--streaming', action='store_true',
+                    help="Train only the out-of-core SGD model (training set larger than RAM)")
+parser.add_argument('--chunk-rows', type=int, default=streaming.DEFAULT_CHUNK_ROWS,
+                    help="Rows per chunk for out-of-core training and evaluation")
+parser.add_argument('--sgd-epochs', type=int, default=streaming.DEFAULT_EPOCHS,
+                    help="Passes over the training set for the out-of-core SGD model")
+add_profiling_args(parser)
+args = parser.parse_args()
+steps = StepRecorder.from_args('model_training', args)
+
+# Default hyperparameters (replaced by the tuned ones with --tune)
+lr_params = {'class_weight': 'balanced'}
+rf_params = {'n_estimators': 100, 'max_depth': 15, 'min_samples_split': 10, 'min_samples_leaf': 5}
+
 print("=" * 70)
 print("HOTEL BOOKING DEMAND - MODEL TRAINING")
 print("=" * 70)
 
 # Import Libraries
-print("\n1. Importing libraries...")
+steps.start("1. Importing libraries...")
 print("✓ Libraries imported successfully!")
 
 # Load Prepared Data
-print("\n2. Loading prepared data...")
-# Load training and test data
-X_train = pd.read_csv('data/X_train.csv')
-X_test = pd.read_csv('data/X_test.csv')
-y_train = pd.read_csv('data/y_train.csv')['is_canceled']
-y_test = pd.read_csv('data/y_test.csv')['is_canceled']
+steps.start("2. Loading prepared data...")
+# Memory-map the float32 matrices written by feature engineering (no parsing)
+data = load_matrices()
+X_train, X_test = data['X_train'], data['X_test']
+y_train, y_test = data['y_train'], data['y_test']
+feature_names = data['metadata']['feature_names']
+preprocessor = joblib.load('artifacts/preprocessor.joblib')
 
 print("✓ Data loaded successfully!")
 print("=" * 50)
@@ -40,115 +94,260 @@ print(f"\nCancellation rate in training: {y_train.mean()*100:.2f}%")
 print(f"Cancellation rate in test: {y_test.mean()*100:.2f}%")
 
 # Handle Any Remaining Missing Values
-print("\n3. Handling any remaining missing values...")
+steps.start("3. Handling any remaining missing values...")
 # Check for missing values
 print("Checking for missing values...")
-print(f"X_train NaN count: {X_train.isnull().sum().sum()}")
-print(f"X_test NaN count: {X_test.isnull().sum().sum()}")
+train_nan = streaming.count_nan(X_train, args.chunk_rows)
+test_nan = streaming.count_nan(X_test, args.chunk_rows)
+print(f"X_train NaN count: {train_nan}")
+print(f"X_test NaN count: {test_nan}")
 
-# Fill any remaining NaN values with 0 (safe for scaled data)
-if X_train.isnull().sum().sum() > 0 or X_test.isnull().sum().sum() > 0:
+# Fill any remaining NaN values with 0 (safe for scaled data); this copies
+# the read-only memory maps, so it only happens when needed (out-of-core
+# training fills each chunk as it is read instead)
+if (train_nan > 0 or test_nan > 0) and args.streaming:
+    print("\n⚠️  Found NaN values - filled with 0 chunk by chunk")
+elif train_nan > 0 or test_nan > 0:
     print("\n⚠️  Found NaN values - filling with 0")
-    X_train = X_train.fillna(0)
-    X_test = X_test.fillna(0)
+    X_train = np.nan_to_num(X_train, nan=0.0)
+    X_test = np.nan_to_num(X_test, nan=0.0)
     print("✓ NaN values handled")
 else:
     print("✓ No missing values found")
 
-# Train Logistic Regression Model
-print("\n4. Training Logistic Regression model...")
-# Train Logistic Regression
-print("Training Logistic Regression...")
-lr_model = LogisticRegression(max_iter=1000, random_state=42, class_weight='balanced')
-lr_model.fit(X_train, y_train)
-print("✓ Logistic Regression trained")
+# Tune Hyperparameters
+steps.start("4. Tuning hyperparameters...")
+if args.tune:
+    tuning = {}
+    for name in ['Logistic Regression', 'Random Forest']:
+        print(f"Successive halving for {name} ({args.cv_folds}-fold CV):")
+        tuning[name] = tune(name, n_candidates=args.n_candidates, n_splits=args.cv_folds,
+                            workers=args.workers)
+        print(f"✓ {name}: CV F1 {tuning[name]['best_score']:.4f} with {tuning[name]['best_params']}")
+    lr_params = tuning['Logistic Regression']['best_params']
+    rf_params = tuning['Random Forest']['best_params']
+else:
+    print("Skipped (run with --tune to search hyperparameters)")
+
+# In-memory models (the training set must fit in RAM)
+if args.streaming:
+    steps.start("5. Skipping the in-memory models...")
+    print("Skipped (--streaming trains only the out-of-core model)")
+else:
+    # Train Logistic Regression Model
+    steps.start("5. Training Logistic Regression model...")
+    # Train Logistic Regression
+    print("Training Logistic Regression...")
+    lr_model = LogisticRegression(max_iter=1000, random_state=42, **lr_params)
+    start = time.perf_counter()
+    lr_model.fit(X_train, y_train)
+    lr_train_seconds = time.perf_counter() - start
+    print(f"✓ Logistic Regression trained in {lr_train_seconds:.2f} s")
 
-# Evaluate Logistic Regression
-print("\n5. Evaluating Logistic Regression...")
-# Make predictions
-lr_train_pred = lr_model.predict(X_train)
-lr_test_pred = lr_model.predict(X_test)
+    # Evaluate Logistic Regression
+    steps.start("6. Evaluating Logistic Regression...")
+    # Make predictions (one predict_proba pass per set, labels from the threshold)
+    lr_train_pred, lr_train_proba = predict_with_threshold(lr_model, X_train, DEFAULT_THRESHOLD)
+    start = time.perf_counter()
+    lr_test_pred, lr_test_proba = predict_with_threshold(lr_model, X_test, DEFAULT_THRESHOLD)
+    lr_latency_us = (time.perf_counter() - start) / len(X_test) * 1e6
 
-# Calculate metrics
-lr_metrics = {
-    'model': 'Logistic Regression',
-    'train_accuracy': accuracy_score(y_train, lr_train_pred),
-    'test_accuracy': accuracy_score(y_test, lr_test_pred),
-    'test_precision': precision_score(y_test, lr_test_pred),
-    'test_recall': recall_score(y_test, lr_test_pred),
-    'test_f1': f1_score(y_test, lr_test_pred)
-}
+    # Calculate metrics
+    lr_metrics = {
+        'model': 'Logistic Regression',
+        'train_accuracy': accuracy_score(y_train, lr_train_pred),
+        'test_accuracy': accuracy_score(y_test, lr_test_pred),
+        'test_precision': precision_score(y_test, lr_test_pred),
+        'test_recall': recall_score(y_test, lr_test_pred),
+        'test_f1': f1_score(y_test, lr_test_pred),
+        'train_seconds': lr_train_seconds,
+        'predict_us_per_row': lr_latency_us
+    }
 
-print("Logistic Regression Results:")
-print("=" * 50)
-print(f"Training Accuracy: {lr_metrics['train_accuracy']:.4f}")
-print(f"Test Accuracy: {lr_metrics['test_accuracy']:.4f}")
-print(f"Test Precision: {lr_metrics['test_precision']:.4f}")
-print(f"Test Recall: {lr_metrics['test_recall']:.4f}")
-print(f"Test F1-Score: {lr_metrics['test_f1']:.4f}")
-
-# Train Random Forest Model
-print("\n6. Training Random Forest model...")
-# Train Random Forest
-print("Training Random Forest...")
-rf_model = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=15,
-    min_samples_split=10,
-    min_samples_leaf=5,
-    random_state=42,
-    class_weight='balanced',
-    n_jobs=-1
-)
-rf_model.fit(X_train, y_train)
-print("✓ Random Forest trained")
-
-# Evaluate Random Forest
-print("\n7. Evaluating Random Forest...")
-# Make predictions
-rf_train_pred = rf_model.predict(X_train)
-rf_test_pred = rf_model.predict(X_test)
+    print("Logistic Regression Results:")
+    print("=" * 50)
+    print(f"Training Accuracy: {lr_metrics['train_accuracy']:.4f}")
+    print(f"Test Accuracy: {lr_metrics['test_accuracy']:.4f}")
+    print(f"Test Precision: {lr_metrics['test_precision']:.4f}")
+    print(f"Test Recall: {lr_metrics['test_recall']:.4f}")
+    print(f"Test F1-Score: {lr_metrics['test_f1']:.4f}")
+    print(f"Training Time: {lr_metrics['train_seconds']:.2f} s")
+    print(f"Inference Latency: {lr_metrics['predict_us_per_row']:.2f} µs/row")
+
+    # Train Random Forest Model
+    steps.start("7. Training Random Forest model...")
+    # Train Random Forest
+    print("Training Random Forest...")
+    rf_model = RandomForestClassifier(
+        random_state=42,
+        class_weight='balanced',
+        n_jobs=-1,
+        **rf_params
+    )
+    start = time.perf_counter()
+    rf_model.fit(X_train, y_train)
+    rf_train_seconds = time.perf_counter() - start
+    print(f"✓ Random Forest trained in {rf_train_seconds:.2f} s")
+
+    # Evaluate Random Forest
+    steps.start("8. Evaluating Random Forest...")
+    # Make predictions (one predict_proba pass per set, labels from the threshold)
+    rf_train_pred, rf_train_proba = predict_with_threshold(rf_model, X_train, DEFAULT_THRESHOLD)
+    start = time.perf_counter()
+    rf_test_pred, rf_test_proba = predict_with_threshold(rf_model, X_test, DEFAULT_THRESHOLD)
+    rf_latency_us = (time.perf_counter() - start) / len(X_test) * 1e6
+
+    # Calculate metrics
+    rf_metrics = {
+        'model': 'Random Forest',
+        'train_accuracy': accuracy_score(y_train, rf_train_pred),
+        'test_accuracy': accuracy_score(y_test, rf_test_pred),
+        'test_precision': precision_score(y_test, rf_test_pred),
+        'test_recall': recall_score(y_test, rf_test_pred),
+        'test_f1': f1_score(y_test, rf_test_pred),
+        'train_seconds': rf_train_seconds,
+        'predict_us_per_row': rf_latency_us
+    }
+
+    print("Random Forest Results:")
+    print("=" * 50)
+    print(f"Training Accuracy: {rf_metrics['train_accuracy']:.4f}")
+    print(f"Test Accuracy: {rf_metrics['test_accuracy']:.4f}")
+    print(f"Test Precision: {rf_metrics['test_precision']:.4f}")
+    print(f"Test Recall: {rf_metrics['test_recall']:.4f}")
+    print(f"Test F1-Score: {rf_metrics['test_f1']:.4f}")
+    print(f"Training Time: {rf_metrics['train_seconds']:.2f} s")
+    print(f"Inference Latency: {rf_metrics['predict_us_per_row']:.2f} µs/row")
+
+    # Train Histogram Gradient Boosting Model
+    steps.start("9. Training Histogram Gradient Boosting model...")
+    # Boosting on binned features splits the categorical columns natively, so the
+    # scaled category columns are turned back into integer codes (tree splits do
+    # not depend on the scaling of the numeric columns)
+    X_train_codes = preprocessor.restore_codes(X_train)
+    X_test_codes = preprocessor.restore_codes(X_test)
+    categorical_mask = preprocessor.categorical_mask()
+    print(f"Native categorical features: {int(categorical_mask.sum())}")
+    print("Training Histogram Gradient Boosting...")
+    hgb_model = HistGradientBoostingClassifier(
+        max_iter=300,
+        learning_rate=0.1,
+        categorical_features=categorical_mask,
+        class_weight='balanced',
+        early_stopping=True,
+        random_state=42
+    )
+    start = time.perf_counter()
+    hgb_model.fit(X_train_codes, y_train)
+    hgb_train_seconds = time.perf_counter() - start
+    print(f"✓ Histogram Gradient Boosting trained in {hgb_train_seconds:.2f} s ({hgb_model.n_iter_} iterations)")
+
+    # Evaluate Histogram Gradient Boosting
+    steps.start("10. Evaluating Histogram Gradient Boosting...")
+    # Make predictions (one predict_proba pass per set, labels from the threshold)
+    hgb_train_pred, hgb_train_proba = predict_with_threshold(hgb_model, X_train_codes, DEFAULT_THRESHOLD)
+    start = time.perf_counter()
+    hgb_test_pred, hgb_test_proba = predict_with_threshold(hgb_model, X_test_codes, DEFAULT_THRESHOLD)
+    hgb_latency_us = (time.perf_counter() - start) / len(X_test) * 1e6
+
+    # Calculate metrics
+    hgb_metrics = {
+        'model': 'Histogram Gradient Boosting',
+        'train_accuracy': accuracy_score(y_train, hgb_train_pred),
+        'test_accuracy': accuracy_score(y_test, hgb_test_pred),
+        'test_precision': precision_score(y_test, hgb_test_pred),
+        'test_recall': recall_score(y_test, hgb_test_pred),
+        'test_f1': f1_score(y_test, hgb_test_pred),
+        'train_seconds': hgb_train_seconds,
+        'predict_us_per_row': hgb_latency_us
+    }
+
+    print("Histogram Gradient Boosting Results:")
+    print("=" * 50)
+    print(f"Training Accuracy: {hgb_metrics['train_accuracy']:.4f}")
+    print(f"Test Accuracy: {hgb_metrics['test_accuracy']:.4f}")
+    print(f"Test Precision: {hgb_metrics['test_precision']:.4f}")
+    print(f"Test Recall: {hgb_metrics['test_recall']:.4f}")
+    print(f"Test F1-Score: {hgb_metrics['test_f1']:.4f}")
+    print(f"Training Time: {hgb_metrics['train_seconds']:.2f} s")
+    print(f"Inference Latency: {hgb_metrics['predict_us_per_row']:.2f} µs/row")
+
+# Train SGD Logistic Regression Out of Core
+steps.start("11. Training SGD Logistic Regression out of core...")
+# partial_fit on one chunk of the memory-mapped matrix at a time (the
+# feature store is already standardized)
+print(f"Training SGD Logistic Regression ({args.sgd_epochs} epochs, {args.chunk_rows:,} rows per chunk)...")
+start = time.perf_counter()
+sgd_model = streaming.fit_sgd(X_train, y_train, chunk_rows=args.chunk_rows, epochs=args.sgd_epochs)
+sgd_train_seconds = time.perf_counter() - start
+print(f"✓ SGD Logistic Regression trained in {sgd_train_seconds:.2f} s")
+
+# Evaluate SGD Logistic Regression
+steps.start("12. Evaluating SGD Logistic Regression...")
+# Confusion counts accumulated chunk by chunk (no full prediction vectors)
+sgd_train_eval = streaming.evaluate(sgd_model, X_train, y_train, DEFAULT_THRESHOLD, args.chunk_rows)
+sgd_test_eval = streaming.evaluate(sgd_model, X_test, y_test, DEFAULT_THRESHOLD, args.chunk_rows)
 
 # Calculate metrics
-rf_metrics = {
-    'model': 'Random Forest',
-    'train_accuracy': accuracy_score(y_train, rf_train_pred),
-    'test_accuracy': accuracy_score(y_test, rf_test_pred),
-    'test_precision': precision_score(y_test, rf_test_pred),
-    'test_recall': recall_score(y_test, rf_test_pred),
-    'test_f1': f1_score(y_test, rf_test_pred)
+sgd_metrics = {
+    'model': 'SGD Logistic Regression',
+    'train_accuracy': sgd_train_eval['accuracy'],
+    'test_accuracy': sgd_test_eval['accuracy'],
+    'test_precision': sgd_test_eval['precision'],
+    'test_recall': sgd_test_eval['recall'],
+    'test_f1': sgd_test_eval['f1'],
+    'train_seconds': sgd_train_seconds,
+    'predict_us_per_row': sgd_test_eval['predict_seconds'] / len(X_test) * 1e6
 }
 
-print("Random Forest Results:")
+print("SGD Logistic Regression Results:")
 print("=" * 50)
-print(f"Training Accuracy: {rf_metrics['train_accuracy']:.4f}")
-print(f"Test Accuracy: {rf_metrics['test_accuracy']:.4f}")
-print(f"Test Precision: {rf_metrics['test_precision']:.4f}")
-print(f"Test Recall: {rf_metrics['test_recall']:.4f}")
-print(f"Test F1-Score: {rf_metrics['test_f1']:.4f}")
+print(f"Training Accuracy: {sgd_metrics['train_accuracy']:.4f}")
+print(f"Test Accuracy: {sgd_metrics['test_accuracy']:.4f}")
+print(f"Test Precision: {sgd_metrics['test_precision']:.4f}")
+print(f"Test Recall: {sgd_metrics['test_recall']:.4f}")
+print(f"Test F1-Score: {sgd_metrics['test_f1']:.4f}")
+print(f"Training Time: {sgd_metrics['train_seconds']:.2f} s")
+print(f"Inference Latency: {sgd_metrics['predict_us_per_row']:.2f} µs/row")
 
 # Compare Models
-print("\n8. Comparing models...")
+steps.start("13. Comparing models...")
 # Create comparison DataFrame
-comparison_df = pd.DataFrame([lr_metrics, rf_metrics])
-comparison_df = comparison_df.set_index('model')
+if args.streaming:
+    # The in-memory models keep their metrics from the last full run, so
+    # SGD only replaces best_model.joblib if it beats the current best
+    comparison_df = pd.DataFrame([sgd_metrics]).set_index('model')
+    if os.path.exists('artifacts/model_metrics.csv') and os.path.exists('artifacts/best_model.joblib'):
+        previous_df = pd.read_csv('artifacts/model_metrics.csv', index_col='model')
+        previous_df = previous_df.drop(index=sgd_metrics['model'], errors='ignore')
+        comparison_df = pd.concat([previous_df, comparison_df])
+        print(f"(metrics of {', '.join(previous_df.index)} from the previous run)")
+else:
+    comparison_df = pd.DataFrame([lr_metrics, rf_metrics, hgb_metrics, sgd_metrics])
+    comparison_df = comparison_df.set_index('model')
 
 print("Model Comparison:")
 print("=" * 50)
-print(comparison_df.round(4))
+print(comparison_df.round(4).to_string())
 
 # Determine best model based on F1 score
 best_model_name = comparison_df['test_f1'].idxmax()
 print(f"\n✓ Best model: {best_model_name}")
 print(f"  (based on Test F1-Score)")
 
-# Feature Importance (Random Forest)
-print("\n9. Analyzing feature importance (Random Forest)...")
-# Get feature importance
-feature_names = joblib.load('artifacts/feature_names.joblib')
+# Feature Importance (Random Forest, or SGD coefficients with --streaming)
+steps.start("14. Analyzing feature importance...")
+# Get feature importance (absolute coefficients are comparable because the
+# feature-store columns are standardized)
+if args.streaming:
+    print("Source: |SGD Logistic Regression coefficients|")
+    importance = np.abs(sgd_model.coef_[0])
+else:
+    print("Source: Random Forest")
+    importance = rf_model.feature_importances_
 importance_df = pd.DataFrame({
     'feature': feature_names,
-    'importance': rf_model.feature_importances_
+    'importance': importance
 }).sort_values('importance', ascending=False)
 
 print("Top 15 Most Important Features:")
@@ -156,16 +355,38 @@ print("=" * 50)
 print(importance_df.head(15).to_string(index=False))
 
 # Save Models and Metrics
-print("\n10. Saving models and metrics...")
-# Save models
-joblib.dump(lr_model, 'artifacts/lr_model.joblib')
-joblib.dump(rf_model, 'artifacts/rf_model.joblib')
-
-# Save best model
-if best_model_name == 'Random Forest':
-    joblib.dump(rf_model, 'artifacts/best_model.joblib')
+steps.start("15. Saving models and metrics...")
+# Save models (uncompressed, so scoring can memory-map them)
+if not args.streaming:
+    save_artifact(lr_model, 'artifacts/lr_model.joblib')
+    save_artifact(rf_model, 'artifacts/rf_model.joblib')
+    save_artifact(hgb_model, 'artifacts/hgb_model.joblib')
+save_artifact(sgd_model, 'artifacts/sgd_model.joblib')
+
+# Save best model together with the fitted preprocessor, so scoring
+# can go straight from raw booking rows to probabilities
+# (gradient boosting takes integer category codes)
+models = {'SGD Logistic Regression': (preprocessor, sgd_model)}
+if not args.streaming:
+    models.update({
+        'Logistic Regression': (preprocessor, lr_model),
+        'Random Forest': (preprocessor, rf_model),
+        'Histogram Gradient Boosting': (preprocessor.with_categorical_codes(), hgb_model),
+    })
+best_replaced = best_model_name in models
+if best_replaced:
+    best_preprocessor, best_model = models[best_model_name]
+    best_pipeline = Pipeline([('preprocessor', best_preprocessor), ('model', best_model)])
+    # (a compiled copy of the previous best model is deleted)
+    save_best_model(best_pipeline, 'artifacts/best_model.joblib')
 else:
-    joblib.dump(lr_model, 'artifacts/best_model.joblib')
+    # --streaming and the previous best still wins: keep it
+    best_pipeline = joblib.load('artifacts/best_model.joblib')
+
+# Compiled copy for scoring without scikit-learn (checked against the pipeline)
+if args.export_compiled:
+    compiled_diff = export_compiled(best_pipeline, 'artifacts/best_model.npz',
+                                    source_path='artifacts/best_model.joblib')
 
 # Save metrics
 comparison_df.to_csv('artifacts/model_metrics.csv')
@@ -173,13 +394,29 @@ comparison_df.to_csv('artifacts/model_metrics.csv')
 # Save feature importance
 importance_df.to_csv('artifacts/feature_importance.csv', index=False)
 
+# Save tuned hyperparameters
+if args.tune:
+    with open('artifacts/tuned_params.json', 'w') as f:
+        json.dump(tuning, f, indent=2)
+
 print("✓ Models and artifacts saved successfully!")
 print("\nSaved files:")
-print("  - artifacts/lr_model.joblib")
-print("  - artifacts/rf_model.joblib")
-print("  - artifacts/best_model.joblib")
+if not args.streaming:
+    print("  - artifacts/lr_model.joblib")
+    print("  - artifacts/rf_model.joblib")
+    print("  - artifacts/hgb_model.joblib")
+print("  - artifacts/sgd_model.joblib")
+if best_replaced:
+    print("  - artifacts/best_model.joblib (preprocessor + model pipeline)")
+else:
+    print(f"  (artifacts/best_model.joblib kept: {best_model_name} still has the best Test F1-Score)")
+if args.export_compiled:
+    print(f"  - artifacts/best_model.npz (compiled, max probability difference {compiled_diff:.2g})")
 print("  - artifacts/model_metrics.csv")
 print("  - artifacts/feature_importance.csv")
+if args.tune:
+    print("  - artifacts/tuned_params.json")
+    print(f"  - {RESULTS_PATH} (fold results, reused on resume)")
 
 print("\n" + "=" * 70)
 print("MODEL TRAINING COMPLETE!")
@@ -188,3 +425,5 @@ print(f"✓ Best model: {best_model_name}")
 print(f"✓ Test Accuracy: {comparison_df.loc[best_model_name, 'test_accuracy']:.4f}")
 print(f"✓ Test F1-Score: {comparison_df.loc[best_model_name, 'test_f1']:.4f}")
 print("✓ Project complete!")
+
+steps.finish()
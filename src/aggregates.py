@@ -0,0 +1,192 @@
+"""
+Hotel Booking Demand - Booking Aggregates
+
+Counts and cancellations per value of every column the EDA looks at,
+computed in one pass over the bookings and shared by
+01_data_exploration.py and simple_eda_visualizations.py.
+
+For each column the table holds, per distinct value, the number of
+bookings and how many of them were canceled. Everything the console report
+and the figures show derives from these tables without touching the rows
+again: value counts, cancellation rates, histograms (distinct values
+weighted by their counts), means, medians and the correlation of a column
+with is_canceled.
+
+Aggregates are cached next to the columnar data cache and reused while
+the source CSV's content hash is unchanged.
+
+Usage:
+    aggregates = load_aggregates('data/hotel_bookings.csv')
+    aggregates.cancel_rate('hotel')
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from data_store import cache_paths, dataset_hash, load_dataset
+
+# Bump when the tables change so cached aggregates are rebuilt
+AGGREGATES_VERSION = 1
+
+TARGET = 'is_canceled'
+
+AGGREGATED_COLUMNS = [
+    TARGET, 'hotel', 'arrival_date_month', 'arrival_date_year', 'market_segment',
+    'distribution_channel', 'deposit_type', 'customer_type', 'meal',
+    'is_repeated_guest', 'lead_time', 'adr', 'adults', 'children', 'babies',
+    'stays_in_weekend_nights', 'stays_in_week_nights', 'previous_cancellations',
+    'booking_changes', 'required_car_parking_spaces', 'total_of_special_requests',
+]
+
+# Columns derived from the loaded ones before aggregating (as 01_data_exploration.py)
+DERIVED_COLUMNS = {
+    'total_guests': lambda df: df['adults'] + df['children'].fillna(0) + df['babies'],
+    'total_nights': lambda df: df['stays_in_weekend_nights'] + df['stays_in_week_nights'],
+}
+
+
+def aggregates_path(csv_path):
+    feather_path, _ = cache_paths(csv_path)
+    return feather_path.replace('.feather', '.aggregates.pkl')
+
+
+def _value_table(values, canceled):
+    """Bookings and cancellations per distinct value, plus the missing count
+
+    Categoricals keep their category order (unobserved categories have 0
+    bookings); other columns are sorted by value.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+    present = codes >= 0
+    bookings = np.bincount(codes[present], minlength=len(uniques))
+    cancels = np.bincount(codes[present], weights=canceled[present], minlength=len(uniques))
+    table = pd.DataFrame({'bookings': bookings, 'canceled': cancels.astype(np.int64)},
+                         index=pd.Index(uniques, name=values.name))
+    return table, int((~present).sum())
+
+
+class Aggregates:
+    """Per-value booking and cancellation counts of the aggregated columns"""
+
+    def __init__(self, tables: dict, missing: dict, n_rows, n_canceled, source_hash=None):
+        self.tables = tables
+        self.missing = missing
+        self.n_rows = n_rows
+        self.n_canceled = n_canceled
+        self.source_hash = source_hash
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source_hash=None):
+        """One pass over df: a value table per aggregated and derived column"""
+        canceled = df[TARGET].to_numpy(dtype=np.float64)
+        columns = {col: df[col] for col in AGGREGATED_COLUMNS if col in df.columns}
+        for col, derive in DERIVED_COLUMNS.items():
+            columns[col] = df[col] if col in df.columns else derive(df).rename(col)
+        tables, missing = {}, {}
+        for col, values in columns.items():
+            tables[col], missing[col] = _value_table(values, canceled)
+        return cls(tables, missing, len(df), int(canceled.sum()), source_hash)
+
+    def table(self, col) -> pd.DataFrame:
+        """bookings, canceled and rate (fraction) per value, in value order"""
+        table = self.tables[col].copy()
+        table['rate'] = table['canceled'] / table['bookings'].where(table['bookings'] > 0)
+        return table
+
+    def value_counts(self, col, canceled=None) -> pd.Series:
+        """Bookings per value, most frequent first (as Series.value_counts)
+
+        canceled=True/False counts only canceled / not canceled bookings.
+        """
+        counts = self._counts(col, canceled)
+        return counts.sort_values(ascending=False, kind='stable').rename('count')
+
+    def cancel_rate(self, col) -> pd.Series:
+        """Cancellation rate (fraction) per observed value, in value order"""
+        table = self.table(col)
+        return table.loc[table['bookings'] > 0, 'rate']
+
+    def rate_where(self, col, mask_fn) -> float:
+        """Cancellation rate of the bookings whose value satisfies mask_fn"""
+        table = self.tables[col]
+        selected = table[mask_fn(table.index.to_series())]
+        return selected['canceled'].sum() / selected['bookings'].sum()
+
+    def hist_data(self, col, canceled=None, mask_fn=None):
+        """(values, weights) that plt.hist turns into the histogram of the raw column"""
+        counts = self._counts(col, canceled)
+        counts = counts[counts > 0]
+        if mask_fn is not None:
+            counts = counts[mask_fn(counts.index.to_series()).to_numpy()]
+        return counts.index.to_numpy(), counts.to_numpy()
+
+    def stats(self, col, mask_fn=None) -> dict:
+        """count, sum, mean, median, min and max of the non-missing values"""
+        counts = self._counts(col)
+        counts = counts[counts > 0]
+        if mask_fn is not None:
+            counts = counts[mask_fn(counts.index.to_series()).to_numpy()]
+        values = counts.index.to_numpy(dtype=np.float64)
+        weights = counts.to_numpy()
+        n = int(weights.sum())
+        cumulative = np.cumsum(weights)
+        lower = values[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+        upper = values[np.searchsorted(cumulative, n // 2, side='right')]
+        total = float(values @ weights)
+        return {'count': n, 'sum': total, 'mean': total / n, 'median': (lower + upper) / 2,
+                'min': counts.index[0], 'max': counts.index[-1]}
+
+    def corr_with_target(self, columns) -> pd.Series:
+        """Pearson correlation of each column with is_canceled (missing values skipped)"""
+        out = {}
+        for col in columns:
+            table = self.tables[col]
+            v = table.index.to_numpy(dtype=np.float64)
+            c = table['bookings'].to_numpy(dtype=np.float64)
+            k = table['canceled'].to_numpy(dtype=np.float64)
+            n, sx, sy = c.sum(), v @ c, k.sum()
+            cov = n * (v @ k) - sx * sy
+            var_x = n * (v * v @ c) - sx * sx
+            var_y = n * sy - sy * sy
+            out[col] = cov / np.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else np.nan
+        return pd.Series(out, name=TARGET)
+
+    def _counts(self, col, canceled=None) -> pd.Series:
+        table = self.tables[col]
+        if canceled is None:
+            return table['bookings']
+        if canceled:
+            return table['canceled']
+        return table['bookings'] - table['canceled']
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        pd.to_pickle({'version': AGGREGATES_VERSION, 'aggregates': self}, tmp_path)
+        os.replace(tmp_path, path)
+
+
+def store_aggregates(aggregates: Aggregates, csv_path):
+    """Cache aggregates computed from csv_path's typed bookings"""
+    aggregates.source_hash = dataset_hash(csv_path, typed=True)
+    aggregates.save(aggregates_path(csv_path))
+
+
+def load_aggregates(csv_path) -> Aggregates:
+    """Cached aggregates of csv_path, rebuilt (one load, one pass) when the data changed"""
+    source_hash = dataset_hash(csv_path, typed=True)
+    path = aggregates_path(csv_path)
+    try:
+        cached = pd.read_pickle(path)
+        if (cached['version'] == AGGREGATES_VERSION
+                and cached['aggregates'].source_hash == source_hash):
+            return cached['aggregates']
+    except (OSError, ValueError, KeyError, EOFError, AttributeError, ImportError):
+        pass
+    df = load_dataset(csv_path, columns=AGGREGATED_COLUMNS, typed=True)
+    aggregates = Aggregates.from_frame(df, source_hash)
+    aggregates.save(path)
+    return aggregates
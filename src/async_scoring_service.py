@@ -0,0 +1,329 @@
+"""
+Hotel Booking Demand - Async Scoring Front-End
+
+An asyncio HTTP front-end over the trained pipeline with explicit
+backpressure. One event loop accepts requests and puts them on a bounded
+queue; batching tasks drain the queue and run the CPU-bound predict_proba in
+a thread pool executor.
+
+When the queue is full a request is rejected immediately with 503, and a
+request that has already waited longer than --max-queue-wait-ms when it is
+dequeued is shed with 503. Latency therefore stays bounded under overload
+instead of growing with the backlog.
+
+Bookings are validated and cast (schema.check_booking) before they are
+queued. If a combined batch still fails, its requests are scored one by one
+so only the failing request gets the error. A malformed request line or
+header gets a 400, a body over --max-body-bytes a 413, and the connection is
+closed.
+
+Endpoints:
+    POST /predict         one booking object      -> one prediction
+    POST /predict/batch   {"bookings": [...]}     -> {"predictions": [...]}
+    GET  /health          liveness check
+    GET  /metrics         latency of successful requests, error count, queue depth,
+                          wait time, executor utilization, rejections, cache hit rate
+
+Usage:
+    python src/async_scoring_service.py --port 8001 --max-queue 1024 --executor-workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from prediction_cache import add_cache_args, cache_metrics, load_scorer
+from scoring import (DEFAULT_THRESHOLD, MODEL_PATH, booking_rows, predict_with_threshold,
+                     required_columns)
+from scoring_service import LatencyTracker, check_bookings, format_predictions
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+               500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+DEFAULT_MAX_BODY_BYTES = 4 << 20
+
+
+class BadRequest(Exception):
+    """Raised for a request that cannot be parsed; carries the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected or shed because the scorer is saturated"""
+
+
+class AsyncScorer:
+    """Bounded request queue in front of a thread pool running predict_proba
+
+    Each queue item is a list of bookings (one for /predict, many for
+    /predict/batch). Batching tasks combine items up to max_batch_size rows.
+    """
+
+    def __init__(self, pipeline, max_queue=1024, max_batch_size=256, max_queue_wait=0.5,
+                 executor_workers=2, threshold=DEFAULT_THRESHOLD):
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_queue_wait = max_queue_wait
+        self.threshold = threshold
+        self.executor_workers = executor_workers
+        self.executor = ThreadPoolExecutor(executor_workers, thread_name_prefix='scorer')
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.wait_time = LatencyTracker()
+        self.accepted = 0
+        self.rejected = 0
+        self.shed = 0
+        self.max_depth_seen = 0
+        self.busy_seconds = 0.0
+        self._busy_lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._batch_loop())
+                       for _ in range(self.executor_workers)]
+
+    async def score(self, bookings):
+        """Queue bookings and wait for their predictions; raise Overloaded if full"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((bookings, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise Overloaded(f"Queue full ({self.queue.maxsize} requests waiting)")
+        self.accepted += 1
+        self.max_depth_seen = max(self.max_depth_seen, self.queue.qsize())
+        return await future
+
+    def _predict(self, bookings):
+        """Score bookings that already passed check_booking"""
+        start = time.perf_counter()
+        rows = booking_rows(bookings, self.pipeline, checked=True)
+        labels, probs = predict_with_threshold(self.pipeline, rows, self.threshold)
+        with self._busy_lock:
+            self.busy_seconds += time.perf_counter() - start
+        return format_predictions(labels, probs)
+
+    def _take(self, item, items):
+        bookings, future, enqueued_at = item
+        waited = time.perf_counter() - enqueued_at
+        self.wait_time.record(waited)
+        if future.done():
+            return 0  # client went away while queued
+        if waited > self.max_queue_wait:
+            self.shed += 1
+            future.set_exception(Overloaded(f"Shed after waiting {waited * 1000:.0f} ms"))
+            return 0
+        items.append(item)
+        return len(bookings)
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = []
+            rows = self._take(await self.queue.get(), items)
+            while rows < self.max_batch_size and not self.queue.empty():
+                rows += self._take(self.queue.get_nowait(), items)
+            if not items:
+                continue
+
+            bookings = [booking for item in items for booking in item[0]]
+            try:
+                results = await loop.run_in_executor(self.executor, self._predict, bookings)
+            except Exception:
+                await self._score_one_by_one(items)
+                continue
+            offset = 0
+            for item_bookings, future, _ in items:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item_bookings)])
+                offset += len(item_bookings)
+
+    async def _score_one_by_one(self, items):
+        """Score a failed batch request by request, so one bad request fails alone"""
+        loop = asyncio.get_running_loop()
+        for bookings, future, _ in items:
+            try:
+                result = await loop.run_in_executor(self.executor, self._predict, bookings)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_capacity': self.queue.maxsize,
+            'max_queue_depth_seen': self.max_depth_seen,
+            'queue_wait': self.wait_time.summary(),
+            'executor_workers': self.executor_workers,
+            'executor_utilization': round(self.busy_seconds / (elapsed * self.executor_workers), 4),
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'shed': self.shed,
+            'prediction_cache': cache_metrics(self.pipeline),
+        }
+
+
+class AsyncScoringServer:
+    """Minimal keep-alive HTTP/1.1 server on asyncio streams"""
+
+    def __init__(self, scorer, max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+        self.scorer = scorer
+        self.max_body_bytes = max_body_bytes
+        self.latency = LatencyTracker()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except BadRequest as exc:
+                    # The stream position is unknown after a bad request: answer and close
+                    self.latency.record_error()
+                    await self._write(writer, exc.status, {'error': str(exc)})
+                    break
+                if request is None:
+                    break
+                method, path, body = request
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                await self._write(writer, status, payload)
+                if method == 'POST' and status == 200:
+                    self.latency.record(time.perf_counter() - start)
+                elif method == 'POST' and status != 404:
+                    self.latency.record_error()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return 200, {'latency': self.latency.summary(), **self.scorer.metrics()}
+        if method != 'POST' or path not in ('/predict', '/predict/batch'):
+            return 404, {'error': f"Unknown path: {method} {path}"}
+
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError as exc:
+            return 400, {'error': f"Invalid JSON: {exc}"}
+
+        if path == '/predict':
+            if not isinstance(payload, dict):
+                return 400, {'error': "Expected a JSON object with one booking"}
+            bookings = [payload]
+        else:
+            bookings = payload.get('bookings') if isinstance(payload, dict) else payload
+            if not isinstance(bookings, list) or not all(isinstance(b, dict) for b in bookings):
+                return 400, {'error': "Expected {\"bookings\": [...]} with booking objects"}
+            if not bookings:
+                return 200, {'predictions': []}
+        bookings, error = check_bookings(bookings, required_columns(self.scorer.pipeline))
+        if error:
+            return 400, {'error': error}
+
+        try:
+            results = await self.scorer.score(bookings)
+        except Overloaded as exc:
+            return 503, {'error': str(exc)}
+        except Exception as exc:
+            return 500, {'error': str(exc)}
+        return 200, results[0] if path == '/predict' else {'predictions': results}
+
+    async def _read_request(self, reader):
+        """(method, path, body), None at end of stream; raises BadRequest"""
+        try:
+            line = await reader.readline()
+            if not line:
+                return None
+            parts = line.decode('latin-1').split()
+            if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+                raise BadRequest(400, f"Malformed request line: {line[:80]!r}")
+            method, path, _ = parts
+            length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = header.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    value = value.strip()
+                    if not value.isdigit():
+                        raise BadRequest(400, f"Invalid Content-Length: {value[:40]!r}")
+                    length = int(value)
+        except ValueError:
+            # StreamReader raises ValueError for a line over its buffer limit
+            raise BadRequest(400, "Request line or header too long") from None
+        if length > self.max_body_bytes:
+            raise BadRequest(413, f"Body of {length} bytes exceeds {self.max_body_bytes}")
+        body = await reader.readexactly(length) if length else b''
+        return method, path, body
+
+    @staticmethod
+    async def _write(writer, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n")
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b"\r\n" + data)
+        await writer.drain()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Async cancellation scoring with backpressure")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to best_model.joblib")
+    parser.add_argument('--max-queue', type=int, default=1024,
+                        help="Requests allowed to wait; beyond this new requests get 503")
+    parser.add_argument('--max-queue-wait-ms', type=float, default=500.0,
+                        help="Requests that waited longer than this are shed with 503")
+    parser.add_argument('--max-batch-size', type=int, default=256,
+                        help="Most booking rows passed to one predict_proba call")
+    parser.add_argument('--executor-workers', type=int, default=2,
+                        help="Threads running predict_proba concurrently")
+    parser.add_argument('--max-body-bytes', type=int, default=DEFAULT_MAX_BODY_BYTES,
+                        help="Largest request body accepted; bigger ones get 413")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    add_cache_args(parser)
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    start = time.perf_counter()
+    pipeline = load_scorer(args.model, args)
+    load_seconds = time.perf_counter() - start
+    scorer = AsyncScorer(pipeline, args.max_queue, args.max_batch_size,
+                         args.max_queue_wait_ms / 1000.0, args.executor_workers,
+                         args.threshold)
+    scorer.start()
+    app = AsyncScoringServer(scorer, args.max_body_bytes)
+    server = await asyncio.start_server(app.handle, args.host, args.port, backlog=1024)
+    print(f"✓ Model loaded and warmed up in {load_seconds:.2f}s: {args.model}")
+    print(f"✓ Serving on http://{args.host}:{args.port} "
+          f"(queue {args.max_queue}, {args.executor_workers} executor workers)")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
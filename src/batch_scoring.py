@@ -0,0 +1,195 @@
+"""
+Hotel Booking Demand - Batch Scoring
+
+This script scores a bookings CSV of any size with the trained pipeline,
+reading and writing it in fixed-size chunks so memory stays bounded by the
+chunk size rather than the file size. Each chunk is validated and cast with
+the booking schema (schema.py).
+
+With --workers N each chunk is split across a process pool. Where fork is
+available the model is loaded once in the parent and the workers inherit
+it, so they share its pages instead of each unpickling a private copy;
+elsewhere every worker loads the model once when it starts. Only
+probabilities travel back; results are written in input order.
+
+Usage:
+    python src/batch_scoring.py bookings.csv predictions.csv --chunksize 200000 --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+from schema import CSV_DTYPES, apply_schema
+from scoring import (DEFAULT_THRESHOLD, MODEL_PATH, labels_from_proba, load_pipeline,
+                     required_columns, risk_level)
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Workers are forked where possible so they inherit the loaded pipeline
+_MP_CONTEXT = (multiprocessing.get_context('fork')
+               if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+# Pipeline inherited from the parent, or loaded once per worker by _init_worker
+_worker_pipeline = None
+
+
+def build_output(chunk: pd.DataFrame, probs, keep_columns=(),
+                 threshold=DEFAULT_THRESHOLD) -> pd.DataFrame:
+    """Assemble output rows from passthrough columns and probabilities"""
+    out = chunk[list(keep_columns)].copy() if keep_columns else pd.DataFrame(index=chunk.index)
+    out['cancellation_prediction'] = labels_from_proba(probs, threshold)
+    out['cancellation_probability'] = probs
+    out['risk_level'] = risk_level(probs)
+    return out
+
+
+def score_chunk(pipeline, chunk: pd.DataFrame, keep_columns=(),
+                threshold=DEFAULT_THRESHOLD) -> pd.DataFrame:
+    """Score one chunk of raw bookings and return the output rows
+
+    An empty chunk (an input with a header and no rows) gives empty output
+    rows, so the output file still gets its header.
+    """
+    probs = pipeline.predict_proba(chunk)[:, 1] if len(chunk) else np.empty(0)
+    return build_output(chunk, probs, keep_columns, threshold)
+
+
+def _init_worker(model_path):
+    """Load the pipeline once per worker (unless inherited) and keep each worker single-threaded"""
+    global _worker_pipeline
+    threadpool_limits(1)
+    if _worker_pipeline is None:
+        _worker_pipeline = load_pipeline(model_path)
+    if getattr(_worker_pipeline, 'steps', None) is None:
+        return  # compiled model: plain NumPy, already single-threaded
+    model = _worker_pipeline[-1]
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+
+
+def _score_in_worker(rows: pd.DataFrame):
+    return _worker_pipeline.predict_proba(rows)[:, 1]
+
+
+def _score_parallel(reader, pipeline, model_path, workers, keep_columns, threshold):
+    """Yield scored chunks in input order, splitting each chunk across workers
+
+    At most two chunks are in flight, so memory stays bounded by the chunk size.
+    The pipeline is loaded (but not used) before forking: predicting in the
+    parent would start thread pools that don't survive a fork.
+    """
+    global _worker_pipeline
+    if _MP_CONTEXT is not None:
+        _worker_pipeline = pipeline
+    try:
+        yield from _score_pool(reader, model_path, workers, keep_columns, threshold)
+    finally:
+        _worker_pipeline = None
+
+
+def _score_pool(reader, model_path, workers, keep_columns, threshold):
+    with ProcessPoolExecutor(workers, mp_context=_MP_CONTEXT, initializer=_init_worker,
+                             initargs=(model_path,)) as pool:
+        pending = deque()
+        for chunk in map(apply_schema, reader):
+            bounds = np.linspace(0, len(chunk), workers + 1, dtype=int)
+            futures = [
+                pool.submit(_score_in_worker, chunk.iloc[lo:hi])
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+            ]
+            pending.append((chunk, futures))
+            if len(pending) > 1:
+                yield _collect(*pending.popleft(), keep_columns, threshold)
+        while pending:
+            yield _collect(*pending.popleft(), keep_columns, threshold)
+
+
+def _collect(chunk, futures, keep_columns, threshold):
+    probs = np.concatenate([future.result() for future in futures]) if futures else np.empty(0)
+    return build_output(chunk, probs, keep_columns, threshold)
+
+
+def score_file(input_path, output_path, model_path=MODEL_PATH, chunksize=DEFAULT_CHUNKSIZE,
+               keep_columns=(), workers=1, threshold=DEFAULT_THRESHOLD, verbose=True):
+    """Stream input_path through the pipeline chunk by chunk into output_path
+
+    Returns a dict with the number of rows scored, elapsed seconds and rows/second.
+    """
+    start = time.perf_counter()
+    pipeline = load_pipeline(model_path)
+    usecols = list(dict.fromkeys(required_columns(pipeline) + list(keep_columns)))
+    dtypes = {col: dtype for col, dtype in CSV_DTYPES.items() if col in usecols}
+    reader = pd.read_csv(input_path, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+
+    if workers > 1:
+        results = _score_parallel(reader, pipeline, model_path, workers, keep_columns, threshold)
+    else:
+        results = (score_chunk(pipeline, chunk, keep_columns, threshold)
+                   for chunk in map(apply_schema, reader))
+
+    rows = 0
+    for i, out in enumerate(results):
+        out.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0),
+                   index=False, float_format='%.6f')
+        rows += len(out)
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(f"  chunk {i + 1}: {rows:,} rows scored ({rows / elapsed:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a bookings CSV in chunks")
+    parser.add_argument('input', help="CSV with the columns of hotel_bookings.csv")
+    parser.add_argument('output', help="CSV to write predictions to")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to best_model.joblib")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Rows read and scored per chunk")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (0 = one per CPU core)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Probability above which a booking is labelled canceled")
+    parser.add_argument('--keep', default='',
+                        help="Comma-separated input columns to copy into the output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    keep_columns = [col for col in args.keep.split(',') if col]
+    workers = args.workers or os.cpu_count()
+
+    print("=" * 70)
+    print("HOTEL BOOKING DEMAND - BATCH SCORING")
+    print("=" * 70)
+
+    print(f"\n1. Model: {args.model}")
+    print(f"   Workers: {workers}")
+
+    print(f"\n2. Scoring {args.input} in chunks of {args.chunksize:,} rows...")
+    stats = score_file(args.input, args.output, args.model, args.chunksize,
+                       keep_columns, workers, args.threshold)
+
+    print("\n" + "=" * 70)
+    print("BATCH SCORING COMPLETE!")
+    print("=" * 70)
+    print(f"✓ Rows scored: {stats['rows']:,}")
+    print(f"✓ Elapsed: {stats['seconds']:.2f} s")
+    print(f"✓ Throughput: {stats['rows_per_second']:,.0f} rows/s")
+    print(f"✓ Predictions saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Hotel Booking Demand - Data Access Layer
+
+Columnar binary cache for the pipeline's CSV files. Each CSV is parsed once
+and stored as an uncompressed Feather (Arrow IPC) file next to it in a
+cache/ folder, with string columns kept as categoricals. Later loads
+memory-map the Feather file and read only the requested columns.
+
+Booking files are loaded with typed=True, which validates and casts them
+with the declared schema in schema.py before they are cached.
+
+The cache records the source CSV's size, modification time and content
+hash; it is rebuilt automatically when the content hash (or the schema
+version for typed files) changes.
+"""
+
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from hashing import file_hash
+from schema import CSV_DTYPES, SCHEMA_VERSION, apply_schema
+
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_paths(csv_path):
+    """Return (feather_path, meta_path) for a CSV's cache files"""
+    folder = os.path.join(os.path.dirname(os.path.abspath(csv_path)), 'cache')
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(folder, f'{name}.feather'), os.path.join(folder, f'{name}.meta.json')
+
+
+def _source_state(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _schema_tag(typed):
+    return SCHEMA_VERSION if typed else None
+
+
+def cache_is_fresh(csv_path, typed=False):
+    """True when the Feather cache matches the CSV's current contents
+
+    Size and mtime are checked first; the content hash is only recomputed when
+    they differ, so an untouched file costs one stat() call.
+    """
+    feather_path, meta_path = cache_paths(csv_path)
+    meta = _read_meta(meta_path)
+    if (meta is None or meta.get('version') != CACHE_FORMAT_VERSION
+            or meta.get('schema') != _schema_tag(typed) or not os.path.exists(feather_path)):
+        return False
+    state = _source_state(csv_path)
+    if meta['size'] == state['size'] and meta['mtime_ns'] == state['mtime_ns']:
+        return True
+    if meta['size'] != state['size'] or meta['hash'] != file_hash(csv_path):
+        return False
+    # Same contents, new mtime (e.g. re-downloaded): refresh the recorded state
+    _write_meta(meta_path, csv_path, meta['hash'], meta['rows'], typed)
+    return True
+
+
+def _write_meta(meta_path, csv_path, digest, rows, typed):
+    meta = {'version': CACHE_FORMAT_VERSION, 'schema': _schema_tag(typed),
+            'source': os.path.abspath(csv_path),
+            'hash': digest, 'rows': rows, **_source_state(csv_path)}
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def _to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Store string columns as categoricals (Arrow dictionary arrays)"""
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def write_cache(df: pd.DataFrame, csv_path, typed=False):
+    """Write df as the Feather cache for csv_path (which must already exist)"""
+    if typed:
+        apply_schema(df)
+    feather_path, meta_path = cache_paths(csv_path)
+    os.makedirs(os.path.dirname(feather_path), exist_ok=True)
+    table = pa.Table.from_pandas(_to_columnar(df), preserve_index=False)
+    tmp_path = feather_path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, feather_path)
+    _write_meta(meta_path, csv_path, file_hash(csv_path), table.num_rows, typed)
+
+
+def build_cache(csv_path, typed=False):
+    """Parse csv_path once and write its Feather cache"""
+    df = pd.read_csv(csv_path, dtype=CSV_DTYPES if typed else None)
+    write_cache(df, csv_path, typed)
+
+
+def load_dataset(csv_path, columns=None, typed=False) -> pd.DataFrame:
+    """Load a CSV through its columnar cache, (re)building the cache if stale
+
+    columns: optional list of column names to read; other columns are never
+    touched on disk.
+    typed: validate and cast with the booking schema (schema.py); raises
+    SchemaError on invalid values.
+    """
+    return open_dataset(csv_path, columns, typed).to_pandas()
+
+
+def open_dataset(csv_path, columns=None, typed=False) -> pa.Table:
+    """The columnar cache of a CSV as a memory-mapped Arrow table
+
+    Nothing is converted until a slice of it is, e.g.
+    table.slice(lo, n).to_pandas() for one chunk of rows. Arguments as for
+    load_dataset().
+    """
+    if not cache_is_fresh(csv_path, typed):
+        build_cache(csv_path, typed)
+    feather_path, _ = cache_paths(csv_path)
+    return feather.read_table(feather_path, columns=columns, memory_map=True)
+
+
+def dataset_hash(csv_path, typed=False):
+    """Content hash of csv_path as recorded by its (refreshed) cache
+
+    Costs one stat() call while the cache is fresh.
+    """
+    if not cache_is_fresh(csv_path, typed):
+        build_cache(csv_path, typed)
+    _, meta_path = cache_paths(csv_path)
+    return _read_meta(meta_path)['hash']
+
+
+def save_dataset(df: pd.DataFrame, csv_path, typed=False):
+    """Write df to csv_path and prime its columnar cache in the same step"""
+    df.to_csv(csv_path, index=False)
+    write_cache(df.copy(), csv_path, typed)
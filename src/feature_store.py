@@ -0,0 +1,89 @@
+"""
+Hotel Booking Demand - Feature Store
+
+Binary storage for the train/test matrices handed from feature engineering
+to model training. Features are written as contiguous float32 .npy files and
+labels as int8, plus a small metadata.json with feature names, the label
+column, shapes and the row indices of each split. Training opens them with
+np.load(mmap_mode='r'), so nothing is parsed and pages are read on demand.
+
+Feature engineering fills the matrices chunk by chunk through the writable
+memory maps open_matrices() returns, then calls finish_matrices() to write
+labels, indices and metadata.
+
+Layout of data/features/:
+    X_train.npy  X_test.npy  y_train.npy  y_test.npy
+    train_index.npy  test_index.npy  metadata.json
+"""
+
+import json
+import os
+import numpy as np
+
+FEATURE_DIR = os.path.join('data', 'features')
+FEATURE_DTYPE = np.float32
+LABEL_DTYPE = np.int8
+METADATA_FILE = 'metadata.json'
+
+
+def save_matrices(X_train, X_test, y_train, y_test, feature_names,
+                  train_index, test_index, label='is_canceled', out_dir=FEATURE_DIR):
+    """Write the split matrices and their metadata to out_dir"""
+    matrices = open_matrices(len(X_train), len(X_test), len(feature_names), out_dir)
+    matrices['X_train'][:] = X_train
+    matrices['X_test'][:] = X_test
+    return finish_matrices(matrices, y_train, y_test, feature_names, train_index, test_index,
+                           label, out_dir)
+
+
+def open_matrices(n_train, n_test, n_features, out_dir=FEATURE_DIR):
+    """Writable float32 memory maps {'X_train', 'X_test'} of the given shapes in out_dir"""
+    os.makedirs(out_dir, exist_ok=True)
+    return {name: np.lib.format.open_memmap(os.path.join(out_dir, f'{name}.npy'), mode='w+',
+                                            dtype=FEATURE_DTYPE, shape=(n_rows, n_features))
+            for name, n_rows in (('X_train', n_train), ('X_test', n_test))}
+
+
+def finish_matrices(matrices, y_train, y_test, feature_names, train_index, test_index,
+                    label='is_canceled', out_dir=FEATURE_DIR):
+    """Flush the matrices from open_matrices() and write labels, indices and metadata"""
+    arrays = dict(matrices)
+    for X in matrices.values():
+        X.flush()
+    labels = {
+        'y_train': np.asarray(y_train, dtype=LABEL_DTYPE),
+        'y_test': np.asarray(y_test, dtype=LABEL_DTYPE),
+        'train_index': np.asarray(train_index, dtype=np.int64),
+        'test_index': np.asarray(test_index, dtype=np.int64),
+    }
+    for name, array in labels.items():
+        np.save(os.path.join(out_dir, f'{name}.npy'), array)
+    arrays.update(labels)
+
+    metadata = {
+        'feature_names': list(feature_names),
+        'label': label,
+        'feature_dtype': np.dtype(FEATURE_DTYPE).name,
+        'label_dtype': np.dtype(LABEL_DTYPE).name,
+        'shapes': {name: list(array.shape) for name, array in arrays.items()},
+    }
+    with open(os.path.join(out_dir, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+def load_metadata(in_dir=FEATURE_DIR):
+    with open(os.path.join(in_dir, METADATA_FILE)) as f:
+        return json.load(f)
+
+
+def load_matrices(in_dir=FEATURE_DIR, mmap_mode='r'):
+    """Open the saved split as read-only memory maps
+
+    Returns a dict with X_train, X_test, y_train, y_test, train_index,
+    test_index and metadata. Pass mmap_mode=None to read into memory instead.
+    """
+    data = {'metadata': load_metadata(in_dir)}
+    for name in ('X_train', 'X_test', 'y_train', 'y_test', 'train_index', 'test_index'):
+        data[name] = np.load(os.path.join(in_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+    return data
@@ -0,0 +1,156 @@
+"""
+Hotel Booking Demand - Feature Builders
+
+Vectorized temporal and booking feature construction shared by feature
+engineering, the preprocessing pipeline and online scoring. Month numbers,
+seasons and calendar fields come from NumPy lookup tables, and every derived
+column is built from the raw arrays in one pass with no per-row Python calls.
+"""
+
+import numpy as np
+import pandas as pd
+from schema import MONTH_NAMES
+
+MONTH_INDEX = pd.Index(MONTH_NAMES)
+MONTH_MAP = {name: i + 1 for i, name in enumerate(MONTH_NAMES)}
+
+# Season lookup table indexed by month number (0 = unknown month, falls to 'Fall')
+SEASON_NAMES = ['Winter', 'Spring', 'Summer', 'Fall']
+MONTH_TO_SEASON = np.array([3, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+# Raw columns (as in hotel_bookings.csv) the builders read
+NUMERIC_COLUMNS = [
+    'lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
+    'adults', 'children', 'babies', 'is_repeated_guest',
+    'previous_cancellations', 'previous_bookings_not_canceled',
+    'booking_changes', 'days_in_waiting_list', 'adr',
+    'required_car_parking_spaces', 'total_of_special_requests'
+]
+CATEGORICAL_INPUTS = [
+    'hotel', 'meal', 'market_segment', 'distribution_channel',
+    'reserved_room_type', 'assigned_room_type', 'deposit_type', 'customer_type'
+]
+CALENDAR_INPUTS = ['arrival_date_year', 'arrival_date_day_of_month']
+
+# Optional calendar features built from arrival_date_year / month / day_of_month
+CALENDAR_FEATURES = ['arrival_weekday', 'arrival_day_of_year']
+
+
+def required_columns(extra_features=False):
+    """Raw columns needed to build the features"""
+    columns = NUMERIC_COLUMNS + ['arrival_date_month'] + CATEGORICAL_INPUTS
+    return columns + CALENDAR_INPUTS if extra_features else columns
+
+
+def check_columns(df: pd.DataFrame, extra_features=False):
+    """Raise a ValueError naming any required raw columns that are missing"""
+    missing = [col for col in required_columns(extra_features) if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+
+def as_categorical(values) -> pd.Categorical:
+    """View a column as a Categorical (free for schema-typed columns)"""
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pd.Categorical):
+        return values
+    return pd.Categorical(values)
+
+
+def month_numbers(months) -> np.ndarray:
+    """Month names -> 1..12 (0 for unknown/missing) via a lookup on the categories"""
+    cat = as_categorical(months)
+    table = np.append(MONTH_INDEX.get_indexer(cat.categories.astype(str)) + 1, 0)
+    return table[cat.codes].astype(np.int8)
+
+
+def season_codes(month_num: np.ndarray) -> np.ndarray:
+    """Month numbers -> index into SEASON_NAMES"""
+    return MONTH_TO_SEASON[month_num]
+
+
+def calendar_features(year, month_num, day) -> dict:
+    """Arrival date, weekday (Monday=0) and day of year from year/month/day arrays"""
+    valid = month_num > 0
+    years = (np.asarray(year, dtype=np.int64) - 1970).astype('datetime64[Y]')
+    months = years.astype('datetime64[M]') + (np.maximum(month_num, 1) - 1).astype('timedelta64[M]')
+    dates = months.astype('datetime64[D]') + (np.asarray(day, dtype=np.int64) - 1).astype('timedelta64[D]')
+    dates[~valid] = np.datetime64('NaT')
+
+    days = dates.astype(np.int64)
+    # 1970-01-01 was a Thursday
+    weekday = np.where(valid, (days + 3) % 7, -1)
+    day_of_year = np.where(valid, (dates - years.astype('datetime64[D]')).astype(np.int64) + 1, 0)
+    return {
+        'arrival_date': dates,
+        'arrival_weekday': weekday.astype(np.int8),
+        'arrival_day_of_year': day_of_year.astype(np.int16),
+    }
+
+
+def numeric_array(values) -> np.ndarray:
+    """Column -> float64 array with non-numeric and missing values as 0"""
+    values = pd.to_numeric(values, errors='coerce')
+    return np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+
+
+def build_features(df: pd.DataFrame, extra_features=False) -> dict:
+    """Map every feature name to an array built from the raw columns
+
+    Numeric features are float64 arrays, categorical features (including
+    'season') are pandas Categoricals. With extra_features, the calendar
+    columns arrival_date, arrival_weekday and arrival_day_of_year are added.
+    """
+    check_columns(df, extra_features)
+    cols = {col: numeric_array(df[col]) for col in NUMERIC_COLUMNS}
+
+    month_num = month_numbers(df['arrival_date_month'])
+    cols['arrival_month_num'] = month_num.astype(np.float64)
+    cols['season'] = pd.Categorical.from_codes(season_codes(month_num), SEASON_NAMES)
+
+    weekend, week = cols['stays_in_weekend_nights'], cols['stays_in_week_nights']
+    children, babies = cols['children'], cols['babies']
+    cols['total_nights'] = weekend + week
+    cols['total_guests'] = cols['adults'] + children + babies
+    cols['has_children'] = (children > 0).astype(np.float64)
+    cols['has_babies'] = (babies > 0).astype(np.float64)
+    cols['has_special_requests'] = (cols['total_of_special_requests'] > 0).astype(np.float64)
+
+    for col in CATEGORICAL_INPUTS:
+        cols[col] = as_categorical(df[col])
+
+    if extra_features:
+        calendar = calendar_features(numeric_array(df['arrival_date_year']), month_num,
+                                     numeric_array(df['arrival_date_day_of_month']))
+        cols['arrival_date'] = calendar['arrival_date']
+        cols['arrival_weekday'] = calendar['arrival_weekday'].astype(np.float64)
+        cols['arrival_day_of_year'] = calendar['arrival_day_of_year'].astype(np.float64)
+    return cols
+
+
+def take_rows(cols: dict, positions) -> dict:
+    """Rows of a build_features() dict at the given positions"""
+    positions = np.asarray(positions)
+    return {name: values[positions] for name, values in cols.items()}
+
+
+def category_labels(cat: pd.Categorical) -> np.ndarray:
+    """Distinct labels of a Categorical as strings, with 'nan' for missing values
+
+    Matches LabelEncoder on .astype(str), which the original pipeline used.
+    """
+    used = np.unique(cat.codes)
+    labels = cat.categories.astype(str).to_numpy(dtype=object)[used[used >= 0]]
+    return np.append(labels, 'nan') if (used < 0).any() else labels
+
+
+def encode_categorical(cat: pd.Categorical, index: pd.Index) -> np.ndarray:
+    """Codes of cat's values in a fitted category index (-1 if unseen)
+
+    The lookup runs once per distinct category, then is gathered by code, so
+    the per-row cost is a single integer index.
+    """
+    table = index.get_indexer(cat.categories.astype(str))
+    table = np.append(table, index.get_indexer(['nan']))
+    return table[cat.codes]
@@ -0,0 +1,20 @@
+"""
+Hotel Booking Demand - File Hashing
+
+Content hashes for data files and model artifacts. Kept free of pandas and
+pyarrow so the scoring services can version their model without importing
+them.
+"""
+
+import hashlib
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """BLAKE2b digest of a file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
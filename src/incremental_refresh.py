@@ -0,0 +1,267 @@
+"""
+Hotel Booking Demand - Incremental Model Refresh
+
+Updates the model with the bookings appended to the booking log since the
+last refresh, instead of rerunning feature engineering and training over the
+whole history. Time and memory are proportional to the new rows:
+  - only the bytes after the offset recorded in the refresh state are read
+    (the log is append-only; a hash of the last 4 KB before the offset
+    catches a truncated or replaced file, not edits further back),
+  - the current model first scores the new bookings (their F1 is recorded,
+    an honest out-of-sample check),
+  - the preprocessor's category vocabularies and scaling statistics are
+    updated with partial_fit (new labels are appended, so a new room type
+    or market segment gets its own code; values first seen at scoring time
+    fall in the -1 unknown bucket),
+  - the SGD logistic regression from 03_model_training.py is carried over to
+    the updated scaling (same predictions) and warm-started with partial_fit
+    on the new rows,
+  - the preprocessor + model pipeline is written as a new version,
+    artifacts/refresh/model_vNNNN.joblib.
+
+--promote holds out the latest --holdout share of the new bookings, scores
+the refreshed pipeline and the current artifacts/best_model.joblib on them,
+and replaces best_model.joblib (and deletes the stale best_model.npz) only if
+the refreshed one has the higher F1. Once that is decided, the held-out
+bookings are trained on as well, so the saved version covers every row up to
+the recorded offset.
+
+The first run records the end of the log as the starting point (the models
+from the full pipeline already cover it). Tree models are not refreshed;
+they still need the full pipeline.
+
+Usage (from the project root):
+    python src/incremental_refresh.py
+    python src/incremental_refresh.py --data data/hotel_bookings.csv --epochs 2 --promote
+    python src/incremental_refresh.py --reset
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.metrics import f1_score
+from sklearn.pipeline import Pipeline
+from features import required_columns
+from schema import CSV_DTYPES, apply_schema
+from scoring import DEFAULT_THRESHOLD, MODEL_PATH, predict_with_threshold, save_artifact, save_best_model
+import streaming
+
+DEFAULT_DATA = 'data/hotel_bookings.csv'
+DEFAULT_HOLDOUT = 0.2
+REFRESH_DIR = 'artifacts/refresh'
+STATE_PATH = os.path.join(REFRESH_DIR, 'state.json')
+BASE_PREPROCESSOR = 'artifacts/preprocessor.joblib'
+BASE_MODEL = 'artifacts/sgd_model.joblib'
+TARGET = 'is_canceled'
+
+# Bytes before the recorded offset that must be unchanged on the next run
+ANCHOR_BYTES = 4096
+
+
+def _anchor(path, offset):
+    start = max(offset - ANCHOR_BYTES, 0)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.blake2b(f.read(offset - start), digest_size=16).hexdigest()
+
+
+def log_end(path):
+    """Offset just past the last complete line of path"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(max(size - (1 << 16), 0))
+        tail = f.read()
+    return size - len(tail) + tail.rfind(b'\n') + 1
+
+
+def read_new_rows(path, offset, columns):
+    """Typed booking rows between offset and the last complete line; returns (df, end)"""
+    end = log_end(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        body = f.read(end - offset)
+    df = pd.read_csv(io.BytesIO(header + body), usecols=columns,
+                     dtype={col: dtype for col, dtype in CSV_DTYPES.items() if col in columns})
+    return apply_schema(df), end
+
+
+def read_state(path=STATE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def baseline_state(data_path):
+    offset = log_end(data_path)
+    return {'data': os.path.abspath(data_path), 'offset': offset,
+            'anchor': _anchor(data_path, offset), 'version': 0, 'model': None, 'history': []}
+
+
+def load_current(state):
+    """(preprocessor, model) of the latest refresh, or of the full pipeline's run"""
+    if state['model']:
+        pipeline = joblib.load(state['model'])
+        return pipeline.named_steps['preprocessor'], pipeline.named_steps['model']
+    return joblib.load(BASE_PREPROCESSOR), joblib.load(BASE_MODEL)
+
+
+def split_holdout(df, holdout=DEFAULT_HOLDOUT):
+    """(train, holdout): the last `holdout` share of the rows (the latest bookings) is held out"""
+    n_holdout = int(round(len(df) * holdout))
+    return df.iloc[:len(df) - n_holdout], df.iloc[len(df) - n_holdout:]
+
+
+def holdout_f1(pipeline, df):
+    labels, _ = predict_with_threshold(pipeline, df, DEFAULT_THRESHOLD)
+    return f1_score(df[TARGET], labels)
+
+
+def refresh(preprocessor, model, df, epochs=1, chunk_rows=streaming.DEFAULT_CHUNK_ROWS, seed=42):
+    """Update preprocessor and model in place with df's rows; returns the model"""
+    old_mean, old_scale = preprocessor.mean_.copy(), preprocessor.scale_.copy()
+    preprocessor.partial_fit(df)
+    streaming.rescale_inputs(model, old_mean, old_scale, preprocessor.mean_, preprocessor.scale_)
+    X = preprocessor.transform(df)
+    y = df[TARGET].to_numpy(dtype=np.int64)
+    class_weights = streaming.balanced_weights(y, chunk_rows)
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        order = rng.permutation(len(X))
+        for lo, hi in streaming.chunk_bounds(len(X), chunk_rows):
+            rows = order[lo:hi]
+            model.partial_fit(X[rows], y[rows], classes=np.array([0, 1]),
+                              sample_weight=class_weights[y[rows]])
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the model with newly arrived bookings")
+    parser.add_argument('--data', default=DEFAULT_DATA, help="Append-only bookings CSV")
+    parser.add_argument('--epochs', type=int, default=1, help="Passes over the new bookings")
+    parser.add_argument('--chunk-rows', type=int, default=streaming.DEFAULT_CHUNK_ROWS,
+                        help="Rows per partial_fit call")
+    parser.add_argument('--promote', action='store_true',
+                        help="Also save the refreshed pipeline as artifacts/best_model.joblib "
+                             "if it beats the current one on held-out new bookings")
+    parser.add_argument('--holdout', type=float, default=DEFAULT_HOLDOUT,
+                        help="Share of the new bookings held out to decide --promote")
+    parser.add_argument('--reset', action='store_true',
+                        help="Start over from the full pipeline's models at the current end of --data")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("HOTEL BOOKING DEMAND - INCREMENTAL MODEL REFRESH")
+    print("=" * 70)
+
+    state = None if args.reset else read_state()
+    if state is None:
+        state = baseline_state(args.data)
+        write_state(state)
+        print(f"✓ Starting point recorded: {args.data} up to byte {state['offset']:,}")
+        print("  (bookings appended from now on are picked up by the next refresh)")
+        return
+    if _anchor(args.data, state['offset']) != state['anchor']:
+        raise SystemExit(f"{args.data} changed before byte {state['offset']:,} since the last refresh "
+                         "(the log must be append-only); rerun the full pipeline and --reset")
+
+    print(f"\n1. Reading bookings after byte {state['offset']:,} of {args.data}...")
+    start = time.perf_counter()
+    preprocessor, model = load_current(state)
+    columns = required_columns(preprocessor.extra_features) + [TARGET]
+    best = None
+    if args.promote and os.path.exists(MODEL_PATH):
+        best = joblib.load(MODEL_PATH)
+        best_columns = required_columns(best.named_steps['preprocessor'].extra_features)
+        columns += [col for col in best_columns if col not in columns]
+    df, end = read_new_rows(args.data, state['offset'], columns)
+    if df.empty:
+        print("✓ No new bookings - nothing to refresh")
+        return
+    print(f"✓ {len(df):,} new bookings ({(end - state['offset']) / 2**20:.1f} MB)")
+
+    print(f"\n2. Scoring them with model version {state['version']}...")
+    labels, _ = predict_with_threshold(model, preprocessor.transform(df), DEFAULT_THRESHOLD)
+    f1_before = f1_score(df[TARGET], labels)
+    print(f"✓ F1 on the new bookings before refresh: {f1_before:.4f}")
+
+    print("\n3. Updating vocabularies, scaling statistics and model...")
+    train_df, holdout_df = split_holdout(df, args.holdout) if args.promote else (df, df.iloc[:0])
+    if args.promote:
+        print(f"({len(holdout_df):,} latest bookings held out to decide --promote)")
+    known = {col: len(cats) for col, cats in preprocessor.categories_.items()}
+    refresh(preprocessor, model, train_df, epochs=args.epochs, chunk_rows=args.chunk_rows)
+    for col, cats in preprocessor.categories_.items():
+        if len(cats) > known[col]:
+            print(f"  - {col}: new categories {list(cats[known[col]:])}")
+    print(f"✓ Preprocessor now covers {preprocessor.n_samples_seen_:,} bookings; "
+          f"model warm-started for {args.epochs} epoch(s)")
+
+    pipeline = Pipeline([('preprocessor', preprocessor), ('model', model)])
+    promoted = False
+    if args.promote:
+        print(f"\n4. Comparing with {MODEL_PATH} on the held-out bookings...")
+        if holdout_df.empty:
+            print("⚠️  No held-out bookings (too few new rows or --holdout 0) - not promoted")
+        else:
+            f1_refreshed = holdout_f1(pipeline, holdout_df)
+            f1_best = holdout_f1(best, holdout_df) if best is not None else None
+            print(f"✓ Held-out F1: refreshed {f1_refreshed:.4f}, current best "
+                  + (f"{f1_best:.4f}" if f1_best is not None else "(none)"))
+            promoted = f1_best is None or f1_refreshed > f1_best
+            print("✓ Refreshed model promoted" if promoted else "Current best model kept")
+    else:
+        print("\n4. Comparing with the current best model...")
+        print("Skipped (run with --promote to replace it if the refreshed model is better)")
+
+    if not holdout_df.empty:
+        # The offset moves past the held-out rows, so they are learned now or never
+        refresh(preprocessor, model, holdout_df, epochs=args.epochs, chunk_rows=args.chunk_rows)
+        print(f"✓ Held-out bookings trained on after the decision; preprocessor now covers "
+              f"{preprocessor.n_samples_seen_:,} bookings")
+
+    print("\n5. Saving the new version...")
+    version = state['version'] + 1
+    path = os.path.join(REFRESH_DIR, f'model_v{version:04d}.joblib')
+    os.makedirs(REFRESH_DIR, exist_ok=True)
+    save_artifact(pipeline, path)
+    if promoted:
+        save_best_model(pipeline, MODEL_PATH)
+    seconds = time.perf_counter() - start
+    record = {'version': version, 'rows': len(df), 'from_offset': state['offset'],
+              'to_offset': end, 'f1_before': round(f1_before, 4),
+              'seconds': round(seconds, 3), 'promoted': promoted}
+    if args.promote and not holdout_df.empty:
+        record.update({'holdout_rows': len(holdout_df), 'f1_holdout': round(f1_refreshed, 4),
+                       'f1_best': round(f1_best, 4) if f1_best is not None else None})
+    state['history'].append(record)
+    state.update({'offset': end, 'anchor': _anchor(args.data, end), 'version': version,
+                  'model': path})
+    write_state(state)
+    print(f"✓ {path}")
+    if promoted:
+        print(f"✓ {MODEL_PATH}")
+
+    print("\n" + "=" * 70)
+    print(f"✓ Version {version}: {len(df):,} new bookings in {seconds:.2f}s")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
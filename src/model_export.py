@@ -0,0 +1,239 @@
+"""
+Hotel Booking Demand - Compiled Model Export
+
+Writes the preprocessor + model pipeline saved by 03_model_training.py as a
+compiled .npz file for compiled_model.CompiledModel, which scores bookings
+with NumPy alone. Supported models are LogisticRegression,
+RandomForestClassifier and HistGradientBoostingClassifier (binary).
+
+Before the file is written, both the pipeline and the compiled model score a
+batch of synthetic bookings (including missing and unseen categories); the
+export fails if any probability differs by more than TOLERANCE. The file
+records the content hash of the joblib it was exported from, so app.py can
+tell a stale export from a current one (scoring.compiled_is_current).
+
+Usage:
+    python src/model_export.py --model artifacts/best_model.joblib --out artifacts/best_model.npz
+"""
+
+import argparse
+import os
+import numpy as np
+from compiled_model import FORMAT_VERSION, MAX_CATEGORIES, CompiledModel
+from features import MONTH_TO_SEASON, SEASON_NAMES, required_columns
+from preprocessing import CATEGORICAL_COLUMNS
+from schema import MONTH_NAMES, apply_schema
+from hashing import file_hash
+from scoring import COMPILED_PATH, MODEL_PATH, load_pipeline
+import synthetic
+
+TOLERANCE = 1e-9
+CHECK_ROWS = 5000
+
+
+def _preprocessing_arrays(preprocessor) -> dict:
+    season_labels = np.array(SEASON_NAMES, dtype=object)[MONTH_TO_SEASON]
+    arrays = {
+        'feature_names': np.array(preprocessor.feature_names_, dtype=str),
+        'required_columns': np.array(required_columns(preprocessor.extra_features), dtype=str),
+        'month_names': np.array(MONTH_NAMES, dtype=str),
+        'season_codes': preprocessor.categories_['season'].get_indexer(season_labels),
+        'mean': preprocessor.mean_,
+        'scale': preprocessor.scale_,
+        'scaled': np.array(preprocessor.scale),
+        'categorical_codes': np.array(preprocessor.categorical_codes),
+    }
+    for col in CATEGORICAL_COLUMNS:
+        arrays[f'categories__{col}'] = preprocessor.categories_[col].to_numpy(dtype=str)
+    return arrays
+
+
+def _pack_trees(trees) -> dict:
+    """Concatenate per-tree node dicts into global arrays; leaves point to themselves"""
+    parts = {key: [] for key in ('feature', 'threshold', 'left', 'right', 'value',
+                                 'missing_left', 'cat_row')}
+    roots, cat_tables, offset, depth = [], [], 0, 0
+    for tree in trees:
+        n = len(tree['feature'])
+        leaf = tree['is_leaf']
+        own = np.arange(offset, offset + n)
+        left = np.where(leaf, own, tree['left'] + offset)
+        right = np.where(leaf, own, tree['right'] + offset)
+        cat_row = np.where(tree['cat_row'] >= 0, tree['cat_row'] + len(cat_tables), -1)
+        cat_tables.extend(tree['cat_tables'])
+        for key, values in (('feature', np.where(leaf, 0, tree['feature'])),
+                            ('threshold', tree['threshold']), ('left', left), ('right', right),
+                            ('value', tree['value']), ('missing_left', tree['missing_left']),
+                            ('cat_row', cat_row)):
+            parts[key].append(values)
+        roots.append(offset)
+        depth = max(depth, int(tree['depth']))
+        offset += n
+
+    arrays = {
+        'feature': np.concatenate(parts['feature']).astype(np.int32),
+        'threshold': np.concatenate(parts['threshold']).astype(np.float64),
+        'left': np.concatenate(parts['left']).astype(np.int32),
+        'right': np.concatenate(parts['right']).astype(np.int32),
+        'value': np.concatenate(parts['value']).astype(np.float64),
+        'missing_left': np.concatenate(parts['missing_left']).astype(bool),
+        'cat_row': np.concatenate(parts['cat_row']).astype(np.int32),
+        'cat_left': (np.array(cat_tables, dtype=bool) if cat_tables
+                     else np.zeros((0, MAX_CATEGORIES), dtype=bool)),
+        'roots': np.array(roots, dtype=np.int32),
+        'depth': np.array(depth),
+    }
+    return arrays
+
+
+def _forest_trees(forest):
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        total = value.sum(axis=1)
+        total[total == 0] = 1.0
+        leaf = tree.children_left == -1
+        yield {
+            'feature': tree.feature, 'threshold': tree.threshold,
+            'left': tree.children_left, 'right': tree.children_right, 'is_leaf': leaf,
+            'value': value[:, 1] / total,
+            'missing_left': tree.missing_go_to_left.astype(bool),
+            'cat_row': np.full(tree.node_count, -1), 'cat_tables': [],
+            'depth': tree.max_depth,
+        }
+
+
+def _bitset_members(bitset):
+    """Category codes whose bit is set in an 8 x uint32 bitset"""
+    bits = np.unpackbits(np.asarray(bitset, dtype='<u4').view(np.uint8), bitorder='little')
+    return bits[:MAX_CATEGORIES].astype(bool)
+
+
+def _hgb_inputs(model, n_features):
+    """Original column of each feature the HGB trees split on, and the original
+    category code of each ordinal category value for categorical features
+
+    sklearn re-encodes categorical columns with an internal OrdinalEncoder and
+    moves them in front of the numeric ones; the trees index that matrix.
+    """
+    transformer = getattr(model, '_preprocessor', None)
+    if transformer is None:
+        return np.arange(n_features), {}
+    columns, categories = [], {}
+    for name, step, mask in transformer.transformers_:
+        if name == 'remainder':
+            continue
+        indices = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask)
+        if name == 'encoder':
+            for k, codes in enumerate(step.categories_):
+                categories[len(columns) + k] = codes
+        columns.extend(indices)
+    return np.array(columns), categories
+
+
+def _hgb_trees(model, n_features):
+    """Nodes of every HGB predictor in terms of the preprocessor's output matrix
+
+    Categorical splits become 256-entry tables saying, per category code,
+    whether a row goes left.
+    """
+    columns, categories = _hgb_inputs(model, n_features)
+    bin_mapper = model._bin_mapper
+    known = {}
+    for f in np.flatnonzero(bin_mapper.is_categorical_):
+        table = np.zeros(MAX_CATEGORIES, dtype=bool)
+        table[bin_mapper.bin_thresholds_[f].astype(np.int64)] = True
+        known[f] = table
+    for predictors in model._predictors:
+        predictor = predictors[0]
+        nodes = predictor.nodes
+        cat_row = np.full(len(nodes), -1)
+        cat_tables = []
+        for i in np.flatnonzero(nodes['is_categorical'] & ~nodes['is_leaf']):
+            f, missing_left = nodes['feature_idx'][i], bool(nodes['missing_go_to_left'][i])
+            in_left = _bitset_members(predictor.raw_left_cat_bitsets[nodes['bitset_idx'][i]])
+            goes_left = in_left | (~known[f] & missing_left)
+            if f in categories:
+                # Codes the encoder never saw become NaN, i.e. missing
+                codes = categories[f]
+                seen = np.isfinite(codes)
+                if (codes[seen] >= MAX_CATEGORIES).any():
+                    raise ValueError(f"More than {MAX_CATEGORIES} categories in column {columns[f]}")
+                table = np.full(MAX_CATEGORIES, missing_left)
+                table[codes[seen].astype(np.int64)] = goes_left[:len(codes)][seen]
+                goes_left = table
+            cat_row[i] = len(cat_tables)
+            cat_tables.append(goes_left)
+        yield {
+            'feature': columns[nodes['feature_idx']], 'threshold': nodes['num_threshold'],
+            'left': nodes['left'].astype(np.int64), 'right': nodes['right'].astype(np.int64),
+            'is_leaf': nodes['is_leaf'].astype(bool), 'value': nodes['value'],
+            'missing_left': nodes['missing_go_to_left'].astype(bool),
+            'cat_row': cat_row, 'cat_tables': cat_tables,
+            'depth': nodes['depth'].max(),
+        }
+
+
+def _model_arrays(model) -> dict:
+    if list(model.classes_) != [0, 1]:
+        raise ValueError(f"Only binary 0/1 models can be compiled, got classes {model.classes_}")
+    if hasattr(model, 'coef_'):
+        return {'kind': np.array('linear'), 'coef': model.coef_, 'intercept': model.intercept_}
+    if hasattr(model, 'estimators_'):
+        arrays = _pack_trees(_forest_trees(model))
+        arrays.update({'kind': np.array('forest'), 'input_float32': np.array(True)})
+        return arrays
+    if hasattr(model, '_predictors'):
+        arrays = _pack_trees(_hgb_trees(model, model.n_features_in_))
+        arrays.update({'kind': np.array('boosting'), 'input_float32': np.array(False),
+                       'baseline': np.array(float(np.ravel(model._baseline_prediction)[0]))})
+        return arrays
+    raise ValueError(f"Cannot compile a {type(model).__name__}")
+
+
+def check_rows(n=CHECK_ROWS, seed=0):
+    """Synthetic bookings with some missing and unseen categories mixed in"""
+    df = synthetic.generate(synthetic.default_profile(), n, seed)
+    rng = np.random.default_rng(seed)
+    for col in ('meal', 'market_segment', 'assigned_room_type', 'arrival_date_month'):
+        df[col] = df[col].astype(object)
+        df.loc[rng.random(n) < 0.02, col] = None
+        if col != 'arrival_date_month':  # the schema rejects unknown months
+            df.loc[rng.random(n) < 0.02, col] = 'Unseen'
+    return apply_schema(df)
+
+
+def export(pipeline, path, rows=None, source_path=None):
+    """Compile pipeline to path; returns the largest probability difference found
+
+    source_path: the joblib file pipeline was saved to, whose hash is recorded.
+    """
+    preprocessor, model = pipeline[0], pipeline[-1]
+    arrays = {'format_version': np.array(FORMAT_VERSION)}
+    if source_path is not None:
+        arrays['source_hash'] = np.array(file_hash(source_path))
+    arrays.update(_preprocessing_arrays(preprocessor))
+    arrays.update(_model_arrays(model))
+
+    compiled = CompiledModel(arrays)
+    rows = check_rows() if rows is None else rows
+    diff = float(np.max(np.abs(compiled.predict_proba(rows) - pipeline.predict_proba(rows))))
+    if diff > TOLERANCE:
+        raise ValueError(f"Compiled model differs from the pipeline by {diff:.3g}")
+    np.savez(path, **arrays)
+    return diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the trained pipeline to a NumPy-only model file")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to best_model.joblib")
+    parser.add_argument('--out', default=COMPILED_PATH, help="Compiled .npz to write")
+    args = parser.parse_args(argv)
+
+    diff = export(load_pipeline(args.model), args.out, source_path=args.model)
+    print(f"✓ Compiled model saved to {args.out} "
+          f"({os.path.getsize(args.out) / 1024**2:.1f} MB, max probability difference {diff:.2g})")
+
+
+if __name__ == '__main__':
+    main()
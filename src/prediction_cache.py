@@ -0,0 +1,235 @@
+"""
+Hotel Booking Demand - Prediction Cache
+
+LRU + TTL cache of cancellation probabilities in front of the trained
+pipeline. The booking engine re-scores the same reservation many times
+while a guest browses; with the cache a repeat costs the preprocessing
+step and a dictionary lookup instead of a model evaluation (for the
+RandomForest, a walk through every tree).
+
+Keys are a BLAKE2b hash of the normalized feature vector, i.e. the row the
+fitted preprocessor hands to the model. Bookings that differ only in
+columns the model ignores, or in formatting ("7" vs 7), share an entry.
+
+The cache is bounded by entry count and by an estimate of its memory use,
+entries expire after a TTL, and everything is dropped when the model
+artifact changes on disk (CachedPipeline polls its size and mtime and
+reloads the pipeline). A compiled .npz that is deleted because it went
+stale (scoring.save_best_model) is replaced by the .joblib next to it.
+
+Usage:
+    scorer = CachedPipeline.from_path(MODEL_PATH, PredictionCache(max_entries=100_000))
+    labels, probs = predict_with_threshold(scorer, df)
+    scorer.cache.metrics()
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from compiled_model import CompiledModel
+from hashing import file_hash
+from scoring import joblib_path, load_pipeline, warm_up
+
+# Approximate bytes per entry: 16-byte key, (probability, expiry) tuple and
+# the OrderedDict node and hash-table slot
+ENTRY_BYTES = (sys.getsizeof(bytes(16)) + sys.getsizeof((0.0, 0.0))
+               + 2 * sys.getsizeof(0.0) + 104)
+
+
+def feature_keys(X) -> list:
+    """Stable 16-byte key per row of a feature matrix"""
+    X = np.ascontiguousarray(X, dtype=np.float64) + 0.0  # -0.0 -> 0.0
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in X]
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of probabilities with a TTL and a memory bound"""
+
+    def __init__(self, max_entries=100_000, max_bytes=64 * 1024**2, ttl=3600.0,
+                 model_version=None):
+        self.max_entries = max(0, min(max_entries, max_bytes // ENTRY_BYTES))
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.model_version = model_version
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get_many(self, keys):
+        """Cached probability for each key, or None for a miss"""
+        now = time.monotonic()
+        out = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    out.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    out.append(entry[0])
+        return out
+
+    def put_many(self, keys, probs, model_version=None):
+        """Store probabilities; ignored if computed by an outdated model"""
+        if self.max_entries == 0:
+            return
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            if model_version is not None and model_version != self.model_version:
+                return
+            for key, prob in zip(keys, probs):
+                self._entries[key] = (float(prob), expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, model_version=None):
+        """Drop every entry (called when the model changes)"""
+        with self._lock:
+            self._entries.clear()
+            self.model_version = model_version
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'approx_mb': round(len(self._entries) * ENTRY_BYTES / 1024**2, 3),
+                'max_mb': round(self.max_bytes / 1024**2, 3),
+                'ttl_s': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'model_version': self.model_version,
+            }
+
+
+class CachedPipeline:
+    """predict_proba() through a PredictionCache; reloads when the artifact changes
+
+    Drop-in for the pipeline wherever scoring.predict_with_threshold is used.
+    """
+
+    def __init__(self, pipeline, cache, path=None, check_interval=5.0):
+        self.pipeline = pipeline
+        self.cache = cache
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stat = self._artifact_stat()
+        self._checked_at = time.monotonic()
+        if path is not None and cache.model_version is None:
+            cache.invalidate(file_hash(path))
+
+    @classmethod
+    def from_path(cls, path, cache, check_interval=5.0):
+        return cls(load_pipeline(path), cache, path, check_interval)
+
+    def _artifact_stat(self):
+        if self.path is None:
+            return None
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _maybe_reload(self):
+        """Reload the pipeline and reset the cache if the artifact changed"""
+        if self.path is None or time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = self._artifact_stat()
+            except OSError:
+                source = joblib_path(self.path)
+                if not str(self.path).endswith('.npz') or not os.path.exists(source):
+                    return  # being replaced; keep serving the loaded model
+                # The compiled copy went stale and was deleted: serve the model it came from
+                self.path = source
+                stat = self._artifact_stat()
+            if stat == self._stat:
+                return
+            version = file_hash(self.path)
+            if version != self.cache.model_version:
+                pipeline = load_pipeline(self.path)
+                warm_up(pipeline)
+                self.pipeline = pipeline
+                self.cache.invalidate(version)
+            self._stat = stat
+
+    @staticmethod
+    def _split(pipeline):
+        """(rows -> feature matrix, feature matrix -> probabilities)"""
+        if isinstance(pipeline, CompiledModel):
+            return pipeline.transform, pipeline.predict_features
+        if getattr(pipeline, 'steps', None) is None:
+            return np.asarray, pipeline.predict_proba
+        return pipeline[:-1].transform, pipeline[-1].predict_proba
+
+    def predict_proba(self, df):
+        self._maybe_reload()
+        with self._lock:
+            pipeline, version = self.pipeline, self.cache.model_version
+        transform, predict = self._split(pipeline)
+        X = transform(df)
+        keys = feature_keys(X)
+        cached = self.cache.get_many(keys)
+        probs = np.array([np.nan if p is None else p for p in cached], dtype=np.float64)
+        miss = np.isnan(probs)
+        if miss.any():
+            probs[miss] = predict(X[miss])[:, 1]
+            self.cache.put_many([key for key, m in zip(keys, miss) if m], probs[miss], version)
+        return np.column_stack([1.0 - probs, probs])
+
+
+def add_cache_args(parser):
+    """Add the prediction cache options shared by the scoring services"""
+    parser.add_argument('--cache-entries', type=int, default=100_000,
+                        help="Cached predictions kept (0 disables the cache)")
+    parser.add_argument('--cache-mb', type=float, default=64.0,
+                        help="Approximate memory bound of the cache")
+    parser.add_argument('--cache-ttl', type=float, default=3600.0,
+                        help="Seconds a cached prediction stays valid")
+    parser.add_argument('--model-check-interval', type=float, default=5.0,
+                        help="Seconds between checks of the model file for a new version")
+    return parser
+
+
+def load_scorer(model_path, args):
+    """The pipeline itself, or a CachedPipeline when the cache is enabled
+
+    The pipeline is warmed up before it is returned (outside the cache, so
+    the synthetic rows don't count towards the hit rate).
+    """
+    if args.cache_entries <= 0:
+        scorer = load_pipeline(model_path)
+        warm_up(scorer)
+        return scorer
+    cache = PredictionCache(args.cache_entries, int(args.cache_mb * 1024**2), args.cache_ttl)
+    scorer = CachedPipeline.from_path(model_path, cache, args.model_check_interval)
+    warm_up(scorer.pipeline)
+    return scorer
+
+
+def cache_metrics(scorer):
+    """Cache metrics of a scorer, or None when it is not cached"""
+    cache = getattr(scorer, 'cache', None)
+    return cache.metrics() if cache is not None else None
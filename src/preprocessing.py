@@ -0,0 +1,177 @@
+"""
+Hotel Booking Demand - Preprocessing Pipeline
+
+This module holds the fitted transformer shared by feature engineering,
+model training and the Streamlit app.
+
+Goal: Turn raw booking rows into the scaled model matrix in one vectorized pass
+(the feature construction itself lives in features.py)
+"""
+
+import copy
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from features import (CALENDAR_FEATURES, build_features, category_labels, check_columns,
+                      encode_categorical, required_columns)
+
+CATEGORICAL_COLUMNS = [
+    'hotel', 'season', 'meal', 'market_segment', 'distribution_channel',
+    'reserved_room_type', 'assigned_room_type', 'deposit_type', 'customer_type'
+]
+REQUIRED_COLUMNS = required_columns()
+
+# Model features, in column order
+FEATURE_COLUMNS = [
+    'hotel', 'lead_time', 'arrival_month_num', 'season',
+    'stays_in_weekend_nights', 'stays_in_week_nights', 'total_nights',
+    'adults', 'children', 'babies', 'total_guests',
+    'meal', 'market_segment', 'distribution_channel',
+    'is_repeated_guest', 'previous_cancellations',
+    'previous_bookings_not_canceled', 'reserved_room_type',
+    'assigned_room_type', 'booking_changes', 'deposit_type',
+    'days_in_waiting_list', 'customer_type', 'adr',
+    'required_car_parking_spaces', 'total_of_special_requests',
+    'has_children', 'has_babies', 'has_special_requests'
+]
+
+
+def model_features(extra_features=False):
+    """Model feature names, with the calendar features appended if requested"""
+    return FEATURE_COLUMNS + CALENDAR_FEATURES if extra_features else list(FEATURE_COLUMNS)
+
+
+class BookingPreprocessor(BaseEstimator, TransformerMixin):
+    """Month mapping, derived features, category encoding and scaling
+
+    Fit on raw booking rows (the columns of hotel_bookings.csv), or on the
+    dict build_features() returns for them so it is not built twice. transform()
+    returns a float64 NumPy array with one column per FEATURE_COLUMNS entry,
+    followed by CALENDAR_FEATURES when extra_features=True.
+    Categories not seen during fit are encoded as -1 (the unknown bucket). With
+    categorical_codes=True the categorical columns are left as unscaled
+    integer codes (for models that split categories natively).
+
+    partial_fit() updates a fitted preprocessor with more rows: new category
+    labels are appended after the known ones (existing codes keep their
+    meaning) and the scaling statistics are merged with the new rows'.
+    """
+
+    def __init__(self, scale=True, extra_features=False, categorical_codes=False):
+        self.scale = scale
+        self.extra_features = extra_features
+        self.categorical_codes = categorical_codes
+
+    def fit(self, df, y=None):
+        cols = self._features(df)
+        self.categories_ = {
+            col: pd.Index(np.unique(category_labels(cols[col])))
+            for col in CATEGORICAL_COLUMNS
+        }
+        self.feature_names_ = model_features(self.extra_features)
+        X = self._encode(cols)
+        self.n_samples_seen_ = len(X)
+        self.mean_ = X.mean(axis=0)
+        self.var_ = X.var(axis=0)
+        self.scale_ = self._scale_from_var(self.var_)
+        return self
+
+    def partial_fit(self, df, y=None):
+        """Add df's rows to the fitted categories and scaling statistics
+
+        Costs one pass over df; the rows the preprocessor was fitted on are
+        not needed (means and variances are combined pairwise).
+        """
+        if not hasattr(self, 'mean_'):
+            return self.fit(df)
+        if not hasattr(self, 'n_samples_seen_'):
+            raise ValueError("preprocessor was fitted before partial_fit support; "
+                             "rerun 02_feature_engineering.py")
+        cols = self._features(df)
+        categories = {}
+        for col in CATEGORICAL_COLUMNS:
+            new = pd.Index(category_labels(cols[col])).difference(self.categories_[col])
+            categories[col] = self.categories_[col].append(new)
+        self.categories_ = categories
+        X = self._encode(cols)
+        n_old, n_new = self.n_samples_seen_, len(X)
+        n = n_old + n_new
+        mean_new, var_new = X.mean(axis=0), X.var(axis=0)
+        delta = mean_new - self.mean_
+        self.mean_ = self.mean_ + delta * n_new / n
+        self.var_ = (self.var_ * n_old + var_new * n_new + delta ** 2 * n_old * n_new / n) / n
+        self.scale_ = self._scale_from_var(self.var_)
+        self.n_samples_seen_ = n
+        return self
+
+    def transform(self, df):
+        return self.scale_encoded(self.encode(df))
+
+    def encode(self, df):
+        """Unscaled feature matrix: category codes and the numeric features as built"""
+        return self._encode(self._features(df))
+
+    def scale_encoded(self, X):
+        """The transform() output for a matrix from encode() (scaled in place)"""
+        if self.scale:
+            X -= self.mean_
+            X /= self.scale_
+            if self.categorical_codes:
+                X = self.restore_codes(X)
+        return X
+
+    def recode(self, X, categories):
+        """Re-map category codes in an encode() matrix from other categories to this one's
+
+        categories: the categories_ the matrix was encoded with. Labels this
+        preprocessor has not seen get -1, as in transform(). X is updated in place.
+        """
+        for j, name in enumerate(self.feature_names_):
+            if name in CATEGORICAL_COLUMNS:
+                table = np.append(self.categories_[name].get_indexer(categories[name]), -1)
+                X[:, j] = table[X[:, j].astype(np.int64)]
+        return X
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(self.feature_names_, dtype=object)
+
+    def categorical_mask(self):
+        """Boolean mask of the categorical (integer-coded) output columns"""
+        return np.isin(self.feature_names_, CATEGORICAL_COLUMNS)
+
+    def restore_codes(self, X):
+        """Replace scaled categorical columns with their integer category codes
+
+        X is cast to float32 first, the dtype the feature store keeps, so a
+        matrix read from data/features and the transform() output of the same
+        rows map to identical values. Numeric columns stay scaled.
+        """
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        mask = self.categorical_mask()
+        X[:, mask] = np.round(X[:, mask] * self.scale_[mask] + self.mean_[mask])
+        return X
+
+    def with_categorical_codes(self):
+        """Copy of this fitted preprocessor whose output keeps category codes"""
+        preprocessor = copy.copy(self)
+        preprocessor.categorical_codes = True
+        return preprocessor
+
+    @staticmethod
+    def _scale_from_var(var):
+        scale = np.sqrt(var)
+        scale[scale == 0] = 1.0
+        return scale
+
+    def _features(self, df):
+        """build_features(df), or df itself if it is already a feature dict"""
+        return df if isinstance(df, dict) else build_features(df, self.extra_features)
+
+    def _encode(self, cols):
+        X = np.empty((len(cols['lead_time']), len(self.feature_names_)), dtype=np.float64)
+        for j, name in enumerate(self.feature_names_):
+            if name in CATEGORICAL_COLUMNS:
+                X[:, j] = encode_categorical(cols[name], self.categories_[name])
+            else:
+                X[:, j] = cols[name]
+        return X
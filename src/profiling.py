@@ -0,0 +1,185 @@
+"""
+Hotel Booking Demand - Step Profiling
+
+Lightweight instrumentation for the numbered steps of the pipeline scripts.
+StepRecorder.start() replaces the step's print("\\nN. ...") line: it closes
+the previous step and opens the next one, so the flat scripts keep their
+shape. For each step it records wall time, CPU time (this process and
+finished child processes) and peak RSS. One step can also run under
+cProfile (--profile-step N). finish() prints a summary table and writes a
+JSON report to artifacts/profiles/.
+
+Peak RSS is per step on Linux, where the kernel's high-water mark is reset
+at every step start; elsewhere it is the peak of the process so far.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_DIR = os.path.join('artifacts', 'profiles')
+TOP_FUNCTIONS = 25
+
+
+def add_profiling_args(parser):
+    """Add --profile-step and --profile-dir to a script's argument parser"""
+    parser.add_argument('--profile-step', type=int, metavar='N',
+                        help="Run step N under cProfile and include its hot spots in the report")
+    parser.add_argument('--profile-dir', default=REPORT_DIR,
+                        help="Folder for the per-run timing reports")
+    return parser
+
+
+def _read_status_kb(field):
+    """A 'VmXXX' value from /proc/self/status in kB, or None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak-RSS mark for this process (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    kb = _read_status_kb('VmHWM')
+    if kb is None and resource is not None:
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            kb /= 1024  # bytes on macOS
+    return kb / 1024 if kb is not None else None
+
+
+def rss_mb():
+    kb = _read_status_kb('VmRSS')
+    return kb / 1024 if kb is not None else None
+
+
+def child_cpu_seconds():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class StepRecorder:
+    """Times the numbered steps of one script run"""
+
+    def __init__(self, run_name, profile_step=None, report_dir=REPORT_DIR):
+        self.run_name = run_name
+        self.profile_step = profile_step
+        self.report_dir = report_dir
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.steps = []
+        self.profile = None
+        self._profiler = None
+        self._current = None
+        self._run_start = (time.perf_counter(), time.process_time())
+
+    @classmethod
+    def from_args(cls, run_name, args):
+        return cls(run_name, getattr(args, 'profile_step', None),
+                   getattr(args, 'profile_dir', REPORT_DIR))
+
+    def start(self, title):
+        """End the running step, print title and start timing a new step"""
+        self._end_step()
+        print(f"\n{title}")
+        match = re.match(r'\s*(\d+)\.', title)
+        number = int(match.group(1)) if match else len(self.steps) + 1
+        per_step_peak = _reset_peak_rss()
+        self._current = {
+            'number': number,
+            'title': title.strip().rstrip('.:'),
+            'rss_start_mb': rss_mb(),
+            'peak_is_per_step': per_step_peak,
+            '_wall': time.perf_counter(),
+            '_cpu': time.process_time(),
+            '_child_cpu': child_cpu_seconds(),
+        }
+        if number == self.profile_step:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _end_step(self):
+        step = self._current
+        if step is None:
+            return
+        wall = time.perf_counter() - step.pop('_wall')
+        cpu = time.process_time() - step.pop('_cpu')
+        child_cpu = child_cpu_seconds() - step.pop('_child_cpu')
+        if step['number'] == self.profile_step:
+            self._profiler.disable()
+            self.profile = self._save_profile(self._profiler, step)
+        step.update({'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4),
+                     'child_cpu_s': round(child_cpu, 4),
+                     'peak_rss_mb': peak_rss_mb(), 'rss_end_mb': rss_mb()})
+        self.steps.append(step)
+        self._current = None
+
+    def _save_profile(self, profiler, step):
+        os.makedirs(self.report_dir, exist_ok=True)
+        stem = f"{self.run_name}_{time.strftime('%Y%m%d-%H%M%S')}_step{step['number']}"
+        path = os.path.join(self.report_dir, stem + '.prof')
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        by_cumulative = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        top = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in by_cumulative[:TOP_FUNCTIONS]:
+            top.append({'function': f'{os.path.basename(filename)}:{line}({name})',
+                        'calls': calls, 'tottime_s': round(tottime, 4), 'cumtime_s': round(cumtime, 4)})
+        return {'step': step['number'], 'path': path, 'top_cumulative': top}
+
+    def finish(self):
+        """End the last step, print the summary and write the JSON report"""
+        self._end_step()
+        wall = time.perf_counter() - self._run_start[0]
+        cpu = time.process_time() - self._run_start[1]
+        report = {
+            'run': self.run_name,
+            'started_at': self.started_at,
+            'argv': sys.argv[1:],
+            'wall_s': round(wall, 4),
+            'cpu_s': round(cpu, 4),
+            'peak_rss_mb': max((s['peak_rss_mb'] or 0 for s in self.steps), default=None),
+            'steps': self.steps,
+            'profile': self.profile,
+        }
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(self.report_dir,
+                            f"{self.run_name}_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print("\nStep timings:")
+        print(f"  {'step':<52} {'wall s':>8} {'cpu s':>8} {'peak MB':>9}")
+        for step in self.steps:
+            peak = f"{step['peak_rss_mb']:.0f}" if step['peak_rss_mb'] is not None else '-'
+            print(f"  {step['title'][:52]:<52} {step['wall_s']:>8.2f} "
+                  f"{step['cpu_s'] + step['child_cpu_s']:>8.2f} {peak:>9}")
+        print(f"  {'total':<52} {wall:>8.2f} {cpu:>8.2f}")
+        print(f"✓ Timing report: {path}")
+        if self.profile:
+            print(f"✓ cProfile of step {self.profile['step']}: {self.profile['path']}")
+        return report
@@ -0,0 +1,349 @@
+"""
+Hotel Booking Demand - Incremental Pipeline Runner
+
+Runs 01_data_exploration -> 02_feature_engineering -> 03_model_training,
+skipping every stage whose inputs, code and parameters are unchanged.
+
+Each stage gets a fingerprint from:
+  - the content hashes of its input files,
+  - the source of its script and every local src/ module it imports
+    (followed recursively),
+  - its command-line arguments.
+
+After a stage runs, its outputs are copied into .pipeline_cache/<stage>/<fingerprint>/.
+On the next run the stage is skipped if the outputs on disk still come from
+the same fingerprint, or restored from the cache if an earlier fingerprint
+comes back (e.g. after reverting a change). Cached entries are evicted
+least-recently-used first to stay under --cache-budget-mb.
+
+Outputs changed outside the pipeline (e.g. best_model.joblib promoted by
+incremental_refresh.py, or a 03_model_training.py --streaming or --tune run)
+are never overwritten silently: the stage is skipped with a warning until it
+is rerun with --force. model_training also reads two of its own outputs,
+model_metrics.csv (--streaming compares against it) and the tuning log
+(--tune resumes from it); they are not fingerprinted as inputs, since every
+run rewrites them, so changes to them are caught by this check instead.
+
+Usage (from the project root):
+    python src/run_pipeline.py
+    python src/run_pipeline.py --stage-args feature_engineering="--export-csv"
+    python src/run_pipeline.py --force model_training
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+import hashing
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SRC_DIR)
+# Data, artifacts and the cache are relative to the working directory (the
+# project root), like the paths inside the stage scripts
+CACHE_DIR = '.pipeline_cache'
+STATE_FILE = os.path.join(CACHE_DIR, 'state.json')
+DEFAULT_BUDGET_MB = 2048
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: list
+    outputs: list
+    args: list = field(default_factory=list)
+
+
+STAGES = [
+    Stage('data_exploration', 'src/01_data_exploration.py',
+          inputs=['data/hotel_bookings.csv'],
+          outputs=['data/hotel_bookings_explored.csv']),
+    Stage('feature_engineering', 'src/02_feature_engineering.py',
+          inputs=['data/hotel_bookings_explored.csv'],
+          outputs=['data/features', 'artifacts/preprocessor.joblib',
+                   'artifacts/feature_names.joblib']),
+    Stage('model_training', 'src/03_model_training.py',
+          inputs=['data/features', 'artifacts/preprocessor.joblib'],
+          outputs=['artifacts/lr_model.joblib', 'artifacts/rf_model.joblib',
+                   'artifacts/hgb_model.joblib', 'artifacts/sgd_model.joblib',
+                   'artifacts/best_model.joblib', 'artifacts/best_model.npz',
+                   'artifacts/model_metrics.csv', 'artifacts/feature_importance.csv',
+                   'artifacts/tuned_params.json', 'artifacts/tuning_results.jsonl']),
+]
+
+
+class HashCache:
+    """File content hashes memoized by (size, mtime) across runs"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['hash']
+        digest = hashing.file_hash(path)
+        self.entries[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def path_hash(self, path):
+        """Hash of a file, or of every file under a directory"""
+        if not os.path.exists(path):
+            return None
+        if os.path.isfile(path):
+            return self.file_hash(path)
+        digest = hashlib.blake2b(digest_size=16)
+        for root, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(self.file_hash(file_path).encode())
+        return digest.hexdigest()
+
+
+def local_dependencies(script):
+    """The script plus every src/ module it imports, followed recursively"""
+    seen = set()
+    pending = [os.path.join(PROJECT_DIR, script)]
+    while pending:
+        path = pending.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module_path = os.path.join(SRC_DIR, name.split('.')[0] + '.py')
+                if os.path.exists(module_path):
+                    pending.append(module_path)
+    return sorted(seen)
+
+
+def fingerprint(stage, hashes):
+    """Combined hash of a stage's inputs, code and arguments"""
+    parts = {
+        'inputs': {path: hashes.path_hash(path) for path in stage.inputs},
+        'code': {os.path.relpath(path, PROJECT_DIR): hashes.path_hash(path)
+                 for path in local_dependencies(stage.script)},
+        'args': stage.args,
+        'python': sys.version_info[:2],
+    }
+    missing = [path for path, digest in parts['inputs'].items() if digest is None]
+    if missing:
+        raise FileNotFoundError(f"{stage.name}: missing inputs {', '.join(missing)}")
+    payload = json.dumps(parts, sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def outputs_hash(stage, hashes):
+    return {path: hashes.path_hash(path) for path in stage.outputs}
+
+
+def changed_outputs(recorded, current):
+    """Outputs that exist but differ from what the pipeline last recorded
+
+    Missing outputs are not "changed": restoring them is safe.
+    """
+    if not recorded:
+        return []
+    return [path for path, digest in current.items()
+            if digest is not None and digest != recorded.get(path)]
+
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'stages': {}, 'hashes': {}}
+
+
+def save_state(state):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def _copy_path(src, dst):
+    if not os.path.exists(src):
+        # An output this run did not write (best_model.npz without
+        # --export-compiled): make sure no older copy is left at dst
+        if os.path.isdir(dst):
+            shutil.rmtree(dst)
+        elif os.path.exists(dst):
+            os.remove(dst)
+        return
+    if os.path.isdir(src):
+        if os.path.exists(dst):
+            shutil.rmtree(dst)
+        shutil.copytree(src, dst)
+    else:
+        os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+def entry_dir(stage, digest):
+    return os.path.join(CACHE_DIR, stage.name, digest)
+
+
+def store_outputs(stage, digest):
+    """Copy a stage's outputs into its cache entry (copies, not links, since
+    later runs overwrite the working files in place)"""
+    target = entry_dir(stage, digest)
+    tmp = target + '.tmp'
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)
+    for path in stage.outputs:
+        _copy_path(path, os.path.join(tmp, path))
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.replace(tmp, target)
+    touch_entry(target)
+
+
+def restore_outputs(stage, digest):
+    source = entry_dir(stage, digest)
+    for path in stage.outputs:
+        _copy_path(os.path.join(source, path), path)
+    touch_entry(source)
+
+
+def touch_entry(path):
+    with open(os.path.join(path, '.last_used'), 'w') as f:
+        f.write(str(time.time()))
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def evict(budget_bytes, keep=()):
+    """Delete least-recently-used cache entries until the cache fits the budget"""
+    entries = []
+    for stage in STAGES:
+        stage_dir = os.path.join(CACHE_DIR, stage.name)
+        if not os.path.isdir(stage_dir):
+            continue
+        for digest in os.listdir(stage_dir):
+            path = os.path.join(stage_dir, digest)
+            marker = os.path.join(path, '.last_used')
+            last_used = os.path.getmtime(marker) if os.path.exists(marker) else 0.0
+            entries.append((last_used, path, dir_size(path)))
+
+    total = sum(size for _, _, size in entries)
+    evicted = []
+    for _, path, size in sorted(entries):
+        if total <= budget_bytes:
+            break
+        if path in keep:
+            continue
+        shutil.rmtree(path)
+        total -= size
+        evicted.append(path)
+    return evicted, total
+
+
+def run_stage(stage):
+    command = [sys.executable, os.path.join(PROJECT_DIR, stage.script), *stage.args]
+    subprocess.run(command, check=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the pipeline, skipping unchanged stages")
+    parser.add_argument('--stage-args', action='append', default=[], metavar='STAGE="ARGS"',
+                        help="Extra command-line arguments for one stage")
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        help="Re-run a stage even if its fingerprint is unchanged")
+    parser.add_argument('--cache-budget-mb', type=float, default=DEFAULT_BUDGET_MB,
+                        help="Disk budget for cached stage outputs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [stage.name for stage in STAGES]
+    for item in args.stage_args:
+        name, _, value = item.partition('=')
+        if name not in names:
+            raise SystemExit(f"Unknown stage '{name}' (choose from {', '.join(names)})")
+        STAGES[names.index(name)].args = shlex.split(value)
+
+    state = load_state()
+    hashes = HashCache(state.get('hashes'))
+
+    print("=" * 70)
+    print("HOTEL BOOKING DEMAND - PIPELINE")
+    print("=" * 70)
+
+    used_entries = []
+    for i, stage in enumerate(STAGES, start=1):
+        digest = fingerprint(stage, hashes)
+        previous = state['stages'].get(stage.name, {})
+        cached = os.path.isdir(entry_dir(stage, digest))
+        current = outputs_hash(stage, hashes)
+        changed = changed_outputs(previous.get('outputs'), current)
+        start = time.perf_counter()
+
+        if stage.name in args.force:
+            action = 'run (forced)'
+        elif previous.get('fingerprint') == digest and previous.get('outputs') == current:
+            action = 'skip (unchanged)'
+        elif changed:
+            action = 'keep (outputs changed outside the pipeline)'
+        elif cached:
+            action = 'restore (cached)'
+        else:
+            action = 'run'
+
+        print(f"\n{i}. {stage.name}: {action}")
+        if changed:
+            if action.startswith('keep'):
+                print(f"   ⚠️  Not overwriting {', '.join(changed)}; "
+                      f"rerun with --force {stage.name} to rebuild")
+                continue
+            print(f"   ⚠️  Replacing {', '.join(changed)}, changed outside the pipeline")
+        if action.startswith('run'):
+            run_stage(stage)
+            store_outputs(stage, digest)
+        elif action.startswith('restore'):
+            restore_outputs(stage, digest)
+        elif cached:
+            touch_entry(entry_dir(stage, digest))
+
+        state['stages'][stage.name] = {'fingerprint': digest,
+                                       'outputs': outputs_hash(stage, hashes),
+                                       'finished_at': time.time()}
+        used_entries.append(entry_dir(stage, digest))
+        print(f"   ✓ {stage.name} done in {time.perf_counter() - start:.2f} s [{digest[:12]}]")
+
+    evicted, total = evict(args.cache_budget_mb * 1024**2, keep=used_entries)
+    state['hashes'] = hashes.entries
+    save_state(state)
+
+    print("\n" + "=" * 70)
+    print("PIPELINE COMPLETE!")
+    print("=" * 70)
+    print(f"✓ Cache size: {total / 1024**2:.1f} MB (budget {args.cache_budget_mb:.0f} MB)")
+    for path in evicted:
+        print(f"  - evicted {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Hotel Booking Demand - Dataset Schema
+
+Declared dtypes for the booking dataset (hotel_bookings.csv and the explored
+copy written by 01_data_exploration.py). String columns become categoricals
+and numeric columns use the smallest width that safely holds their range,
+which cuts the in-memory footprint several times over the pandas defaults.
+
+apply_schema() validates values before casting, so an out-of-range count or
+an unknown month fails loudly instead of silently overflowing.
+check_booking() does the same for one booking dict (e.g. from JSON), so the
+scoring services feed the model the same values as the batch loaders.
+pandas is imported only by the DataFrame functions, so the NumPy-only
+scoring path can use this module.
+"""
+
+import numpy as np
+
+# Bump when the declared dtypes change so cached typed files are rebuilt
+SCHEMA_VERSION = 1
+
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+# column: (dtype, min, max, nullable)
+NUMERIC_SCHEMA = {
+    'is_canceled': ('int8', 0, 1, False),
+    'lead_time': ('int16', 0, 5000, False),
+    'arrival_date_year': ('int16', 1900, 2200, False),
+    'arrival_date_week_number': ('int8', 1, 53, False),
+    'arrival_date_day_of_month': ('int8', 1, 31, False),
+    'stays_in_weekend_nights': ('int16', 0, 1000, False),
+    'stays_in_week_nights': ('int16', 0, 1000, False),
+    'adults': ('int16', 0, 1000, False),
+    'children': ('float32', 0, 1000, True),
+    'babies': ('int16', 0, 1000, False),
+    'is_repeated_guest': ('int8', 0, 1, False),
+    'previous_cancellations': ('int16', 0, 10000, False),
+    'previous_bookings_not_canceled': ('int16', 0, 10000, False),
+    'booking_changes': ('int16', 0, 10000, False),
+    'agent': ('float32', 0, 1e6, True),
+    'company': ('float32', 0, 1e6, True),
+    'days_in_waiting_list': ('int16', 0, 10000, False),
+    'adr': ('float32', -1e4, 1e5, False),
+    'required_car_parking_spaces': ('int8', 0, 100, False),
+    'total_of_special_requests': ('int8', 0, 100, False),
+    # Derived by 01_data_exploration.py
+    'total_guests': ('float32', 0, 3000, True),
+    'total_nights': ('int16', 0, 2000, False),
+}
+
+CATEGORY_COLUMNS = [
+    'hotel', 'meal', 'country', 'market_segment', 'distribution_channel',
+    'reserved_room_type', 'assigned_room_type', 'deposit_type', 'customer_type',
+    'reservation_status', 'reservation_status_date'
+]
+
+# Categoricals with a closed, ordered vocabulary (unknown values are rejected)
+ORDERED_CATEGORIES = {
+    'arrival_date_month': MONTH_NAMES,
+}
+
+# dtype= mapping for pd.read_csv: the parser builds categoricals directly,
+# which is much cheaper than converting string columns afterwards
+CSV_DTYPES = {col: 'category' for col in CATEGORY_COLUMNS + list(ORDERED_CATEGORIES)}
+
+
+class SchemaError(ValueError):
+    """Raised when booking data does not match the declared schema"""
+
+
+def _check_numeric(col, series, dtype, lo, hi, nullable):
+    import pandas as pd
+
+    values = pd.to_numeric(series, errors='coerce')
+    bad_parse = values.isna() & series.notna()
+    if bad_parse.any():
+        example = series[bad_parse].iloc[0]
+        raise SchemaError(f"{col}: {int(bad_parse.sum())} non-numeric values (e.g. {example!r})")
+    if not nullable and values.isna().any():
+        raise SchemaError(f"{col}: {int(values.isna().sum())} missing values")
+    out_of_range = (values < lo) | (values > hi)
+    if out_of_range.any():
+        raise SchemaError(f"{col}: {int(out_of_range.sum())} values outside [{lo}, {hi}] "
+                          f"(e.g. {values[out_of_range].iloc[0]})")
+    if np.dtype(dtype).kind == 'i':
+        fractional = values.notna() & (values != np.floor(values))
+        if fractional.any():
+            raise SchemaError(f"{col}: {int(fractional.sum())} non-integer values")
+    return values.astype(dtype)
+
+
+def apply_schema(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    """Validate and cast the schema's columns of df in place; return df
+
+    Columns the schema does not declare are left untouched.
+    """
+    import pandas as pd
+
+    for col, (dtype, lo, hi, nullable) in NUMERIC_SCHEMA.items():
+        if col in df.columns:
+            df[col] = _check_numeric(col, df[col], dtype, lo, hi, nullable)
+    for col, categories in ORDERED_CATEGORIES.items():
+        if col in df.columns:
+            unknown = df[col].notna() & ~df[col].isin(categories)
+            if unknown.any():
+                raise SchemaError(f"{col}: unknown values {sorted(df[col][unknown].astype(str).unique())[:5]}")
+            df[col] = df[col].astype(pd.CategoricalDtype(categories, ordered=True))
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def check_booking(booking: dict) -> dict:
+    """Validate one booking dict and cast its values as apply_schema would
+
+    Returns a copy with the declared numeric columns as int, or as float
+    rounded through float32 for float32 columns (the width the training data
+    was stored at). Raises SchemaError naming the first bad column.
+    """
+    out = dict(booking)
+    for col, value in booking.items():
+        if isinstance(value, (list, dict)):
+            raise SchemaError(f"{col}: expected a single value, got a {type(value).__name__}")
+        if col in NUMERIC_SCHEMA:
+            dtype, lo, hi, nullable = NUMERIC_SCHEMA[col]
+            try:
+                number = np.nan if value is None else float(value)
+            except (TypeError, ValueError):
+                raise SchemaError(f"{col}: non-numeric value {value!r}") from None
+            if np.isnan(number):
+                if not nullable:
+                    raise SchemaError(f"{col}: missing value")
+                out[col] = None
+                continue
+            if not lo <= number <= hi:
+                raise SchemaError(f"{col}: value outside [{lo}, {hi}] ({number})")
+            if np.dtype(dtype).kind == 'i':
+                if number != np.floor(number):
+                    raise SchemaError(f"{col}: non-integer value {value!r}")
+                out[col] = int(number)
+            else:
+                out[col] = float(np.dtype(dtype).type(number))
+        elif col in ORDERED_CATEGORIES and value is not None and value not in ORDERED_CATEGORIES[col]:
+            raise SchemaError(f"{col}: unknown value {value!r}")
+    return out
+
+
+def memory_report(df: 'pd.DataFrame') -> str:
+    """One-line deep memory usage of df in MB"""
+    return f"{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB"
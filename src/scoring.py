@@ -0,0 +1,174 @@
+"""
+Hotel Booking Demand - Scoring Helpers
+
+Shared helpers for loading the trained pipeline, scoring bookings in a
+single predict_proba pass and turning probabilities into labels and risk
+levels. Used by app.py, the batch scorer and model training.
+
+Artifacts are written uncompressed (save_artifact) so load_pipeline can
+memory-map their numpy arrays instead of reading them into a buffer first. warm_up() scores a small synthetic batch right after loading
+so the first real request doesn't pay for thread pools and lazy imports.
+
+Only NumPy is imported up front. joblib, pandas and scikit-learn load when a
+joblib pipeline is loaded or bookings are turned into a DataFrame for one,
+so a process scoring with a compiled model (compiled_model.py) never
+imports them.
+"""
+
+import os
+import time
+import numpy as np
+from compiled_model import CompiledModel
+from hashing import file_hash
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(PROJECT_DIR, 'artifacts', 'best_model.joblib')
+# NumPy-only export of MODEL_PATH (model_export.py); records the hash of the joblib it came from
+COMPILED_PATH = os.path.join(PROJECT_DIR, 'artifacts', 'best_model.npz')
+
+# Probability above which a booking is labelled as a cancellation.
+# 0.5 reproduces model.predict() for both LogisticRegression and RandomForest.
+DEFAULT_THRESHOLD = 0.5
+
+# Rows scored by warm_up()
+WARM_UP_ROWS = 64
+
+# Upper bounds of the Low and Medium buckets: (0, 0.3] Low, (0.3, 0.7] Medium, (0.7, 1] High
+RISK_BINS = np.array([0.3, 0.7])
+RISK_LABELS = np.array(['Low', 'Medium', 'High'], dtype=object)
+
+
+def save_artifact(obj, path):
+    """joblib.dump without compression, so the arrays can be memory-mapped on load"""
+    import joblib
+
+    return joblib.dump(obj, path, compress=0)
+
+
+def compiled_path(path):
+    """The compiled .npz exported from a .joblib model"""
+    return os.path.splitext(path)[0] + '.npz'
+
+
+def joblib_path(path):
+    """The .joblib model a compiled .npz was exported next to"""
+    return os.path.splitext(path)[0] + '.joblib'
+
+
+def save_best_model(pipeline, path=MODEL_PATH):
+    """Save the served pipeline and delete the compiled copy of the one it replaces"""
+    save_artifact(pipeline, path)
+    if os.path.exists(compiled_path(path)):
+        os.remove(compiled_path(path))
+
+
+def compiled_is_current(path=COMPILED_PATH, source_path=MODEL_PATH):
+    """True when path can stand in for source_path
+
+    That is, path was exported from source_path's current contents, or
+    source_path is absent (a deployment that ships only the compiled model).
+    """
+    if not os.path.exists(path):
+        return False
+    if not os.path.exists(source_path):
+        return True
+    with np.load(path, allow_pickle=False) as data:
+        recorded = str(data['source_hash']) if 'source_hash' in data.files else None
+    return recorded == file_hash(source_path)
+
+
+def load_pipeline(path=MODEL_PATH, mmap_mode='r'):
+    """Load the preprocessor + model pipeline saved by 03_model_training.py
+
+    With mmap_mode='r' the numpy arrays in the file are mapped rather than
+    read into a buffer, which roughly halves the load-time footprint of a
+    RandomForest. It does not make the model shared between processes:
+    sklearn copies the tree nodes into private memory on load, so every
+    process that loads the file holds its own copy of the trees. Only
+    workers forked after the parent loaded the pipeline share it
+    (batch_scoring.py; measured by benchmarks/worker_memory.py).
+
+    A compiled .npz model (model_export.py) loads as a CompiledModel, which
+    scores with NumPy alone.
+    """
+    if str(path).endswith('.npz'):
+        return CompiledModel.load(path)
+    import joblib
+
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def _unwrap(pipeline):
+    """The model behind a CachedPipeline, or pipeline itself"""
+    return getattr(pipeline, 'pipeline', pipeline)
+
+
+def is_compiled(pipeline):
+    return isinstance(_unwrap(pipeline), CompiledModel)
+
+
+def required_columns(pipeline):
+    """Raw columns a booking needs for this pipeline"""
+    model = _unwrap(pipeline)
+    if isinstance(model, CompiledModel):
+        return model.required_columns
+    from features import required_columns
+
+    steps = getattr(model, 'steps', None)
+    return required_columns(getattr(model[0], 'extra_features', False) if steps else False)
+
+
+def booking_rows(bookings, pipeline, checked=False):
+    """Booking dicts in the form pipeline.predict_proba takes
+
+    Values are validated and cast with schema.check_booking (skipped when
+    checked=True, i.e. the caller already did), so a booking scores the same
+    here as through the CSV loaders. A compiled model scores the list as is;
+    a joblib pipeline gets a DataFrame.
+    """
+    if not checked:
+        from schema import check_booking
+
+        bookings = [check_booking(booking) for booking in bookings]
+    if is_compiled(pipeline):
+        return bookings
+    import pandas as pd
+
+    return pd.DataFrame.from_records(bookings)
+
+
+def warm_up(pipeline, rows=WARM_UP_ROWS, seed=0):
+    """Score a batch of synthetic bookings; returns the seconds it took
+
+    Compiled models have no thread pools or lazy imports to warm, and
+    generating the batch would import pandas, so they are skipped.
+    """
+    if is_compiled(pipeline):
+        return 0.0
+    from schema import apply_schema
+    from synthetic import default_profile, generate
+
+    batch = apply_schema(generate(default_profile(), rows, seed))
+    start = time.perf_counter()
+    pipeline.predict_proba(batch)
+    return time.perf_counter() - start
+
+
+def risk_level(probs):
+    """Bucket cancellation probabilities into Low / Medium / High"""
+    return RISK_LABELS[np.searchsorted(RISK_BINS, probs, side='left')]
+
+
+def labels_from_proba(probs, threshold=DEFAULT_THRESHOLD):
+    """Derive 0/1 cancellation labels from probabilities"""
+    return (probs > threshold).astype(np.int64)
+
+
+def predict_with_threshold(model, X, threshold=DEFAULT_THRESHOLD):
+    """Return (labels, probabilities) from a single predict_proba call
+
+    Calling predict() and then predict_proba() evaluates the model twice
+    (every tree of a RandomForest is walked both times); this walks it once.
+    """
+    probs = model.predict_proba(X)[:, 1]
+    return labels_from_proba(probs, threshold), probs
@@ -0,0 +1,312 @@
+"""
+Hotel Booking Demand - HTTP Scoring Service
+
+A standalone JSON scoring service for the booking engine. The trained
+pipeline is loaded once at startup. Concurrent single-booking requests are
+collected into micro-batches so the model runs one vectorized predict_proba
+call per batch instead of one call per request. Each booking is validated
+and cast (schema.check_booking) before it is queued, so a bad booking gets a
+400 of its own; if a batch still fails, its bookings are scored one by one
+so only the failing one gets the error.
+
+Endpoints:
+    POST /predict         one booking object      -> one prediction
+    POST /predict/batch   {"bookings": [...]}     -> {"predictions": [...]}
+    GET  /health          liveness check
+    GET  /metrics         request and error counts, batch sizes, p50/p99 latency of
+                          successful requests, cache hit rate
+
+Repeat bookings are answered from a prediction cache (prediction_cache.py)
+that is reset when the model file changes; --cache-entries 0 disables it.
+
+Usage:
+    python src/scoring_service.py --port 8000 --max-batch-size 256 --max-wait-ms 5
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from prediction_cache import add_cache_args, cache_metrics, load_scorer
+from schema import SchemaError, check_booking
+from scoring import (DEFAULT_THRESHOLD, MODEL_PATH, booking_rows, predict_with_threshold,
+                     required_columns, risk_level)
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of request latencies in milliseconds
+
+    Only successful requests go into the window; rejected and failed ones
+    are counted by record_error(), so fast 400s don't pull the percentiles down.
+    """
+
+    def __init__(self, window=10_000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds * 1000.0)
+            self.count += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self._samples)
+            count, errors = self.count, self.errors
+        if len(samples) == 0:
+            return {'count': count, 'errors': errors, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {'count': count, 'errors': errors, 'p50_ms': round(p50, 3), 'p99_ms': round(p99, 3)}
+
+
+class MicroBatcher:
+    """Collect single-booking requests into batches for one predict_proba call
+
+    A batch is flushed when it reaches max_batch_size or when the oldest
+    request in it has waited max_wait seconds, whichever comes first.
+    """
+
+    def __init__(self, pipeline, max_batch_size=256, max_wait=0.005,
+                 threshold=DEFAULT_THRESHOLD):
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.threshold = threshold
+        self.batches = 0
+        self.batched_rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, booking: dict) -> Future:
+        """Queue one booking that already passed check_booking"""
+        future = Future()
+        self._queue.put((booking, future))
+        return future
+
+    def predict_many(self, bookings, checked=False):
+        """Score a list of bookings directly in one call (no queueing)"""
+        rows = booking_rows(bookings, self.pipeline, checked)
+        labels, probs = predict_with_threshold(self.pipeline, rows, self.threshold)
+        return format_predictions(labels, probs)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            bookings = [booking for booking, _ in batch]
+            try:
+                results = self.predict_many(bookings, checked=True)
+            except Exception:
+                self._run_one_by_one(batch)
+                continue
+            self.batches += 1
+            self.batched_rows += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _run_one_by_one(self, batch):
+        """Score a failed batch booking by booking, so one bad booking fails alone"""
+        for booking, future in batch:
+            try:
+                future.set_result(self.predict_many([booking], checked=True)[0])
+            except Exception as exc:
+                future.set_exception(exc)
+
+
+def format_predictions(labels, probs):
+    risks = risk_level(probs)
+    return [
+        {
+            'cancellation_prediction': int(label),
+            'cancellation_probability': float(prob),
+            'risk_level': risk,
+        }
+        for label, prob, risk in zip(labels, probs, risks)
+    ]
+
+
+def missing_columns(booking, required):
+    return [col for col in required if col not in booking]
+
+
+def check_bookings(bookings, required):
+    """(bookings cast by check_booking, None) or (None, error message for the first bad one)"""
+    checked = []
+    for i, booking in enumerate(bookings):
+        missing = missing_columns(booking, required)
+        if missing:
+            return None, f"Booking {i}: missing required columns: {', '.join(missing)}"
+        try:
+            checked.append(check_booking(booking))
+        except SchemaError as exc:
+            return None, f"Booking {i}: {exc}"
+    return checked, None
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """JSON request handler; server attributes hold the batcher and trackers"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response stalls on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        elif self.path == '/metrics':
+            self._send(200, self.server.metrics())
+        else:
+            self._send(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        routes = {'/predict': (self._predict_one, self.server.single_latency),
+                  '/predict/batch': (self._predict_batch, self.server.batch_latency)}
+        try:
+            payload = self._read_json()
+        except ValueError as exc:
+            status, body = 400, {'error': f"Invalid JSON: {exc}"}
+        else:
+            if self.path not in routes:
+                self._send(404, {'error': f"Unknown path: {self.path}"})
+                return
+            status, body = routes[self.path][0](payload)
+        self._send(status, body)
+        tracker = routes.get(self.path, (None, None))[1]
+        if tracker is None:
+            return
+        if status == 200:
+            tracker.record(time.perf_counter() - start)
+        else:
+            tracker.record_error()
+
+    def _predict_one(self, booking):
+        if not isinstance(booking, dict):
+            return 400, {'error': "Expected a JSON object with one booking"}
+        missing = missing_columns(booking, required_columns(self.server.batcher.pipeline))
+        if missing:
+            return 400, {'error': f"Missing required columns: {', '.join(missing)}"}
+        try:
+            booking = check_booking(booking)
+        except SchemaError as exc:
+            return 400, {'error': str(exc)}
+        try:
+            return 200, self.server.batcher.submit(booking).result()
+        except Exception as exc:
+            return 500, {'error': str(exc)}
+
+    def _predict_batch(self, payload):
+        bookings = payload.get('bookings') if isinstance(payload, dict) else payload
+        if not isinstance(bookings, list) or not all(isinstance(b, dict) for b in bookings):
+            return 400, {'error': "Expected {\"bookings\": [...]} with booking objects"}
+        bookings, error = check_bookings(bookings, required_columns(self.server.batcher.pipeline))
+        if error:
+            return 400, {'error': error}
+        if not bookings:
+            return 200, {'predictions': []}
+        try:
+            return 200, {'predictions': self.server.batcher.predict_many(bookings, checked=True)}
+        except Exception as exc:
+            return 500, {'error': str(exc)}
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many keep-alive clients connect at once; the default backlog of 5 resets them
+    request_queue_size = 1024
+
+    def __init__(self, address, batcher):
+        super().__init__(address, ScoringHandler)
+        self.batcher = batcher
+        self.single_latency = LatencyTracker()
+        self.batch_latency = LatencyTracker()
+
+    def metrics(self):
+        batcher = self.batcher
+        return {
+            'predict': self.single_latency.summary(),
+            'predict_batch': self.batch_latency.summary(),
+            'micro_batches': batcher.batches,
+            'avg_micro_batch_size': (batcher.batched_rows / batcher.batches
+                                     if batcher.batches else None),
+            'max_batch_size': batcher.max_batch_size,
+            'max_wait_ms': batcher.max_wait * 1000.0,
+            'prediction_cache': cache_metrics(batcher.pipeline),
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cancellation predictions over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to best_model.joblib")
+    parser.add_argument('--max-batch-size', type=int, default=256,
+                        help="Largest micro-batch passed to predict_proba")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Longest a single request waits for its batch to fill")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    add_cache_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    pipeline = load_scorer(args.model, args)
+    load_seconds = time.perf_counter() - start
+    batcher = MicroBatcher(pipeline, args.max_batch_size, args.max_wait_ms / 1000.0,
+                           args.threshold)
+    server = ScoringServer((args.host, args.port), batcher)
+    print(f"✓ Model loaded and warmed up in {load_seconds:.2f}s: {args.model}")
+    print(f"✓ Serving on http://{args.host}:{args.port} "
+          f"(max batch {args.max_batch_size}, max wait {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
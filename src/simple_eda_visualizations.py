@@ -3,404 +3,559 @@ Simple Hotel Booking EDA - Visualization Script
 
 This script performs exploratory data analysis on hotel booking data
 and saves all visualizations to the reports/figures folder.
+
+Figures and the summary are drawn from the per-column booking and
+cancellation counts in aggregates.py (computed in one pass and cached
+until the CSV changes), not from the rows themselves.
+
+Each figure is a registered task (@figure) that declares the columns it
+reads. Tasks render in a process pool, and a figure is skipped when its
+PNG exists and its key is unchanged: the key covers the content hash of
+the figure's aggregate tables, the source of its function and of the code
+all figures share (aggregates.py and render()), the DPI and the matplotlib
+version. Keys are kept in .manifest.json in the output folder,
+so after a data update only the figures whose columns changed are redrawn.
+
+Usage (from the project root):
+    python src/simple_eda_visualizations.py
+    python src/simple_eda_visualizations.py --preview     # 72 dpi, reports/figures/preview/
+    python src/simple_eda_visualizations.py --force --workers 4
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import seaborn as sns  # noqa: E402,F401
+import aggregates  # noqa: E402
+from aggregates import AGGREGATES_VERSION, TARGET, load_aggregates  # noqa: E402
 
 # Get absolute paths for data and output directories
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_dir = os.path.dirname(script_dir)
+data_path = os.path.join(project_dir, 'data', 'hotel_bookings.csv')
 output_dir = os.path.join(project_dir, 'reports', 'figures')
-os.makedirs(output_dir, exist_ok=True)
+preview_dir = os.path.join(output_dir, 'preview')
 
-print("=" * 70)
-print("HOTEL BOOKING EDA - GENERATING VISUALIZATIONS")
-print("=" * 70)
+REPORT_DPI = 300
+PREVIEW_DPI = 72
+MANIFEST_NAME = '.manifest.json'
 
-# 1. Import Libraries & Load Data
-print("\n1. Loading data...")
-# Get the absolute path to the data file
-data_path = os.path.join(project_dir, 'data', 'hotel_bookings.csv')
-df = pd.read_csv(data_path)
-print(f"✓ Dataset has {len(df):,} bookings")
-print(f"✓ Cancellation rate: {df['is_canceled'].mean()*100:.1f}%")
-
-# 2. Cancellation Overview
-print("\n2. Generating cancellation overview...")
-plt.figure(figsize=(8, 6))
-cancel_counts = df['is_canceled'].value_counts()
-plt.pie(cancel_counts, labels=['Not Canceled', 'Canceled'], autopct='%1.1f%%', 
-        colors=['green', 'red'], startangle=90)
-plt.title('Booking Cancellations', size=14, weight='bold')
-plt.savefig(f'{output_dir}/01_cancellation_overview.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 01_cancellation_overview.png")
-
-# 3. Hotel Types
-print("\n3. Generating hotel types analysis...")
-hotel_data = df.groupby('hotel')['is_canceled'].mean() * 100
-
-plt.figure(figsize=(8, 5))
-hotel_data.plot(kind='bar', color=['skyblue', 'coral'])
-plt.title('Cancellation Rate by Hotel Type', size=14, weight='bold')
-plt.ylabel('Cancellation Rate (%)')
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.savefig(f'{output_dir}/02_hotel_types.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 02_hotel_types.png")
-
-# 4. Booking Trends by Month
-print("\n4. Generating monthly booking trends...")
-month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-               'July', 'August', 'September', 'October', 'November', 'December']
-month_counts = df['arrival_date_month'].value_counts().reindex(month_order)
-
-plt.figure(figsize=(12, 5))
-plt.plot(month_order, month_counts.values, marker='o', linewidth=2, color='blue')
-plt.title('Bookings by Month', size=14, weight='bold')
-plt.ylabel('Number of Bookings')
-plt.xticks(rotation=45)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig(f'{output_dir}/03_monthly_trends.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 03_monthly_trends.png")
-
-# 5. Lead Time Analysis
-print("\n5. Generating lead time analysis...")
-plt.figure(figsize=(10, 5))
-plt.hist(df[df['is_canceled']==0]['lead_time'], bins=50, alpha=0.6, label='Not Canceled', color='green')
-plt.hist(df[df['is_canceled']==1]['lead_time'], bins=50, alpha=0.6, label='Canceled', color='red')
-plt.title('Lead Time: Canceled vs Not Canceled', size=14, weight='bold')
-plt.xlabel('Lead Time (days)')
-plt.ylabel('Count')
-plt.legend()
-plt.tight_layout()
-plt.savefig(f'{output_dir}/04_lead_time.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 04_lead_time.png")
-
-# 6. Market Segments
-print("\n6. Generating market segments analysis...")
-top_segments = df['market_segment'].value_counts().head(5)
-
-plt.figure(figsize=(10, 5))
-top_segments.plot(kind='barh', color='teal')
-plt.title('Top 5 Market Segments', size=14, weight='bold')
-plt.xlabel('Number of Bookings')
-plt.tight_layout()
-plt.savefig(f'{output_dir}/05_market_segments.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 05_market_segments.png")
-
-# 7. Average Daily Rate (ADR)
-print("\n7. Generating ADR distribution...")
-adr_data = df[df['adr'] > 0]['adr']
-
-plt.figure(figsize=(10, 5))
-plt.hist(adr_data, bins=50, color='gold', edgecolor='black')
-plt.title('Average Daily Rate Distribution', size=14, weight='bold')
-plt.xlabel('ADR ($)')
-plt.ylabel('Count')
-plt.axvline(adr_data.mean(), color='red', linestyle='--', linewidth=2, label=f'Mean: ${adr_data.mean():.2f}')
-plt.legend()
-plt.tight_layout()
-plt.savefig(f'{output_dir}/06_adr_distribution.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 06_adr_distribution.png")
-
-# 8. Key Correlations
-print("\n8. Generating correlation analysis...")
-numerical_cols = ['lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
-                  'adults', 'children', 'babies', 'is_repeated_guest',
-                  'previous_cancellations', 'booking_changes', 'adr',
-                  'total_of_special_requests']
-
-corr_data = df[numerical_cols + ['is_canceled']].corr()['is_canceled'].drop('is_canceled').sort_values()
-
-plt.figure(figsize=(10, 6))
-corr_data.plot(kind='barh', color=['red' if x < 0 else 'green' for x in corr_data])
-plt.title('Correlation with Cancellation', size=14, weight='bold')
-plt.xlabel('Correlation')
-plt.axvline(0, color='black', linewidth=0.8)
-plt.tight_layout()
-plt.savefig(f'{output_dir}/07_correlations.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 07_correlations.png")
-
-# 9. Guest Patterns
-print("\n9. Generating guest patterns...")
-df['total_guests'] = df['adults'] + df['children'].fillna(0) + df['babies']
-
-plt.figure(figsize=(10, 5))
-plt.hist(df['total_guests'], bins=15, color='purple', edgecolor='black')
-plt.title('Number of Guests per Booking', size=14, weight='bold')
-plt.xlabel('Total Guests')
-plt.ylabel('Count')
-plt.tight_layout()
-plt.savefig(f'{output_dir}/08_guest_patterns.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 08_guest_patterns.png")
-
-# 10. Stay Duration
-print("\n10. Generating stay duration analysis...")
-df['total_nights'] = df['stays_in_weekend_nights'] + df['stays_in_week_nights']
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Total nights histogram
-axes[0].hist(df['total_nights'], bins=30, color='orange', edgecolor='black')
-axes[0].set_title('Stay Duration Distribution', size=14, weight='bold')
-axes[0].set_xlabel('Total Nights')
-axes[0].set_ylabel('Count')
-
-# Weekend vs weekday
-stay_data = pd.DataFrame({
-    'Weekend Nights': [df['stays_in_weekend_nights'].sum()],
-    'Week Nights': [df['stays_in_week_nights'].sum()]
-})
-stay_data.T.plot(kind='bar', ax=axes[1], color=['skyblue', 'coral'], legend=False)
-axes[1].set_title('Weekend vs Weekday Stays', size=14, weight='bold')
-axes[1].set_ylabel('Total Nights')
-axes[1].set_xticklabels(['Weekend', 'Weekday'], rotation=0)
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/09_stay_duration.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 09_stay_duration.png")
-
-# 11. Customer Types
-print("\n11. Generating customer types analysis...")
-customer_counts = df['customer_type'].value_counts()
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Bar chart
-axes[0].bar(customer_counts.index, customer_counts.values, color='steelblue')
-axes[0].set_title('Bookings by Customer Type', size=14, weight='bold')
-axes[0].set_ylabel('Count')
-axes[0].tick_params(axis='x', rotation=45)
-
-# Cancellation rate
-customer_cancel = df.groupby('customer_type')['is_canceled'].mean() * 100
-axes[1].bar(customer_cancel.index, customer_cancel.values, color='crimson')
-axes[1].set_title('Cancellation Rate by Customer Type', size=14, weight='bold')
-axes[1].set_ylabel('Cancellation Rate (%)')
-axes[1].tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/10_customer_types.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 10_customer_types.png")
-
-# 12. Deposit Type Impact
-print("\n12. Generating deposit type analysis...")
-deposit_cancel = df.groupby('deposit_type')['is_canceled'].mean() * 100
-
-plt.figure(figsize=(10, 5))
-deposit_cancel.plot(kind='bar', color=['green', 'orange', 'red'])
-plt.title('Cancellation Rate by Deposit Type', size=14, weight='bold')
-plt.ylabel('Cancellation Rate (%)')
-plt.xlabel('Deposit Type')
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig(f'{output_dir}/11_deposit_type.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 11_deposit_type.png")
-
-# 13. Meal Preferences
-print("\n13. Generating meal preferences...")
-meal_counts = df['meal'].value_counts()
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Bar chart
-axes[0].bar(meal_counts.index, meal_counts.values, color='teal')
-axes[0].set_title('Bookings by Meal Type', size=14, weight='bold')
-axes[0].set_ylabel('Count')
-axes[0].tick_params(axis='x', rotation=45)
-
-# Pie chart
-axes[1].pie(meal_counts.values, labels=meal_counts.index, autopct='%1.1f%%', startangle=90)
-axes[1].set_title('Meal Type Distribution', size=14, weight='bold')
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/12_meal_preferences.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 12_meal_preferences.png")
-
-# 14. Special Requests
-print("\n14. Generating special requests analysis...")
-plt.figure(figsize=(10, 5))
-plt.hist(df['total_of_special_requests'], bins=10, color='gold', edgecolor='black')
-plt.title('Special Requests Distribution', size=14, weight='bold')
-plt.xlabel('Number of Special Requests')
-plt.ylabel('Count')
-plt.tight_layout()
-plt.savefig(f'{output_dir}/13_special_requests.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 13_special_requests.png")
-
-# 15. Repeated Guests
-print("\n15. Generating repeated guests analysis...")
-repeated_data = df['is_repeated_guest'].value_counts()
-repeated_labels = ['New Guest', 'Repeated Guest']
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Count
-axes[0].bar(repeated_labels, repeated_data.values, color=['blue', 'green'])
-axes[0].set_title('New vs Repeated Guests', size=14, weight='bold')
-axes[0].set_ylabel('Count')
-
-# Cancellation comparison
-cancel_new = df[df['is_repeated_guest']==0]['is_canceled'].mean() * 100
-cancel_repeated = df[df['is_repeated_guest']==1]['is_canceled'].mean() * 100
-axes[1].bar(repeated_labels, [cancel_new, cancel_repeated], color=['orange', 'red'])
-axes[1].set_title('Cancellation Rate: New vs Repeated', size=14, weight='bold')
-axes[1].set_ylabel('Cancellation Rate (%)')
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/14_repeated_guests.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 14_repeated_guests.png")
-
-# 16. Booking Changes
-print("\n16. Generating booking changes analysis...")
-plt.figure(figsize=(10, 5))
-plt.hist(df['booking_changes'], bins=15, color='purple', edgecolor='black')
-plt.title('Booking Changes Distribution', size=14, weight='bold')
-plt.xlabel('Number of Changes')
-plt.ylabel('Count')
-plt.tight_layout()
-plt.savefig(f'{output_dir}/15_booking_changes.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 15_booking_changes.png")
-
-# 17. Arrival Year Trends
-print("\n17. Generating year trends...")
-year_data = df.groupby('arrival_date_year').agg({
-    'is_canceled': ['count', 'sum', 'mean']
-}).reset_index()
-year_data.columns = ['Year', 'Total', 'Canceled', 'Cancel_Rate']
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Total bookings
-axes[0].bar(year_data['Year'], year_data['Total'], color='skyblue')
-axes[0].set_title('Total Bookings by Year', size=14, weight='bold')
-axes[0].set_ylabel('Number of Bookings')
-axes[0].set_xlabel('Year')
-
-# Cancellation rate
-axes[1].plot(year_data['Year'], year_data['Cancel_Rate']*100, marker='o', linewidth=2, color='red', markersize=10)
-axes[1].set_title('Cancellation Rate by Year', size=14, weight='bold')
-axes[1].set_ylabel('Cancellation Rate (%)')
-axes[1].set_xlabel('Year')
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/16_year_trends.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 16_year_trends.png")
-
-# 18. Distribution Channels
-print("\n18. Generating distribution channels...")
-channel_counts = df['distribution_channel'].value_counts()
-
-plt.figure(figsize=(10, 5))
-channel_counts.plot(kind='barh', color='teal')
-plt.title('Bookings by Distribution Channel', size=14, weight='bold')
-plt.xlabel('Number of Bookings')
-plt.ylabel('Channel')
-plt.tight_layout()
-plt.savefig(f'{output_dir}/17_distribution_channels.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 17_distribution_channels.png")
-
-# 19. Previous Cancellations
-print("\n19. Generating previous cancellations analysis...")
-has_previous = df[df['previous_cancellations'] > 0]
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Distribution
-axes[0].hist(df['previous_cancellations'], bins=20, color='crimson', edgecolor='black')
-axes[0].set_title('Previous Cancellations Distribution', size=14, weight='bold')
-axes[0].set_xlabel('Previous Cancellations')
-axes[0].set_ylabel('Count')
-
-# Impact on current cancellation
-cancel_with_history = has_previous['is_canceled'].mean() * 100
-cancel_no_history = df[df['previous_cancellations']==0]['is_canceled'].mean() * 100
-axes[1].bar(['No History', 'Has History'], [cancel_no_history, cancel_with_history], 
-            color=['green', 'red'])
-axes[1].set_title('Cancellation: With vs Without History', size=14, weight='bold')
-axes[1].set_ylabel('Cancellation Rate (%)')
-
-plt.tight_layout()
-plt.savefig(f'{output_dir}/18_previous_cancellations.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 18_previous_cancellations.png")
-
-# 20. ADR vs Cancellation
-print("\n20. Generating ADR comparison...")
-adr_not_canceled = df[(df['is_canceled']==0) & (df['adr']>0) & (df['adr']<500)]['adr']
-adr_canceled = df[(df['is_canceled']==1) & (df['adr']>0) & (df['adr']<500)]['adr']
-
-plt.figure(figsize=(10, 5))
-plt.hist(adr_not_canceled, bins=50, alpha=0.6, label='Not Canceled', color='green')
-plt.hist(adr_canceled, bins=50, alpha=0.6, label='Canceled', color='red')
-plt.title('ADR: Canceled vs Not Canceled', size=14, weight='bold')
-plt.xlabel('ADR ($)')
-plt.ylabel('Count')
-plt.legend()
-plt.tight_layout()
-plt.savefig(f'{output_dir}/19_adr_comparison.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 19_adr_comparison.png")
-
-# 21. Parking Spaces
-print("\n21. Generating parking spaces analysis...")
-parking_counts = df['required_car_parking_spaces'].value_counts().sort_index()
-
-plt.figure(figsize=(10, 5))
-parking_counts.plot(kind='bar', color='steelblue')
-plt.title('Parking Space Requirements', size=14, weight='bold')
-plt.xlabel('Number of Parking Spaces')
-plt.ylabel('Count')
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.savefig(f'{output_dir}/20_parking_spaces.png', dpi=300, bbox_inches='tight')
-plt.close()
-print(f"✓ Saved: 20_parking_spaces.png")
-
-# Summary
-print("\n" + "=" * 70)
-print("KEY INSIGHTS SUMMARY")
-print("=" * 70)
-
-print(f"\n1. Total Bookings: {len(df):,}")
-print(f"2. Cancellation Rate: {df['is_canceled'].mean()*100:.1f}%")
-print(f"3. Average Lead Time: {df['lead_time'].mean():.0f} days")
-print(f"4. Average Price (ADR): ${df[df['adr']>0]['adr'].mean():.2f}")
-print(f"5. Average Guests: {df['total_guests'].mean():.2f}")
-print(f"6. Average Stay: {df['total_nights'].mean():.2f} nights")
-print(f"7. Most Canceled Month: {df[df['is_canceled']==1]['arrival_date_month'].value_counts().index[0]}")
-print(f"8. Busiest Month: {df['arrival_date_month'].value_counts().index[0]}")
-print(f"9. Repeated Guests: {(df['is_repeated_guest']==1).mean()*100:.1f}%")
-
-with_requests = df[df['total_of_special_requests'] > 0]['is_canceled'].mean() * 100
-without_requests = df[df['total_of_special_requests'] == 0]['is_canceled'].mean() * 100
-print(f"10. Special Requests Impact:")
-print(f"    - With requests: {with_requests:.1f}% cancellation")
-print(f"    - Without requests: {without_requests:.1f}% cancellation")
-
-print("\n" + "=" * 70)
-print(f"✓ ALL VISUALIZATIONS SAVED TO: {output_dir}/")
-print(f"✓ Total: 20 visualization files created")
-print("=" * 70)
+# Workers are forked where possible so they inherit the loaded aggregates
+_MP_CONTEXT = (multiprocessing.get_context('fork')
+               if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+# Aggregates inherited from the parent, or loaded once per worker by _init_worker
+_worker_aggregates = None
+
+
+@dataclass
+class FigureTask:
+    filename: str
+    title: str
+    func: object
+    columns: list
+
+
+FIGURES = []
+
+NUMERICAL_COLUMNS = ['lead_time', 'stays_in_weekend_nights', 'stays_in_week_nights',
+                     'adults', 'children', 'babies', 'is_repeated_guest',
+                     'previous_cancellations', 'booking_changes', 'adr',
+                     'total_of_special_requests']
+
+
+def figure(filename, title, columns):
+    """Register a function that draws one figure from the aggregates of the columns it lists"""
+    def register(func):
+        FIGURES.append(FigureTask(filename, title, func, list(columns)))
+        return func
+    return register
+
+
+@figure('01_cancellation_overview.png', 'Cancellation Overview', [TARGET])
+def cancellation_overview(agg):
+    plt.figure(figsize=(8, 6))
+    cancel_counts = agg.value_counts(TARGET)
+    plt.pie(cancel_counts, labels=['Not Canceled', 'Canceled'], autopct='%1.1f%%',
+            colors=['green', 'red'], startangle=90)
+    plt.title('Booking Cancellations', size=14, weight='bold')
+
+
+@figure('02_hotel_types.png', 'Hotel Types', ['hotel'])
+def hotel_types(agg):
+    hotel_data = agg.cancel_rate('hotel') * 100
+
+    plt.figure(figsize=(8, 5))
+    hotel_data.plot(kind='bar', color=['skyblue', 'coral'])
+    plt.title('Cancellation Rate by Hotel Type', size=14, weight='bold')
+    plt.ylabel('Cancellation Rate (%)')
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+
+
+@figure('03_monthly_trends.png', 'Booking Trends by Month', ['arrival_date_month'])
+def monthly_trends(agg):
+    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
+                   'July', 'August', 'September', 'October', 'November', 'December']
+    month_counts = agg.value_counts('arrival_date_month').reindex(month_order)
+
+    plt.figure(figsize=(12, 5))
+    plt.plot(month_order, month_counts.values, marker='o', linewidth=2, color='blue')
+    plt.title('Bookings by Month', size=14, weight='bold')
+    plt.ylabel('Number of Bookings')
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+@figure('04_lead_time.png', 'Lead Time Analysis', ['lead_time'])
+def lead_time(agg):
+    values, weights = agg.hist_data('lead_time', canceled=False)
+    plt.figure(figsize=(10, 5))
+    plt.hist(values, weights=weights, bins=50, alpha=0.6, label='Not Canceled', color='green')
+    values, weights = agg.hist_data('lead_time', canceled=True)
+    plt.hist(values, weights=weights, bins=50, alpha=0.6, label='Canceled', color='red')
+    plt.title('Lead Time: Canceled vs Not Canceled', size=14, weight='bold')
+    plt.xlabel('Lead Time (days)')
+    plt.ylabel('Count')
+    plt.legend()
+    plt.tight_layout()
+
+
+@figure('05_market_segments.png', 'Market Segments', ['market_segment'])
+def market_segments(agg):
+    top_segments = agg.value_counts('market_segment').head(5)
+
+    plt.figure(figsize=(10, 5))
+    top_segments.plot(kind='barh', color='teal')
+    plt.title('Top 5 Market Segments', size=14, weight='bold')
+    plt.xlabel('Number of Bookings')
+    plt.tight_layout()
+
+
+@figure('06_adr_distribution.png', 'Average Daily Rate (ADR)', ['adr'])
+def adr_distribution(agg):
+    values, weights = agg.hist_data('adr', mask_fn=lambda adr: adr > 0)
+    adr_mean = agg.stats('adr', mask_fn=lambda adr: adr > 0)['mean']
+
+    plt.figure(figsize=(10, 5))
+    plt.hist(values, weights=weights, bins=50, color='gold', edgecolor='black')
+    plt.title('Average Daily Rate Distribution', size=14, weight='bold')
+    plt.xlabel('ADR ($)')
+    plt.ylabel('Count')
+    plt.axvline(adr_mean, color='red', linestyle='--', linewidth=2, label=f'Mean: ${adr_mean:.2f}')
+    plt.legend()
+    plt.tight_layout()
+
+
+@figure('07_correlations.png', 'Key Correlations', NUMERICAL_COLUMNS)
+def correlations(agg):
+    corr_data = agg.corr_with_target(NUMERICAL_COLUMNS).sort_values()
+
+    plt.figure(figsize=(10, 6))
+    corr_data.plot(kind='barh', color=['red' if x < 0 else 'green' for x in corr_data])
+    plt.title('Correlation with Cancellation', size=14, weight='bold')
+    plt.xlabel('Correlation')
+    plt.axvline(0, color='black', linewidth=0.8)
+    plt.tight_layout()
+
+
+@figure('08_guest_patterns.png', 'Guest Patterns', ['total_guests'])
+def guest_patterns(agg):
+    values, weights = agg.hist_data('total_guests')
+
+    plt.figure(figsize=(10, 5))
+    plt.hist(values, weights=weights, bins=15, color='purple', edgecolor='black')
+    plt.title('Number of Guests per Booking', size=14, weight='bold')
+    plt.xlabel('Total Guests')
+    plt.ylabel('Count')
+    plt.tight_layout()
+
+
+@figure('09_stay_duration.png', 'Stay Duration',
+        ['total_nights', 'stays_in_weekend_nights', 'stays_in_week_nights'])
+def stay_duration(agg):
+    values, weights = agg.hist_data('total_nights')
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Total nights histogram
+    axes[0].hist(values, weights=weights, bins=30, color='orange', edgecolor='black')
+    axes[0].set_title('Stay Duration Distribution', size=14, weight='bold')
+    axes[0].set_xlabel('Total Nights')
+    axes[0].set_ylabel('Count')
+
+    # Weekend vs weekday
+    weekend, week = agg.stats('stays_in_weekend_nights'), agg.stats('stays_in_week_nights')
+    stay_data = pd.DataFrame({
+        'Weekend Nights': [weekend['sum']],
+        'Week Nights': [week['sum']]
+    })
+    stay_data.T.plot(kind='bar', ax=axes[1], color=['skyblue', 'coral'], legend=False)
+    axes[1].set_title('Weekend vs Weekday Stays', size=14, weight='bold')
+    axes[1].set_ylabel('Total Nights')
+    axes[1].set_xticklabels(['Weekend', 'Weekday'], rotation=0)
+
+    plt.tight_layout()
+
+
+@figure('10_customer_types.png', 'Customer Types', ['customer_type'])
+def customer_types(agg):
+    customer_counts = agg.value_counts('customer_type')
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Bar chart
+    axes[0].bar(customer_counts.index, customer_counts.values, color='steelblue')
+    axes[0].set_title('Bookings by Customer Type', size=14, weight='bold')
+    axes[0].set_ylabel('Count')
+    axes[0].tick_params(axis='x', rotation=45)
+
+    # Cancellation rate
+    customer_cancel = agg.cancel_rate('customer_type') * 100
+    axes[1].bar(customer_cancel.index, customer_cancel.values, color='crimson')
+    axes[1].set_title('Cancellation Rate by Customer Type', size=14, weight='bold')
+    axes[1].set_ylabel('Cancellation Rate (%)')
+    axes[1].tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+
+
+@figure('11_deposit_type.png', 'Deposit Type Impact', ['deposit_type'])
+def deposit_type(agg):
+    deposit_cancel = agg.cancel_rate('deposit_type') * 100
+
+    plt.figure(figsize=(10, 5))
+    deposit_cancel.plot(kind='bar', color=['green', 'orange', 'red'])
+    plt.title('Cancellation Rate by Deposit Type', size=14, weight='bold')
+    plt.ylabel('Cancellation Rate (%)')
+    plt.xlabel('Deposit Type')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+
+@figure('12_meal_preferences.png', 'Meal Preferences', ['meal'])
+def meal_preferences(agg):
+    meal_counts = agg.value_counts('meal')
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Bar chart
+    axes[0].bar(meal_counts.index, meal_counts.values, color='teal')
+    axes[0].set_title('Bookings by Meal Type', size=14, weight='bold')
+    axes[0].set_ylabel('Count')
+    axes[0].tick_params(axis='x', rotation=45)
+
+    # Pie chart
+    axes[1].pie(meal_counts.values, labels=meal_counts.index, autopct='%1.1f%%', startangle=90)
+    axes[1].set_title('Meal Type Distribution', size=14, weight='bold')
+
+    plt.tight_layout()
+
+
+@figure('13_special_requests.png', 'Special Requests', ['total_of_special_requests'])
+def special_requests(agg):
+    values, weights = agg.hist_data('total_of_special_requests')
+
+    plt.figure(figsize=(10, 5))
+    plt.hist(values, weights=weights, bins=10, color='gold', edgecolor='black')
+    plt.title('Special Requests Distribution', size=14, weight='bold')
+    plt.xlabel('Number of Special Requests')
+    plt.ylabel('Count')
+    plt.tight_layout()
+
+
+@figure('14_repeated_guests.png', 'Repeated Guests', ['is_repeated_guest'])
+def repeated_guests(agg):
+    repeated_data = agg.value_counts('is_repeated_guest')
+    repeated_labels = ['New Guest', 'Repeated Guest']
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Count
+    axes[0].bar(repeated_labels, repeated_data.values, color=['blue', 'green'])
+    axes[0].set_title('New vs Repeated Guests', size=14, weight='bold')
+    axes[0].set_ylabel('Count')
+
+    # Cancellation comparison
+    cancel_rates = agg.cancel_rate('is_repeated_guest') * 100
+    axes[1].bar(repeated_labels, [cancel_rates[0], cancel_rates[1]], color=['orange', 'red'])
+    axes[1].set_title('Cancellation Rate: New vs Repeated', size=14, weight='bold')
+    axes[1].set_ylabel('Cancellation Rate (%)')
+
+    plt.tight_layout()
+
+
+@figure('15_booking_changes.png', 'Booking Changes', ['booking_changes'])
+def booking_changes(agg):
+    values, weights = agg.hist_data('booking_changes')
+
+    plt.figure(figsize=(10, 5))
+    plt.hist(values, weights=weights, bins=15, color='purple', edgecolor='black')
+    plt.title('Booking Changes Distribution', size=14, weight='bold')
+    plt.xlabel('Number of Changes')
+    plt.ylabel('Count')
+    plt.tight_layout()
+
+
+@figure('16_year_trends.png', 'Arrival Year Trends', ['arrival_date_year'])
+def year_trends(agg):
+    year_data = agg.table('arrival_date_year').reset_index()
+    year_data.columns = ['Year', 'Total', 'Canceled', 'Cancel_Rate']
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Total bookings
+    axes[0].bar(year_data['Year'], year_data['Total'], color='skyblue')
+    axes[0].set_title('Total Bookings by Year', size=14, weight='bold')
+    axes[0].set_ylabel('Number of Bookings')
+    axes[0].set_xlabel('Year')
+
+    # Cancellation rate
+    axes[1].plot(year_data['Year'], year_data['Cancel_Rate']*100, marker='o', linewidth=2, color='red', markersize=10)
+    axes[1].set_title('Cancellation Rate by Year', size=14, weight='bold')
+    axes[1].set_ylabel('Cancellation Rate (%)')
+    axes[1].set_xlabel('Year')
+    axes[1].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+
+
+@figure('17_distribution_channels.png', 'Distribution Channels', ['distribution_channel'])
+def distribution_channels(agg):
+    channel_counts = agg.value_counts('distribution_channel')
+
+    plt.figure(figsize=(10, 5))
+    channel_counts.plot(kind='barh', color='teal')
+    plt.title('Bookings by Distribution Channel', size=14, weight='bold')
+    plt.xlabel('Number of Bookings')
+    plt.ylabel('Channel')
+    plt.tight_layout()
+
+
+@figure('18_previous_cancellations.png', 'Previous Cancellations', ['previous_cancellations'])
+def previous_cancellations(agg):
+    values, weights = agg.hist_data('previous_cancellations')
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Distribution
+    axes[0].hist(values, weights=weights, bins=20, color='crimson', edgecolor='black')
+    axes[0].set_title('Previous Cancellations Distribution', size=14, weight='bold')
+    axes[0].set_xlabel('Previous Cancellations')
+    axes[0].set_ylabel('Count')
+
+    # Impact on current cancellation
+    cancel_with_history = agg.rate_where('previous_cancellations', lambda n: n > 0) * 100
+    cancel_no_history = agg.rate_where('previous_cancellations', lambda n: n == 0) * 100
+    axes[1].bar(['No History', 'Has History'], [cancel_no_history, cancel_with_history],
+                color=['green', 'red'])
+    axes[1].set_title('Cancellation: With vs Without History', size=14, weight='bold')
+    axes[1].set_ylabel('Cancellation Rate (%)')
+
+    plt.tight_layout()
+
+
+@figure('19_adr_comparison.png', 'ADR vs Cancellation', ['adr'])
+def adr_comparison(agg):
+    plt.figure(figsize=(10, 5))
+    values, weights = agg.hist_data('adr', canceled=False, mask_fn=lambda adr: (adr > 0) & (adr < 500))
+    plt.hist(values, weights=weights, bins=50, alpha=0.6, label='Not Canceled', color='green')
+    values, weights = agg.hist_data('adr', canceled=True, mask_fn=lambda adr: (adr > 0) & (adr < 500))
+    plt.hist(values, weights=weights, bins=50, alpha=0.6, label='Canceled', color='red')
+    plt.title('ADR: Canceled vs Not Canceled', size=14, weight='bold')
+    plt.xlabel('ADR ($)')
+    plt.ylabel('Count')
+    plt.legend()
+    plt.tight_layout()
+
+
+@figure('20_parking_spaces.png', 'Parking Spaces', ['required_car_parking_spaces'])
+def parking_spaces(agg):
+    parking_counts = agg.table('required_car_parking_spaces')['bookings']
+
+    plt.figure(figsize=(10, 5))
+    parking_counts.plot(kind='bar', color='steelblue')
+    plt.title('Parking Space Requirements', size=14, weight='bold')
+    plt.xlabel('Number of Parking Spaces')
+    plt.ylabel('Count')
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+
+
+def table_hashes(agg) -> dict:
+    """Content hash of each column's aggregate table"""
+    return {col: hashlib.blake2b(pd.util.hash_pandas_object(table).to_numpy().tobytes(),
+                                 digest_size=16).hexdigest()
+            for col, table in agg.tables.items()}
+
+
+@lru_cache(maxsize=None)
+def shared_source_hash() -> str:
+    """Hash of the code every figure goes through: aggregates.py, render() and shared constants"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'aggregates={AGGREGATES_VERSION}\n'.encode())
+    digest.update(inspect.getsource(aggregates).encode())
+    digest.update(inspect.getsource(render).encode())
+    digest.update(repr(NUMERICAL_COLUMNS).encode())
+    return digest.hexdigest()
+
+
+def figure_key(task: FigureTask, hashes: dict, dpi) -> str:
+    """Fingerprint of everything a figure's PNG depends on"""
+    digest = hashlib.blake2b(digest_size=16)
+    for col in sorted(set(task.columns)):
+        digest.update(f'{col}={hashes[col]}\n'.encode())
+    digest.update(inspect.getsource(task.func).encode())
+    digest.update(shared_source_hash().encode())
+    digest.update(f'dpi={dpi} matplotlib={matplotlib.__version__}'.encode())
+    return digest.hexdigest()
+
+
+def _read_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path, manifest):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def render(task: FigureTask, agg, out_dir, dpi):
+    """Draw one figure and save it to out_dir; returns seconds taken"""
+    start = time.perf_counter()
+    try:
+        task.func(agg)
+        plt.savefig(os.path.join(out_dir, task.filename), dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close('all')
+    return time.perf_counter() - start
+
+
+def _init_worker():
+    """Load the cached aggregates once per worker unless they were inherited from the parent"""
+    global _worker_aggregates
+    if _worker_aggregates is None:
+        _worker_aggregates = load_aggregates(data_path)
+
+
+def _render_in_worker(index, out_dir, dpi):
+    return render(FIGURES[index], _worker_aggregates, out_dir, dpi)
+
+
+def render_figures(agg, tasks, out_dir, dpi, workers):
+    """Render tasks, in a process pool when workers > 1; yields (task, seconds)"""
+    global _worker_aggregates
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield task, render(task, agg, out_dir, dpi)
+        return
+    if _MP_CONTEXT is not None:
+        _worker_aggregates = agg
+    try:
+        with ProcessPoolExecutor(min(workers, len(tasks)), mp_context=_MP_CONTEXT,
+                                 initializer=_init_worker) as pool:
+            futures = {pool.submit(_render_in_worker, FIGURES.index(task), out_dir, dpi): task
+                       for task in tasks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    finally:
+        _worker_aggregates = None
+
+
+def print_summary(agg):
+    print("\n" + "=" * 70)
+    print("KEY INSIGHTS SUMMARY")
+    print("=" * 70)
+
+    print(f"\n1. Total Bookings: {agg.n_rows:,}")
+    print(f"2. Cancellation Rate: {agg.n_canceled / agg.n_rows * 100:.1f}%")
+    print(f"3. Average Lead Time: {agg.stats('lead_time')['mean']:.0f} days")
+    print(f"4. Average Price (ADR): ${agg.stats('adr', mask_fn=lambda adr: adr > 0)['mean']:.2f}")
+    print(f"5. Average Guests: {agg.stats('total_guests')['mean']:.2f}")
+    print(f"6. Average Stay: {agg.stats('total_nights')['mean']:.2f} nights")
+    print(f"7. Most Canceled Month: {agg.value_counts('arrival_date_month', canceled=True).index[0]}")
+    print(f"8. Busiest Month: {agg.value_counts('arrival_date_month').index[0]}")
+    print(f"9. Repeated Guests: {agg.stats('is_repeated_guest')['mean']*100:.1f}%")
+
+    with_requests = agg.rate_where('total_of_special_requests', lambda n: n > 0) * 100
+    without_requests = agg.rate_where('total_of_special_requests', lambda n: n == 0) * 100
+    print(f"10. Special Requests Impact:")
+    print(f"    - With requests: {with_requests:.1f}% cancellation")
+    print(f"    - Without requests: {without_requests:.1f}% cancellation")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the EDA figures, skipping unchanged ones")
+    parser.add_argument('--preview', action='store_true',
+                        help=f"Render at {PREVIEW_DPI} dpi into {os.path.relpath(preview_dir, project_dir)}/")
+    parser.add_argument('--workers', type=int, default=0, help="Rendering processes (0 = all cores)")
+    parser.add_argument('--force', action='store_true', help="Redraw every figure")
+    args = parser.parse_args(argv)
+
+    out_dir = preview_dir if args.preview else output_dir
+    dpi = PREVIEW_DPI if args.preview else REPORT_DPI
+    workers = args.workers or os.cpu_count()
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    print("=" * 70)
+    print("HOTEL BOOKING EDA - GENERATING VISUALIZATIONS")
+    print("=" * 70)
+
+    # 1. Aggregates: cached, or one pass over the bookings when the data changed
+    print("\n1. Loading data...")
+    agg = load_aggregates(data_path)
+    print(f"✓ Dataset has {agg.n_rows:,} bookings")
+    print(f"✓ Cancellation rate: {agg.n_canceled / agg.n_rows * 100:.1f}%")
+
+    # 2. Work out which figures are out of date
+    print("\n2. Checking figures...")
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = _read_manifest(manifest_path)
+    hashes = table_hashes(agg)
+    keys = {task.filename: figure_key(task, hashes, dpi) for task in FIGURES}
+    stale = [task for task in FIGURES
+             if args.force or manifest.get(task.filename) != keys[task.filename]
+             or not os.path.exists(os.path.join(out_dir, task.filename))]
+    print(f"✓ {len(FIGURES) - len(stale)} up to date, {len(stale)} to render")
+
+    # 3. Render the stale figures
+    print(f"\n3. Rendering {len(stale)} figures at {dpi} dpi "
+          f"({min(workers, max(len(stale), 1))} worker(s))...")
+    try:
+        for task, seconds in render_figures(agg, stale, out_dir, dpi, workers):
+            manifest[task.filename] = keys[task.filename]
+            print(f"✓ Saved: {task.filename} ({task.title}, {seconds:.1f}s)")
+    finally:
+        # Keep the figures that did render even if another one failed
+        _write_manifest(manifest_path, {name: key for name, key in manifest.items() if name in keys})
+
+    print_summary(agg)
+
+    print("\n" + "=" * 70)
+    print(f"✓ ALL VISUALIZATIONS SAVED TO: {out_dir}/")
+    print(f"✓ Total: {len(FIGURES)} visualization files ({len(stale)} rendered, "
+          f"{len(FIGURES) - len(stale)} unchanged) in {time.perf_counter() - start:.1f}s")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+Hotel Booking Demand - SQL Analysis Runner
+
+Runs the BI queries in sql/*.sql against the local booking data with the
+SQLite engine that ships with Python, so no database server is needed.
+
+The bookings CSV is loaded (through the columnar cache in data_store.py),
+or a Feather / Arrow file such as synthetic.py writes is read directly,
+into an SQLite file next to that cache as the hotel_bookings table. Only the
+columns the queries reference are stored, which keeps rows narrow and table
+scans fast. The file is reused until the source's content hash changes or a
+query needs a column it lacks.
+
+Covering indexes are built on the columns the queries group on
+(is_canceled, hotel, arrival_date_month / arrival_date_year), so those
+GROUP BYs read a small index in order instead of scanning and sorting the
+table.
+
+Queries run in a process pool, one read-only connection per worker. Every
+query is timed and its result written to reports/sql/<script>/<NN>_<title>.csv;
+timings go to reports/sql/timings.json. A query is not re-run while its SQL
+text and the data are unchanged and its result file exists (keys are kept
+in .manifest.json in the results folder), so after editing one query only
+that query runs again.
+
+Usage (from the project root):
+    python src/sql_runner.py
+    python src/sql_runner.py sql/02_advanced_eda_analysis.sql --data data/synthetic_10M.feather
+    python src/sql_runner.py --force --workers 4
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from data_store import cache_paths, dataset_hash, load_dataset
+from hashing import file_hash
+from schema import apply_schema
+
+# Bump when the table layout or indexes change so cached databases are rebuilt
+DATABASE_VERSION = 1
+
+TABLE = 'hotel_bookings'
+DEFAULT_DATA = os.path.join('data', 'hotel_bookings.csv')
+SQL_GLOB = os.path.join('sql', '*.sql')
+RESULTS_DIR = os.path.join('reports', 'sql')
+MANIFEST_NAME = '.manifest.json'
+COLUMNAR_EXTENSIONS = ('.feather', '.arrow')
+INSERT_BATCH_ROWS = 100_000
+
+# name: columns; the leading columns are the GROUP BY keys, the rest make the
+# index covering for the queries that group on them
+INDEXES = {
+    'idx_bookings_canceled': ['is_canceled', 'adr', 'stays_in_weekend_nights',
+                              'stays_in_week_nights'],
+    'idx_bookings_hotel': ['hotel', 'is_canceled'],
+    'idx_bookings_arrival': ['arrival_date_month', 'arrival_date_year', 'is_canceled'],
+    'idx_bookings_year': ['arrival_date_year', 'is_canceled', 'adr', 'lead_time'],
+}
+
+# Workers are forked where possible (spawn works too: they only need the path)
+_MP_CONTEXT = (multiprocessing.get_context('fork')
+               if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+# Read-only connection opened once per worker process by _init_worker
+_worker_conn = None
+
+# "-- 3. MONTHLY BOOKING TRENDS" section headers name the queries
+TITLE_PATTERN = re.compile(r'^--\s*(\d+)\.\s*(.+?)\s*$', re.MULTILINE)
+
+
+def database_path(csv_path):
+    feather_path, _ = cache_paths(csv_path)
+    return feather_path.replace('.feather', '.sqlite')
+
+
+def split_queries(text):
+    """[(number, title, sql)] for each statement in a .sql script"""
+    queries, lines, title = [], [], None
+    for line in text.splitlines():
+        match = TITLE_PATTERN.match(line)
+        if match and not ''.join(lines).strip():
+            title = (int(match.group(1)), match.group(2))
+        if line.lstrip().startswith('--'):
+            continue
+        lines.append(line)
+        statement = '\n'.join(lines).strip()
+        if statement and sqlite3.complete_statement(statement):
+            number, name = title or (len(queries) + 1, f'query {len(queries) + 1}')
+            queries.append((number, name, statement))
+            lines, title = [], None
+    return queries
+
+
+def read_queries(script):
+    """split_queries() of a .sql file"""
+    with open(script) as f:
+        return split_queries(f.read())
+
+
+def referenced_columns(queries, available):
+    """Dataset columns mentioned anywhere in the queries, in dataset order"""
+    words = set(re.findall(r'[a-z_][a-z0-9_]*', ' '.join(sql for _, _, sql in queries).lower()))
+    return [col for col in available if col.lower() in words]
+
+
+def is_columnar(path):
+    return path.lower().endswith(COLUMNAR_EXTENSIONS)
+
+
+def source_columns(path):
+    """Column names of a bookings CSV or Feather / Arrow file"""
+    if is_columnar(path):
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def source_hash(path):
+    """Content hash of the bookings (CSV hashes are kept by the columnar cache)"""
+    return file_hash(path) if is_columnar(path) else dataset_hash(path, typed=True)
+
+
+def load_bookings(path, columns):
+    """Typed bookings (columns only) from a CSV or Feather / Arrow file"""
+    if is_columnar(path):
+        return apply_schema(feather.read_table(path, columns=columns, memory_map=True).to_pandas())
+    return load_dataset(path, columns=columns, typed=True)
+
+
+def _sql_type(dtype):
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == object:
+        return 'TEXT'
+    return 'INTEGER' if np.dtype(dtype).kind in 'iub' else 'REAL'
+
+
+def _column_values(series: pd.Series) -> list:
+    """Python values for sqlite3, with missing values as NULL"""
+    if series.isna().any():
+        return series.astype(object).where(series.notna(), None).tolist()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(str).tolist()
+    return series.tolist()
+
+
+def _read_meta(conn):
+    try:
+        return dict(conn.execute('SELECT key, value FROM _meta'))
+    except sqlite3.Error:
+        return {}
+
+
+def build_database(csv_path, columns, path):
+    """Write csv_path's bookings (columns only) and the indexes to a new SQLite file"""
+    df = load_bookings(csv_path, columns)
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        definitions = ', '.join(f'{col} {_sql_type(df[col].dtype)}' for col in columns)
+        conn.execute(f'CREATE TABLE {TABLE} ({definitions})')
+        insert = f"INSERT INTO {TABLE} VALUES ({', '.join('?' * len(columns))})"
+        for lo in range(0, len(df), INSERT_BATCH_ROWS):
+            chunk = df.iloc[lo:lo + INSERT_BATCH_ROWS]
+            conn.executemany(insert, zip(*(_column_values(chunk[col]) for col in columns)))
+        for name, index_columns in INDEXES.items():
+            if set(index_columns) <= set(columns):
+                conn.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(index_columns)})")
+        conn.execute('ANALYZE')
+        conn.execute('CREATE TABLE _meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.executemany('INSERT INTO _meta VALUES (?, ?)', [
+            ('version', str(DATABASE_VERSION)),
+            ('source_hash', source_hash(csv_path)),
+            ('columns', json.dumps(columns)),
+            ('rows', str(len(df))),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def prepare_database(csv_path, columns):
+    """Path and metadata of the database for csv_path, (re)built if stale
+
+    Returns (path, meta, seconds spent building or None if reused).
+    """
+    path = database_path(csv_path)
+    digest = source_hash(csv_path)
+    build_seconds = None
+    meta = {}
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        meta = _read_meta(conn)
+        conn.close()
+    if (meta.get('version') != str(DATABASE_VERSION) or meta.get('source_hash') != digest
+            or not set(columns) <= set(json.loads(meta.get('columns', '[]')))):
+        start = time.perf_counter()
+        build_database(csv_path, columns, path)
+        build_seconds = time.perf_counter() - start
+        conn = sqlite3.connect(path)
+        meta = _read_meta(conn)
+        conn.close()
+    return path, meta, build_seconds
+
+
+def connect(path):
+    """Read-only connection with the file memory-mapped"""
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    conn.execute('PRAGMA mmap_size = 1073741824')
+    return conn
+
+
+def _slug(title):
+    return re.sub(r'[^a-z0-9]+', '_', title.lower()).strip('_')
+
+
+def query_key(sql, meta) -> str:
+    """Fingerprint of a query's result: its SQL text and the data it ran on"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{meta['version']}|{meta['source_hash']}|".encode())
+    digest.update(sql.encode())
+    return digest.hexdigest()
+
+
+def run_query(conn, sql, out_path):
+    """Execute one query and write its result to out_path; returns (rows, seconds)"""
+    start = time.perf_counter()
+    cursor = conn.execute(sql)
+    rows = cursor.fetchall()
+    seconds = time.perf_counter() - start
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([column[0] for column in cursor.description])
+        writer.writerows(rows)
+    return len(rows), seconds
+
+
+def _init_worker(path):
+    global _worker_conn
+    _worker_conn = connect(path)
+
+
+def _run_in_worker(sql, out_path):
+    return run_query(_worker_conn, sql, out_path)
+
+
+def run_queries(path, jobs, workers):
+    """Run (sql, out_path) jobs; yields (job index, rows, seconds) as they finish"""
+    if workers <= 1 or len(jobs) <= 1:
+        conn = connect(path)
+        try:
+            for i, (sql, out_path) in enumerate(jobs):
+                yield (i, *run_query(conn, sql, out_path))
+        finally:
+            conn.close()
+        return
+    with ProcessPoolExecutor(min(workers, len(jobs)), mp_context=_MP_CONTEXT,
+                             initializer=_init_worker, initargs=(path,)) as pool:
+        futures = {pool.submit(_run_in_worker, sql, out_path): i
+                   for i, (sql, out_path) in enumerate(jobs)}
+        for future in as_completed(futures):
+            yield (futures[future], *future.result())
+
+
+def _read_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the sql/*.sql analyses against the local bookings")
+    parser.add_argument('scripts', nargs='*', help=f"SQL scripts to run (default: {SQL_GLOB})")
+    parser.add_argument('--data', default=DEFAULT_DATA, help="Bookings CSV or Feather / Arrow file to query")
+    parser.add_argument('--out', default=RESULTS_DIR, help="Folder for the result files")
+    parser.add_argument('--workers', type=int, default=0, help="Query processes (0 = all cores)")
+    parser.add_argument('--force', action='store_true', help="Re-run queries with unchanged results")
+    args = parser.parse_args(argv)
+
+    scripts = args.scripts or sorted(glob.glob(SQL_GLOB))
+    queries = {script: read_queries(script) for script in scripts}
+    available = source_columns(args.data)
+    columns = referenced_columns([q for qs in queries.values() for q in qs], available)
+    workers = args.workers or os.cpu_count()
+
+    print("=" * 70)
+    print("HOTEL BOOKING SQL ANALYSIS")
+    print("=" * 70)
+
+    print(f"\n1. Loading {args.data} into SQLite...")
+    path, meta, build_seconds = prepare_database(args.data, columns)
+    n_rows = int(meta['rows'])
+    if build_seconds is None:
+        print(f"✓ Reusing {path} ({n_rows:,} rows)")
+    else:
+        print(f"✓ Built {path}: {n_rows:,} rows x {len(columns)} columns in {build_seconds:.1f}s")
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, MANIFEST_NAME)
+    manifest = _read_manifest(manifest_path)
+    timings, jobs = [], []
+    for script, script_queries in queries.items():
+        stem = os.path.splitext(os.path.basename(script))[0]
+        os.makedirs(os.path.join(args.out, stem), exist_ok=True)
+        for number, title, sql in script_queries:
+            out_path = os.path.join(args.out, stem, f'{number:02d}_{_slug(title)}.csv')
+            key = query_key(sql, meta)
+            cached = not args.force and manifest.get(out_path) == key and os.path.exists(out_path)
+            timings.append({'script': script, 'query': number, 'title': title, 'key': key,
+                            'cached': cached, 'rows': None, 'seconds': 0.0, 'output': out_path})
+            if not cached:
+                jobs.append((sql, out_path))
+
+    print(f"\n2. Running {len(jobs)} queries ({len(timings) - len(jobs)} unchanged, "
+          f"{min(workers, max(len(jobs), 1))} worker(s))...")
+    pending = [t for t in timings if not t['cached']]
+    try:
+        for i, rows, seconds in run_queries(path, jobs, workers):
+            pending[i].update({'rows': rows, 'seconds': round(seconds, 4)})
+            manifest[pending[i]['output']] = pending[i]['key']
+    finally:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    script = None
+    for t in timings:
+        if t['script'] != script:
+            script = t['script']
+            print(f"\n{script}")
+        status = 'unchanged' if t['cached'] else f"{t['seconds']:>7.3f}s {t['rows']:>5} rows"
+        print(f"  {t['query']:>2}. {t['title'][:48]:<48} {status}")
+
+    total = sum(t['seconds'] for t in timings)
+    report = {'data': args.data, 'rows': n_rows, 'build_seconds': build_seconds,
+              'total_query_seconds': round(total, 4),
+              'queries': [{k: v for k, v in t.items() if k != 'key'} for t in timings]}
+    with open(os.path.join(args.out, 'timings.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "=" * 70)
+    print(f"✓ {len(jobs)} queries run in {total:.2f}s of query time on {n_rows:,} rows")
+    print(f"✓ Results and timings saved to: {args.out}/")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
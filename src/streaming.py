@@ -0,0 +1,156 @@
+"""
+Hotel Booking Demand - Out-of-Core Training
+
+Trains and evaluates a logistic-regression model (SGDClassifier with log
+loss) on the memory-mapped feature store one chunk of rows at a time, for
+training sets that do not fit in memory. Used by 03_model_training.py.
+
+Peak memory is set by chunk_rows, not by the number of rows:
+  - each epoch feeds the chunks (in shuffled order, rows shuffled within a
+    chunk) to SGDClassifier.partial_fit with balanced sample weights,
+  - evaluation accumulates a confusion matrix chunk by chunk.
+
+The feature store is already standardized by the preprocessor from
+02_feature_engineering.py, so the model trains on it as is and drops into
+the preprocessor + model pipeline like LogisticRegression does (including
+model_export.py). The model can keep learning with partial_fit later
+(incremental_refresh.py); rescale_inputs() carries it over to updated
+scaling statistics without changing its predictions.
+"""
+
+import copy
+import re
+import time
+import numpy as np
+import sklearn
+from sklearn.linear_model import SGDClassifier
+from scoring import labels_from_proba
+
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_EPOCHS = 5
+SGD_PARAMS = {'loss': 'log_loss', 'alpha': 1e-4, 'average': True, 'random_state': 42}
+# scikit-learn releases whose SGDClassifier resumes partial_fit from the
+# private weight copies set_coefficients() writes
+SKLEARN_TESTED = ((1, 3), (1, 9))
+# Largest decision-function difference set_coefficients() accepts, relative to its scale
+TOLERANCE = 1e-9
+
+
+def chunk_bounds(n_rows, chunk_rows=DEFAULT_CHUNK_ROWS):
+    return [(lo, min(lo + chunk_rows, n_rows)) for lo in range(0, n_rows, chunk_rows)]
+
+
+def read_chunk(X, lo, hi) -> np.ndarray:
+    """Rows lo:hi of a (memory-mapped) matrix as float64, NaN filled with 0"""
+    return np.nan_to_num(np.asarray(X[lo:hi], dtype=np.float64), nan=0.0)
+
+
+def count_nan(X, chunk_rows=DEFAULT_CHUNK_ROWS) -> int:
+    return sum(int(np.isnan(X[lo:hi]).sum()) for lo, hi in chunk_bounds(len(X), chunk_rows))
+
+
+def balanced_weights(y, chunk_rows=DEFAULT_CHUNK_ROWS) -> np.ndarray:
+    """Per-class weights n / (2 * n_class), as class_weight='balanced'"""
+    counts = np.zeros(2, dtype=np.int64)
+    for lo, hi in chunk_bounds(len(y), chunk_rows):
+        counts += np.bincount(np.asarray(y[lo:hi], dtype=np.int64), minlength=2)
+    return counts.sum() / (2.0 * np.maximum(counts, 1))
+
+
+def set_coefficients(model, coef, intercept):
+    """Replace a fitted SGDClassifier's weights, including the copies partial_fit resumes from
+
+    The averaged and current SGD iterates both restart from the new weights.
+    partial_fit has no public way to seed them, so this writes scikit-learn
+    private attributes and refuses to run on releases outside SKLEARN_TESTED.
+    Afterwards check_resumes() verifies that predictions, and a partial_fit
+    step on a copy, continue from the new weights.
+    """
+    version = tuple(int(part) for part in re.match(r'(\d+)\.(\d+)', sklearn.__version__).groups())
+    low, high = SKLEARN_TESTED
+    if not low <= version <= high or not hasattr(model, '_standard_coef'):
+        raise RuntimeError(f"set_coefficients supports scikit-learn {low[0]}.{low[1]} to "
+                           f"{high[0]}.{high[1]}, not {sklearn.__version__}; "
+                           "retrain with 03_model_training.py instead of refreshing")
+    coef = np.array(coef, dtype=np.float64, order='C').reshape(1, -1)
+    intercept = np.array(intercept, dtype=np.float64).reshape(1)
+    model.coef_, model.intercept_ = coef, intercept
+    model._standard_coef, model._standard_intercept = coef.copy(), intercept.copy()
+    if model.average:
+        model._average_coef, model._average_intercept = coef.copy(), intercept.copy()
+    check_resumes(model, coef, intercept)
+    return model
+
+
+def check_resumes(model, coef, intercept, n_rows=16):
+    """Raise if model does not predict with, or partial_fit not resume from, coef and intercept
+
+    The partial_fit step runs on a copy with a negligible learning rate, so
+    its result is the starting point partial_fit picked up.
+    """
+    X = np.random.default_rng(0).normal(size=(n_rows, coef.shape[1]))
+    expected = X @ coef[0] + intercept[0]
+    probe = copy.deepcopy(model).set_params(learning_rate='constant', eta0=1e-12)
+    probe.partial_fit(X, (expected > 0).astype(np.int64))
+    diff = max(float(np.max(np.abs(model.decision_function(X) - expected))),
+               float(np.max(np.abs(probe.decision_function(X) - expected))))
+    if diff > TOLERANCE * max(1.0, float(np.max(np.abs(expected)))):
+        raise RuntimeError(f"SGDClassifier does not continue from the written weights "
+                           f"(difference {diff:.3g}) with scikit-learn {sklearn.__version__}; "
+                           "retrain with 03_model_training.py instead of refreshing")
+
+
+def rescale_inputs(model, old_mean, old_scale, new_mean, new_scale):
+    """Re-express a linear model on inputs standardized with new statistics
+
+    A row standardized with (old_mean, old_scale) and the same row
+    standardized with (new_mean, new_scale) get the same prediction.
+    """
+    raw = model.coef_ / old_scale
+    intercept = model.intercept_ - raw @ old_mean + raw @ new_mean
+    return set_coefficients(model, raw * new_scale, intercept)
+
+
+def fit_sgd(X, y, chunk_rows=DEFAULT_CHUNK_ROWS, epochs=DEFAULT_EPOCHS, params=None, seed=42):
+    """Epochs of partial_fit over chunks of X; returns the model"""
+    class_weights = balanced_weights(y, chunk_rows)
+    model = SGDClassifier(**{**SGD_PARAMS, **(params or {})})
+    rng = np.random.default_rng(seed)
+    bounds = chunk_bounds(len(X), chunk_rows)
+    for _ in range(epochs):
+        for i in rng.permutation(len(bounds)):
+            lo, hi = bounds[i]
+            order = rng.permutation(hi - lo)
+            X_chunk = read_chunk(X, lo, hi)[order]
+            y_chunk = np.asarray(y[lo:hi], dtype=np.int64)[order]
+            model.partial_fit(X_chunk, y_chunk, classes=np.array([0, 1]),
+                              sample_weight=class_weights[y_chunk])
+    return model
+
+
+def evaluate(model, X, y, threshold, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Accuracy, precision, recall and F1 from a confusion matrix built chunk by chunk
+
+    Also returns predict_seconds, the time spent in predict_proba.
+    """
+    tp = fp = fn = tn = 0
+    seconds = 0.0
+    for lo, hi in chunk_bounds(len(X), chunk_rows):
+        X_chunk = read_chunk(X, lo, hi)
+        start = time.perf_counter()
+        pred = labels_from_proba(model.predict_proba(X_chunk)[:, 1], threshold) == 1
+        seconds += time.perf_counter() - start
+        actual = np.asarray(y[lo:hi]) == 1
+        tp += int(np.sum(pred & actual))
+        fp += int(np.sum(pred & ~actual))
+        fn += int(np.sum(~pred & actual))
+        tn += int(np.sum(~pred & ~actual))
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        'accuracy': (tp + tn) / max(tp + fp + fn + tn, 1),
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'predict_seconds': seconds,
+    }
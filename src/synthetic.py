@@ -0,0 +1,363 @@
+"""
+Hotel Booking Demand - Synthetic Booking Generator
+
+Generates any number of realistic booking rows with the hotel_bookings.csv
+schema, for load and scale testing without downloading the dataset.
+
+A profile describes the data to generate:
+  - per-column marginals (value frequencies for discrete columns, quantiles
+    for continuous ones, and missing-value rates),
+  - the joint distribution of hotel x market_segment x deposit_type, with
+    the cancellation rate of each combination,
+  - lead_time quantiles separately for cancelled and kept bookings,
+  - the joint distribution of arrival year x month.
+
+fit_profile() learns a profile from a source file; default_profile() is a
+built-in one shaped like the public dataset. Profiles are plain JSON.
+Rows are sampled column-wise with NumPy (no per-row Python) and written in
+chunks to CSV or to a Feather (Arrow IPC) file, so memory stays bounded by
+the chunk size.
+
+Usage:
+    python src/synthetic.py --rows 1M --out data/synthetic_1M.csv
+    python src/synthetic.py --rows 10M --out data/synthetic_10M.feather --source data/hotel_bookings.csv
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from data_store import load_dataset
+from schema import MONTH_NAMES
+
+# Column order of hotel_bookings.csv
+COLUMNS = [
+    'hotel', 'is_canceled', 'lead_time', 'arrival_date_year', 'arrival_date_month',
+    'arrival_date_week_number', 'arrival_date_day_of_month', 'stays_in_weekend_nights',
+    'stays_in_week_nights', 'adults', 'children', 'babies', 'meal', 'country',
+    'market_segment', 'distribution_channel', 'is_repeated_guest', 'previous_cancellations',
+    'previous_bookings_not_canceled', 'reserved_room_type', 'assigned_room_type',
+    'booking_changes', 'deposit_type', 'agent', 'company', 'days_in_waiting_list',
+    'customer_type', 'adr', 'required_car_parking_spaces', 'total_of_special_requests',
+    'reservation_status', 'reservation_status_date'
+]
+JOINT_COLUMNS = ['hotel', 'market_segment', 'deposit_type']
+# Generated from the joint distributions or derived from other columns
+STRUCTURED_COLUMNS = JOINT_COLUMNS + [
+    'is_canceled', 'lead_time', 'arrival_date_year', 'arrival_date_month',
+    'arrival_date_week_number', 'reservation_status', 'reservation_status_date'
+]
+# Integer columns with at most this many distinct values keep exact frequencies
+MAX_DISCRETE_VALUES = 500
+N_QUANTILES = 201
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def _discrete(values, probs, missing=0.0):
+    probs = np.asarray(probs, dtype=np.float64)
+    return {'kind': 'discrete', 'values': list(values), 'probs': (probs / probs.sum()).tolist(),
+            'missing': missing}
+
+
+def _quantiles(q, decimals=None, missing=0.0):
+    return {'kind': 'quantiles', 'q': [float(v) for v in q], 'decimals': decimals,
+            'missing': missing}
+
+
+def _fit_column(series: pd.Series):
+    """Marginal of one column: frequencies or quantiles plus the missing rate"""
+    missing = float(series.isna().mean())
+    values = series.dropna()
+    if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object \
+            or pd.api.types.is_string_dtype(values.dtype):
+        counts = values.astype(str).value_counts()
+        return _discrete(counts.index.tolist(), counts.to_numpy(), missing)
+    numeric = values.to_numpy(dtype=np.float64)
+    integral = bool(np.all(numeric == np.round(numeric)))
+    if integral and values.nunique() <= MAX_DISCRETE_VALUES:
+        counts = pd.Series(numeric.astype(np.int64)).value_counts()
+        return _discrete(counts.index.tolist(), counts.to_numpy(), missing)
+    q = np.quantile(numeric, np.linspace(0, 1, N_QUANTILES))
+    return _quantiles(q, 0 if integral else 2, missing)
+
+
+def fit_profile(df: pd.DataFrame) -> dict:
+    """Learn a generation profile from booking rows"""
+    columns = {col: _fit_column(df[col]) for col in COLUMNS
+               if col in df.columns and col not in STRUCTURED_COLUMNS}
+
+    keys = df[JOINT_COLUMNS].astype(str)
+    canceled = df['is_canceled'].astype(np.float64)
+    grouped = canceled.groupby([keys[col] for col in JOINT_COLUMNS], observed=True)
+    joint = grouped.agg(['size', 'mean']).reset_index()
+
+    lead = df['lead_time'].to_numpy(dtype=np.float64)
+    grid = np.linspace(0, 1, N_QUANTILES)
+    lead_by_cancel = {str(flag): np.quantile(lead[canceled.to_numpy() == flag], grid).tolist()
+                      for flag in (0, 1) if (canceled == flag).any()}
+
+    arrivals = df.groupby([df['arrival_date_year'].astype(int),
+                           df['arrival_date_month'].astype(str)], observed=True).size()
+    return {
+        'source_rows': int(len(df)),
+        'columns': columns,
+        'joint': {'columns': JOINT_COLUMNS,
+                  'combos': joint[JOINT_COLUMNS].to_numpy().tolist(),
+                  'probs': (joint['size'] / joint['size'].sum()).tolist(),
+                  'cancel_rate': joint['mean'].tolist()},
+        'lead_time_by_cancel': lead_by_cancel,
+        'arrival': {'year_month': [[int(y), m] for y, m in arrivals.index],
+                    'probs': (arrivals / arrivals.sum()).tolist()},
+    }
+
+
+def default_profile() -> dict:
+    """Built-in profile with the shape of the public hotel_bookings.csv"""
+    columns = {
+        'stays_in_weekend_nights': _discrete([0, 1, 2, 3, 4, 5, 6], [43, 26, 28, 1, 1.5, 0.3, 0.2]),
+        'stays_in_week_nights': _discrete(range(11), [6, 25, 28, 19, 8, 9, 1.3, 1, 0.7, 0.2, 0.8]),
+        'adults': _discrete([1, 2, 3, 0, 4], [19.3, 75.1, 5.2, 0.3, 0.1]),
+        'children': _discrete([0, 1, 2, 3], [92.8, 4.1, 3.0, 0.1], missing=0.00003),
+        'babies': _discrete([0, 1, 2], [99.2, 0.78, 0.02]),
+        'meal': _discrete(['BB', 'HB', 'SC', 'Undefined', 'FB'], [77.3, 12.1, 8.9, 1.0, 0.7]),
+        'country': _discrete(['PRT', 'GBR', 'FRA', 'ESP', 'DEU', 'ITA', 'IRL', 'BEL', 'BRA', 'NLD',
+                              'USA', 'CHE', 'CN', 'AUT', 'SWE'],
+                             [48.6, 12.2, 10.4, 8.6, 7.3, 3.8, 2.8, 2.0, 1.9, 1.8,
+                              1.8, 1.4, 1.1, 1.1, 0.9], missing=0.004),
+        'distribution_channel': _discrete(['TA/TO', 'Direct', 'Corporate', 'GDS', 'Undefined'],
+                                          [82.0, 12.3, 5.6, 0.16, 0.004]),
+        'is_repeated_guest': _discrete([0, 1], [96.8, 3.2]),
+        'previous_cancellations': _discrete([0, 1, 2, 3, 11, 24], [94.6, 5.1, 0.1, 0.06, 0.03, 0.04]),
+        'previous_bookings_not_canceled': _discrete([0, 1, 2, 3, 4, 5], [97.0, 1.3, 0.5, 0.3, 0.2, 0.7]),
+        'reserved_room_type': _discrete(list('ADEFGBCHL'), [72.0, 16.1, 5.5, 2.4, 1.8, 0.9, 0.8, 0.5, 0.01]),
+        'assigned_room_type': _discrete(list('ADEFGCBHIK'), [62.0, 21.2, 6.5, 3.1, 2.1, 2.0, 1.8, 0.6, 0.3, 0.3]),
+        'booking_changes': _discrete([0, 1, 2, 3, 4, 5], [84.9, 10.6, 3.2, 0.8, 0.3, 0.2]),
+        'agent': _discrete([9, 240, 1, 14, 7, 6, 250, 241, 28, 8], [32.0, 14.0, 7.3, 3.6, 3.5, 3.3, 2.9, 1.8, 1.7, 1.5],
+                           missing=0.137),
+        'company': _discrete([40, 223, 67, 45, 153, 174], [14.4, 11.8, 4.1, 3.7, 3.0, 2.4], missing=0.943),
+        'days_in_waiting_list': _discrete([0, 39, 58, 44, 31, 35, 46, 69], [96.9, 0.2, 0.15, 0.12, 0.11, 0.08, 0.08, 0.07]),
+        'customer_type': _discrete(['Transient', 'Transient-Party', 'Contract', 'Group'], [75.1, 21.0, 3.4, 0.5]),
+        'adr': _quantiles(np.interp(np.linspace(0, 1, N_QUANTILES),
+                                    [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1],
+                                    [0, 0, 50, 69.3, 94.6, 126, 164, 252, 510]), decimals=2),
+        'required_car_parking_spaces': _discrete([0, 1, 2], [93.8, 6.2, 0.02]),
+        'total_of_special_requests': _discrete([0, 1, 2, 3, 4, 5], [58.9, 27.8, 10.9, 2.1, 0.3, 0.03]),
+    }
+    # hotel x market_segment x deposit_type: (share %, cancellation rate)
+    joint = [
+        ('City Hotel', 'Online TA', 'No Deposit', 31.5, 0.38),
+        ('City Hotel', 'Offline TA/TO', 'No Deposit', 7.5, 0.15),
+        ('City Hotel', 'Offline TA/TO', 'Non Refund', 5.9, 0.99),
+        ('City Hotel', 'Groups', 'No Deposit', 5.8, 0.31),
+        ('City Hotel', 'Groups', 'Non Refund', 4.0, 0.99),
+        ('City Hotel', 'Direct', 'No Deposit', 5.2, 0.16),
+        ('City Hotel', 'Corporate', 'No Deposit', 2.6, 0.20),
+        ('City Hotel', 'Online TA', 'Non Refund', 0.9, 0.99),
+        ('City Hotel', 'Aviation', 'No Deposit', 0.2, 0.22),
+        ('City Hotel', 'Complementary', 'No Deposit', 0.4, 0.13),
+        ('City Hotel', 'Groups', 'Refundable', 0.1, 0.20),
+        ('Resort Hotel', 'Online TA', 'No Deposit', 14.8, 0.35),
+        ('Resort Hotel', 'Offline TA/TO', 'No Deposit', 6.3, 0.12),
+        ('Resort Hotel', 'Groups', 'No Deposit', 4.3, 0.18),
+        ('Resort Hotel', 'Direct', 'No Deposit', 5.6, 0.14),
+        ('Resort Hotel', 'Corporate', 'No Deposit', 1.9, 0.11),
+        ('Resort Hotel', 'Groups', 'Non Refund', 1.2, 0.99),
+        ('Resort Hotel', 'Offline TA/TO', 'Non Refund', 0.4, 0.97),
+        ('Resort Hotel', 'Complementary', 'No Deposit', 0.2, 0.09),
+        ('Resort Hotel', 'Groups', 'Refundable', 0.1, 0.25),
+    ]
+    shares = np.array([row[3] for row in joint])
+    lead_grid = [0, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1]
+    grid = np.linspace(0, 1, N_QUANTILES)
+    months = [[2015, m] for m in MONTH_NAMES[6:]] + [[2016, m] for m in MONTH_NAMES] + \
+             [[2017, m] for m in MONTH_NAMES[:8]]
+    month_weight = {'January': 5, 'February': 6.8, 'March': 8.2, 'April': 9.3, 'May': 9.9,
+                    'June': 9.2, 'July': 10.6, 'August': 11.6, 'September': 8.8,
+                    'October': 9.3, 'November': 5.7, 'December': 5.6}
+    weights = np.array([month_weight[m] for _, m in months])
+    return {
+        'source_rows': 119390,
+        'columns': columns,
+        'joint': {'columns': JOINT_COLUMNS,
+                  'combos': [list(row[:3]) for row in joint],
+                  'probs': (shares / shares.sum()).tolist(),
+                  'cancel_rate': [row[4] for row in joint]},
+        'lead_time_by_cancel': {
+            '0': np.interp(grid, lead_grid, [0, 0, 2, 9, 45, 124, 205, 255, 370, 737]).tolist(),
+            '1': np.interp(grid, lead_grid, [0, 4, 14, 44, 113, 214, 315, 370, 470, 629]).tolist(),
+        },
+        'arrival': {'year_month': months, 'probs': (weights / weights.sum()).tolist()},
+    }
+
+
+def _sample_discrete(spec, n, rng):
+    values = np.asarray(spec['values'])
+    return values[rng.choice(len(values), n, p=spec['probs'])]
+
+
+def _sample_quantiles(q, n, rng, decimals=None):
+    """Inverse-CDF sampling from a quantile table with linear interpolation"""
+    q = np.asarray(q, dtype=np.float64)
+    values = np.interp(rng.random(n), np.linspace(0, 1, len(q)), q)
+    return np.round(values, decimals) if decimals is not None else values
+
+
+def _sample_column(spec, n, rng):
+    if spec['kind'] == 'discrete':
+        values = _sample_discrete(spec, n, rng)
+    else:
+        values = _sample_quantiles(spec['q'], n, rng, spec.get('decimals'))
+    if spec.get('missing'):
+        mask = rng.random(n) < spec['missing']
+        if mask.any():
+            values = values.astype(object if values.dtype.kind in 'OU' else np.float64)
+            values[mask] = None if values.dtype == object else np.nan
+    return values
+
+
+def generate(profile: dict, n: int, seed=0) -> pd.DataFrame:
+    """n booking rows sampled from profile"""
+    rng = np.random.default_rng(seed)
+    out = {}
+
+    joint = profile['joint']
+    combo_index = rng.choice(len(joint['combos']), n, p=joint['probs'])
+    combos = np.asarray(joint['combos'], dtype=object)
+    for j, col in enumerate(joint['columns']):
+        out[col] = combos[combo_index, j]
+    canceled = (rng.random(n) < np.asarray(joint['cancel_rate'])[combo_index]).astype(np.int8)
+    out['is_canceled'] = canceled
+
+    lead = np.empty(n, dtype=np.int64)
+    for flag in (0, 1):
+        rows = canceled == flag
+        q = profile['lead_time_by_cancel'].get(str(flag)) or next(iter(profile['lead_time_by_cancel'].values()))
+        lead[rows] = _sample_quantiles(q, int(rows.sum()), rng, 0)
+    out['lead_time'] = lead
+
+    arrival = profile['arrival']
+    ym_index = rng.choice(len(arrival['year_month']), n, p=arrival['probs'])
+    years = np.array([y for y, _ in arrival['year_month']])[ym_index]
+    month_num = np.array([MONTH_NAMES.index(m) + 1 for _, m in arrival['year_month']])[ym_index]
+    first = (years - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month_num - 1)
+    days_in_month = ((first + 1).astype('datetime64[D]') - first.astype('datetime64[D]')).astype(np.int64)
+    day = (rng.random(n) * days_in_month).astype(np.int64) + 1
+    dates = pd.DatetimeIndex(first.astype('datetime64[D]') + day.astype('timedelta64[D]') - 1)
+    out['arrival_date_year'] = years
+    out['arrival_date_month'] = np.asarray(MONTH_NAMES, dtype=object)[month_num - 1]
+    out['arrival_date_week_number'] = dates.isocalendar().week.to_numpy(dtype=np.int64)
+    out['arrival_date_day_of_month'] = day
+
+    for col, spec in profile['columns'].items():
+        out[col] = _sample_column(spec, n, rng)
+
+    nights = np.zeros(n, dtype=np.int64)
+    for col in ('stays_in_weekend_nights', 'stays_in_week_nights'):
+        if col in out:
+            nights += np.asarray(out[col], dtype=np.int64)
+    no_show = canceled.astype(bool) & (rng.random(n) < 0.03)
+    out['reservation_status'] = np.where(canceled == 0, 'Check-Out',
+                                         np.where(no_show, 'No-Show', 'Canceled'))
+    before_arrival = (rng.random(n) * (lead + 1)).astype(np.int64)
+    status_date = np.where(canceled == 0, dates + pd.to_timedelta(nights, unit='D'),
+                           np.where(no_show, dates, dates - pd.to_timedelta(before_arrival, unit='D')))
+    out['reservation_status_date'] = pd.DatetimeIndex(status_date).strftime('%Y-%m-%d')
+
+    return pd.DataFrame({col: out[col] for col in COLUMNS if col in out})
+
+
+def generate_chunks(profile: dict, n: int, chunksize=DEFAULT_CHUNKSIZE, seed=0):
+    """Yield n rows as DataFrames of at most chunksize rows
+
+    Each chunk has its own seed derived from seed and the chunk offset, so the
+    output is reproducible for a fixed (seed, chunksize); a different chunk
+    size gives different rows. n=0 yields one empty chunk, so writers still
+    get the columns.
+    """
+    for start in range(0, max(n, 1), chunksize):
+        yield generate(profile, min(chunksize, n - start), seed=(seed, start))
+
+
+def _categories(profile):
+    """Fixed category lists, so every Feather chunk shares one dictionary"""
+    cats = {col: sorted(map(str, spec['values'])) for col, spec in profile['columns'].items()
+            if spec['kind'] == 'discrete' and isinstance(spec['values'][0], str)}
+    for j, col in enumerate(profile['joint']['columns']):
+        cats[col] = sorted({combo[j] for combo in profile['joint']['combos']})
+    cats['arrival_date_month'] = list(MONTH_NAMES)
+    cats['reservation_status'] = ['Canceled', 'Check-Out', 'No-Show']
+    return cats
+
+
+def write(profile: dict, n: int, path, chunksize=DEFAULT_CHUNKSIZE, seed=0, fmt=None):
+    """Write n generated rows to path (.csv, or .feather/.arrow) chunk by chunk"""
+    fmt = fmt or ('csv' if path.endswith('.csv') else 'feather')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + '.tmp'
+    if fmt == 'csv':
+        for i, chunk in enumerate(generate_chunks(profile, n, chunksize, seed)):
+            chunk.to_csv(tmp, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    else:
+        cats = _categories(profile)
+        writer = None
+        for chunk in generate_chunks(profile, n, chunksize, seed):
+            for col, categories in cats.items():
+                chunk[col] = pd.Categorical(chunk[col], categories=categories)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(tmp, table.schema)
+            writer.write_table(table)
+        writer.close()
+    os.replace(tmp, path)
+    return path
+
+
+def load_profile(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_profile(profile, path):
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+
+def parse_rows(text):
+    """'10k' -> 10000, '1M' -> 1000000"""
+    text = str(text).strip()
+    scale = {'k': 10**3, 'K': 10**3, 'm': 10**6, 'M': 10**6}.get(text[-1])
+    return int(float(text[:-1]) * scale) if scale else int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic hotel bookings")
+    parser.add_argument('--rows', default='100k', help="Number of rows (e.g. 50000, 1M)")
+    parser.add_argument('--out', required=True, help="Output .csv or .feather file")
+    parser.add_argument('--source', help="Fit the profile from this bookings CSV")
+    parser.add_argument('--profile', help="Use a saved profile (JSON)")
+    parser.add_argument('--save-profile', help="Write the profile used to this JSON file")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile = load_profile(args.profile)
+    elif args.source:
+        profile = fit_profile(load_dataset(args.source, typed=True))
+    else:
+        profile = default_profile()
+    if args.save_profile:
+        save_profile(profile, args.save_profile)
+
+    rows = parse_rows(args.rows)
+    start = time.perf_counter()
+    write(profile, rows, args.out, args.chunksize, args.seed)
+    seconds = time.perf_counter() - start
+    print(f"✓ Wrote {rows:,} rows to {args.out} in {seconds:.1f} s ({rows / seconds:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Hotel Booking Demand - Hyperparameter Tuning
+
+Successive-halving search over the model hyperparameters with stratified
+k-fold cross-validation, used by 03_model_training.py --tune.
+
+Every candidate is first scored on a small stratified subsample of the
+training set. Only the best 1/factor of them move on to the next rung, which
+uses factor times more rows, until the survivors are scored on the full
+training set. All (candidate, fold) fits of a rung run in parallel in a
+process pool. Workers memory-map the feature matrices from data/features/,
+so only row counts and parameters are sent between processes.
+
+Each finished fold is appended to artifacts/tuning_results.jsonl together
+with an id of the search configuration and training data. An interrupted
+search picks up where it stopped, and results from a different
+configuration or dataset are ignored.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold, train_test_split
+from threadpoolctl import threadpool_limits
+from hashing import file_hash
+from feature_store import FEATURE_DIR, load_matrices
+from scoring import DEFAULT_THRESHOLD, predict_with_threshold
+
+RESULTS_PATH = os.path.join('artifacts', 'tuning_results.jsonl')
+
+# model name: (estimator class, fixed parameters, searched grid)
+SEARCH_SPACES = {
+    'Logistic Regression': (
+        LogisticRegression,
+        {'max_iter': 1000, 'random_state': 42},
+        {'C': [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+         'class_weight': ['balanced', None]},
+    ),
+    'Random Forest': (
+        RandomForestClassifier,
+        {'random_state': 42, 'class_weight': 'balanced'},
+        {'n_estimators': [100, 200, 400],
+         'max_depth': [10, 15, 20, 30, None],
+         'min_samples_split': [2, 10, 20],
+         'min_samples_leaf': [1, 2, 5, 10],
+         'max_features': ['sqrt', 0.3, 0.5]},
+    ),
+}
+
+# 03_model_training.py has no __main__ guard, so workers are forked rather
+# than spawned (spawn would re-run the script in every worker)
+_MP_CONTEXT = (multiprocessing.get_context('fork')
+               if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+# Matrices opened once per worker process by _init_worker
+_worker_data = None
+
+
+def make_estimator(model_name, params, n_jobs=None):
+    """Estimator with the fixed parameters of model_name plus params"""
+    estimator_class, fixed, _ = SEARCH_SPACES[model_name]
+    kwargs = {**fixed, **params}
+    if n_jobs is not None and 'n_jobs' in estimator_class().get_params():
+        kwargs['n_jobs'] = n_jobs
+    return estimator_class(**kwargs)
+
+
+def sample_candidates(model_name, n_candidates, seed=42):
+    """The whole grid if it is small enough, otherwise a random sample of it"""
+    grid = SEARCH_SPACES[model_name][2]
+    if len(ParameterGrid(grid)) <= n_candidates:
+        return list(ParameterGrid(grid))
+    return list(ParameterSampler(grid, n_candidates, random_state=seed))
+
+
+def halving_schedule(n_candidates, n_samples, factor=3, min_resources=2000):
+    """Training rows used at each rung; the last rung uses all rows"""
+    n_rungs = 1 + int(np.ceil(np.log(max(n_candidates, 1)) / np.log(factor)))
+    sizes = [int(n_samples / factor ** (n_rungs - 1 - i)) for i in range(n_rungs)]
+    return sorted({min(max(size, min_resources), n_samples) for size in sizes})
+
+
+def params_key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def search_id(model_name, config, in_dir=FEATURE_DIR):
+    """Identifies one search: model, space, settings and the training data"""
+    payload = {
+        'model': model_name,
+        'space': params_key(SEARCH_SPACES[model_name][1:]),
+        'config': config,
+        'X_train': file_hash(os.path.join(in_dir, 'X_train.npy')),
+        'y_train': file_hash(os.path.join(in_dir, 'y_train.npy')),
+    }
+    text = json.dumps(payload, sort_keys=True)
+    return hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+
+
+class ResultLog:
+    """Append-only JSON-lines log of finished folds for one search"""
+
+    def __init__(self, path, search):
+        self.path = path
+        self.search = search
+        self.done = {}
+        # An interrupted write leaves a partial last line; appends start a new one
+        self._partial_line = False
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    self._partial_line = not line.endswith('\n')
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # partial line from an interrupted write
+                    if record.get('search') == search:
+                        self.done[self._key(record)] = record
+
+    @staticmethod
+    def _key(record):
+        return record['params_key'], record['n_samples'], record['fold']
+
+    def get(self, key, n_samples, fold):
+        return self.done.get((key, n_samples, fold))
+
+    def append(self, record):
+        record = {'search': self.search, **record}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(('\n' if self._partial_line else '') + json.dumps(record) + '\n')
+        self._partial_line = False
+        self.done[self._key(record)] = record
+
+
+def _init_worker(in_dir):
+    """Memory-map the matrices once per worker and keep it single-threaded"""
+    global _worker_data
+    threadpool_limits(1)
+    _worker_data = load_matrices(in_dir)
+
+
+@lru_cache(maxsize=8)
+def _folds(n_samples, n_splits, seed):
+    """Stratified subsample of n_samples training rows and its k folds"""
+    y = np.asarray(_worker_data['y_train'])
+    rows = np.arange(len(y))
+    if n_samples < len(y):
+        rows, _ = train_test_split(rows, train_size=n_samples, stratify=y, random_state=seed)
+        rows.sort()
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return [(rows[train], rows[val]) for train, val in splitter.split(rows, y[rows])]
+
+
+def _fit_fold(model_name, params, n_samples, fold, n_splits, seed):
+    """Fit one candidate on one fold; returns (validation F1, fit seconds)"""
+    train, val = _folds(n_samples, n_splits, seed)[fold]
+    X, y = _worker_data['X_train'], _worker_data['y_train']
+    model = make_estimator(model_name, params, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    seconds = time.perf_counter() - start
+    pred, _ = predict_with_threshold(model, X[val], DEFAULT_THRESHOLD)
+    return float(f1_score(y[val], pred)), seconds
+
+
+def tune(model_name, in_dir=FEATURE_DIR, results_path=RESULTS_PATH, n_candidates=27,
+         n_splits=5, factor=3, min_resources=2000, workers=0, seed=42, verbose=True):
+    """Successive-halving search for model_name; returns the best candidate
+
+    Returns a dict with best_params, best_score (mean CV F1 on the final
+    rung) and rungs, a list of {n_samples, candidates, best_score}.
+    """
+    n_train = len(load_matrices(in_dir)['y_train'])
+    candidates = sample_candidates(model_name, n_candidates, seed)
+    schedule = halving_schedule(len(candidates), n_train, factor, min_resources)
+    config = {'candidates': [params_key(p) for p in candidates], 'schedule': schedule,
+              'n_splits': n_splits, 'factor': factor, 'seed': seed}
+    log = ResultLog(results_path, search_id(model_name, config, in_dir))
+    workers = workers or os.cpu_count()
+
+    rungs = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT,
+                             initializer=_init_worker, initargs=(in_dir,)) as pool:
+        rung = 0
+        while True:
+            n_samples = schedule[rung]
+            scores = {params_key(p): [None] * n_splits for p in candidates}
+            futures = {}
+            for params in candidates:
+                key = params_key(params)
+                for fold in range(n_splits):
+                    record = log.get(key, n_samples, fold)
+                    if record is not None:
+                        scores[key][fold] = record['score']
+                        continue
+                    future = pool.submit(_fit_fold, model_name, params, n_samples,
+                                         fold, n_splits, seed)
+                    futures[future] = (key, fold)
+            resumed = len(candidates) * n_splits - len(futures)
+
+            for future in as_completed(futures):
+                key, fold = futures[future]
+                score, seconds = future.result()
+                scores[key][fold] = score
+                log.append({'model': model_name, 'params_key': key, 'n_samples': n_samples,
+                            'fold': fold, 'score': score, 'fit_seconds': round(seconds, 4)})
+
+            mean_scores = {key: float(np.mean(values)) for key, values in scores.items()}
+            ranked = sorted(candidates, key=lambda p: mean_scores[params_key(p)], reverse=True)
+            best_score = mean_scores[params_key(ranked[0])]
+            rungs.append({'n_samples': n_samples, 'candidates': len(candidates),
+                          'best_score': best_score})
+            if verbose:
+                print(f"  - {n_samples:>7} rows x {len(candidates):>3} candidates: "
+                      f"best CV F1 {best_score:.4f} ({resumed} folds resumed)")
+            if rung == len(schedule) - 1:
+                break
+            candidates = ranked[:max(1, int(np.ceil(len(candidates) / factor)))]
+            # A single survivor goes straight to the full training set
+            rung = len(schedule) - 1 if len(candidates) == 1 else rung + 1
+
+    return {'best_params': ranked[0], 'best_score': best_score, 'rungs': rungs}
@@ -0,0 +1,74 @@
+"""
+Shared test fixtures
+
+The src/ modules import each other by name (the scripts run from the
+project root as python src/X.py), so src/ is put on sys.path here.
+"""
+
+import json
+import os
+import sys
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import synthetic  # noqa: E402
+from preprocessing import BookingPreprocessor  # noqa: E402
+from schema import apply_schema  # noqa: E402
+from scoring import save_artifact  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def bookings():
+    """2,000 typed synthetic bookings (copy before modifying)"""
+    return apply_schema(synthetic.generate(synthetic.default_profile(), 2000, seed=0))
+
+
+@pytest.fixture(scope='session')
+def pipeline(bookings):
+    """Preprocessor + logistic regression fitted on the bookings"""
+    preprocessor = BookingPreprocessor().fit(bookings)
+    model = LogisticRegression(max_iter=1000).fit(preprocessor.transform(bookings), bookings['is_canceled'])
+    return Pipeline([('preprocessor', preprocessor), ('model', model)])
+
+
+@pytest.fixture(scope='session')
+def model_path(pipeline, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('artifacts') / 'best_model.joblib')
+    save_artifact(pipeline, path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def bookings_csv(bookings, tmp_path_factory):
+    """The bookings as a raw CSV, with a booking_id column numbering the rows"""
+    path = tmp_path_factory.mktemp('data') / 'bookings.csv'
+    bookings.assign(booking_id=range(len(bookings))).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def booking_dicts(bookings):
+    """The first 20 bookings as JSON objects, as the scoring services receive them"""
+    return json.loads(bookings.head(20).to_json(orient='records'))
+
+
+class PoisonedPipeline:
+    """Wraps a pipeline; predict_proba fails for any batch holding a poisoned booking"""
+
+    POISON_LEAD_TIME = 4321
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    def predict_proba(self, rows):
+        if (rows['lead_time'] == self.POISON_LEAD_TIME).any():
+            raise RuntimeError("poisoned booking")
+        return self.pipeline.predict_proba(rows)
+
+
+@pytest.fixture(scope='session')
+def poisoned_pipeline(pipeline):
+    return PoisonedPipeline(pipeline)
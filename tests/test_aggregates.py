@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import pytest
+from aggregates import Aggregates, aggregates_path, load_aggregates
+
+
+@pytest.fixture(scope='module')
+def frame(bookings):
+    df = bookings.copy()
+    df.loc[df.index[::50], 'children'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('col', ['lead_time', 'adr', 'children', 'total_nights'])
+def test_stats_match_pandas(frame, col):
+    aggregates = Aggregates.from_frame(frame)
+    if col == 'total_nights':
+        values = frame['stays_in_weekend_nights'] + frame['stays_in_week_nights']
+    else:
+        values = frame[col].dropna()
+    stats = aggregates.stats(col)
+    assert stats['count'] == len(values)
+    assert stats['sum'] == pytest.approx(float(values.astype(np.float64).sum()))
+    assert stats['mean'] == pytest.approx(float(values.astype(np.float64).mean()))
+    assert stats['median'] == pytest.approx(float(values.median()))
+    assert stats['min'] == values.min()
+    assert stats['max'] == values.max()
+
+
+def test_stats_with_mask_match_pandas(frame):
+    stats = Aggregates.from_frame(frame).stats('lead_time', mask_fn=lambda v: v > 100)
+    values = frame['lead_time'][frame['lead_time'] > 100]
+    assert stats['count'] == len(values)
+    assert stats['median'] == pytest.approx(float(values.median()))
+
+
+def test_corr_with_target_matches_pandas(frame):
+    columns = ['lead_time', 'adr', 'children', 'booking_changes', 'total_of_special_requests']
+    corr = Aggregates.from_frame(frame).corr_with_target(columns)
+    for col in columns:
+        expected = frame[col].astype(np.float64).corr(frame['is_canceled'].astype(np.float64))
+        assert corr[col] == pytest.approx(expected, abs=1e-9)
+
+
+def test_counts_and_rates_match_pandas(frame):
+    aggregates = Aggregates.from_frame(frame)
+    counts = frame['hotel'].value_counts()
+    assert aggregates.value_counts('hotel').to_dict() == counts.to_dict()
+    rates = frame.groupby('hotel', observed=True)['is_canceled'].mean()
+    for hotel, rate in aggregates.cancel_rate('hotel').items():
+        assert rate == pytest.approx(rates[hotel])
+    assert aggregates.missing['children'] == int(frame['children'].isna().sum())
+
+
+def test_cached_aggregates_are_rebuilt_when_the_data_changes(bookings, tmp_path):
+    csv_path = str(tmp_path / 'bookings.csv')
+    bookings.to_csv(csv_path, index=False)
+    first = load_aggregates(csv_path)
+    assert first.n_rows == len(bookings)
+    saved_at = os.stat(aggregates_path(csv_path)).st_mtime_ns
+
+    assert load_aggregates(csv_path).source_hash == first.source_hash
+    assert os.stat(aggregates_path(csv_path)).st_mtime_ns == saved_at
+
+    bookings.head(500).to_csv(csv_path, index=False)
+    rebuilt = load_aggregates(csv_path)
+    assert rebuilt.n_rows == 500
+    assert rebuilt.value_counts('hotel').sum() == 500
+    assert rebuilt.source_hash != first.source_hash
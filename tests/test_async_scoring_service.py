@@ -0,0 +1,113 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import pytest
+from async_scoring_service import AsyncScorer, AsyncScoringServer
+
+
+@pytest.fixture
+def server(poisoned_pipeline):
+    """(AsyncScoringServer, address) running on an event loop in a background thread"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        scorer = AsyncScorer(poisoned_pipeline, max_batch_size=64, executor_workers=1)
+        scorer.start()
+        app = AsyncScoringServer(scorer, max_body_bytes=65536)
+        return app, await asyncio.start_server(app.handle, '127.0.0.1', 0)
+
+    async def stop():
+        server.close()
+        await server.wait_closed()
+        for task in app.scorer._tasks:
+            task.cancel()
+
+    app, server = asyncio.run_coroutine_threadsafe(start(), loop).result(10)
+    yield app, server.sockets[0].getsockname()[:2]
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    app.scorer.executor.shutdown()
+
+
+def exchange(address, data):
+    """Send raw bytes; return (status, JSON body) of the response"""
+    with socket.create_connection(address, timeout=10) as sock:
+        sock.sendall(data)
+        response = b''
+        while b'\r\n\r\n' not in response:
+            response += sock.recv(65536)
+        head, _, body = response.partition(b'\r\n\r\n')
+        length = int(head.lower().split(b'content-length:')[1].split(b'\r\n')[0])
+        while len(body) < length:
+            body += sock.recv(65536)
+    return int(head.split()[1]), json.loads(body)
+
+
+def post(address, path, payload):
+    body = json.dumps(payload).encode()
+    return exchange(address, f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+
+
+def test_predictions_match_the_pipeline(server, pipeline, bookings, booking_dicts):
+    _, address = server
+    status, body = post(address, '/predict/batch', {'bookings': booking_dicts})
+    assert status == 200
+    probs = [p['cancellation_probability'] for p in body['predictions']]
+    assert probs == pytest.approx(list(pipeline.predict_proba(bookings.head(20))[:, 1]), abs=1e-6)
+    status, body = post(address, '/predict', booking_dicts[0])
+    assert (status, body['cancellation_probability']) == (200, pytest.approx(probs[0], abs=1e-6))
+
+
+def test_failing_request_fails_alone_in_its_batch(poisoned_pipeline, booking_dicts):
+    poisoned = dict(booking_dicts[0], lead_time=poisoned_pipeline.POISON_LEAD_TIME)
+
+    async def run():
+        scorer = AsyncScorer(poisoned_pipeline, max_batch_size=64, executor_workers=1)
+        # Queued before the batching task starts, so all nine share one batch
+        tasks = [asyncio.ensure_future(scorer.score([booking]))
+                 for booking in booking_dicts[:8] + [poisoned]]
+        await asyncio.sleep(0)
+        scorer.start()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, list) for result in results[:8])
+    assert isinstance(results[8], RuntimeError)
+
+
+def test_invalid_booking_gets_400(server, booking_dicts):
+    _, address = server
+    status, body = post(address, '/predict', dict(booking_dicts[0], babies=0.5))
+    assert status == 400 and 'babies' in body['error']
+    assert post(address, '/predict', [1])[0] == 400
+
+
+@pytest.mark.parametrize('request_bytes, status', [
+    (b'GARBAGE\r\n\r\n', 400),
+    (b'POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n', 400),
+    (b'POST /predict HTTP/1.1\r\nContent-Length: 999999\r\n\r\n', 413),
+    (b'POST /predict HTTP/1.1\r\nX-Long: ' + b'a' * 100_000 + b'\r\n\r\n', 400),
+    (b'POST /predict HTTP/1.1\r\nContent-Length: 9\r\n\r\n{not json', 400),
+])
+def test_malformed_requests_get_an_error_status(server, request_bytes, status):
+    _, address = server
+    assert exchange(address, request_bytes)[0] == status
+
+
+def test_latency_percentiles_count_only_successful_requests(server, booking_dicts):
+    app, address = server
+    post(address, '/predict', booking_dicts[0])
+    post(address, '/predict', {'lead_time': 5})
+    exchange(address, b'GARBAGE\r\n\r\n')
+    # Requests are recorded just after their response is written
+    deadline = time.monotonic() + 5
+    while app.latency.count + app.latency.errors < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    summary = app.latency.summary()
+    assert (summary['count'], summary['errors']) == (1, 2)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from batch_scoring import score_file
+
+
+def test_output_rows_follow_input_order(pipeline, bookings, model_path, bookings_csv, tmp_path):
+    out_path = tmp_path / 'predictions.csv'
+    stats = score_file(bookings_csv, out_path, model_path, chunksize=300,
+                       keep_columns=['booking_id'], verbose=False)
+    out = pd.read_csv(out_path)
+    assert stats['rows'] == len(bookings)
+    assert out['booking_id'].tolist() == list(range(len(bookings)))
+    expected = pipeline.predict_proba(bookings)[:, 1]
+    np.testing.assert_allclose(out['cancellation_probability'], expected, atol=1e-6)
+    assert out['cancellation_prediction'].tolist() == (expected > 0.5).astype(int).tolist()
+
+
+def test_chunk_size_does_not_change_the_output(model_path, bookings_csv, tmp_path):
+    outputs = []
+    for chunksize in (97, 5000):
+        out_path = tmp_path / f'predictions_{chunksize}.csv'
+        score_file(bookings_csv, out_path, model_path, chunksize=chunksize,
+                   keep_columns=['booking_id'], verbose=False)
+        outputs.append(out_path.read_bytes())
+    assert outputs[0] == outputs[1]
+
+
+def test_input_without_rows_writes_a_header(model_path, bookings_csv, tmp_path):
+    in_path = tmp_path / 'empty.csv'
+    with open(bookings_csv) as f:
+        in_path.write_text(f.readline())
+    out_path = tmp_path / 'predictions.csv'
+    stats = score_file(in_path, out_path, model_path, keep_columns=['booking_id'], verbose=False)
+    assert stats['rows'] == 0
+    assert out_path.read_text().splitlines() == [
+        'booking_id,cancellation_prediction,cancellation_probability,risk_level']
+
+
+def test_worker_pool_matches_single_process(model_path, bookings_csv, tmp_path):
+    outputs = []
+    for workers in (1, 3):
+        out_path = tmp_path / f'predictions_{workers}.csv'
+        stats = score_file(bookings_csv, out_path, model_path, chunksize=450,
+                           keep_columns=['booking_id'], workers=workers, verbose=False)
+        outputs.append(out_path.read_bytes())
+    assert stats['rows'] == 2000
+    assert outputs[0] == outputs[1]
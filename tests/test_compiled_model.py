@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from compiled_model import CompiledModel
+from model_export import TOLERANCE, check_rows, export
+from prediction_cache import CachedPipeline, PredictionCache
+from preprocessing import BookingPreprocessor
+from scoring import compiled_is_current, save_artifact, save_best_model
+
+
+def _pipeline(name, bookings):
+    preprocessor = BookingPreprocessor().fit(bookings)
+    y = bookings['is_canceled'].to_numpy()
+    if name == 'hgb':
+        model = HistGradientBoostingClassifier(max_iter=20, categorical_features=preprocessor.categorical_mask(),
+                                               random_state=0)
+        preprocessor = preprocessor.with_categorical_codes()
+    elif name == 'rf':
+        model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0)
+    else:
+        model = LogisticRegression(max_iter=1000)
+    model.fit(preprocessor.transform(bookings), y)
+    return Pipeline([('preprocessor', preprocessor), ('model', model)])
+
+
+@pytest.mark.parametrize('name', ['lr', 'rf', 'hgb'])
+def test_compiled_model_matches_pipeline(name, bookings, tmp_path):
+    pipeline = _pipeline(name, bookings)
+    path = str(tmp_path / 'model.npz')
+    export(pipeline, path, rows=check_rows(300, seed=0))
+    compiled = CompiledModel.load(path)
+    rows = check_rows(500, seed=1)
+    np.testing.assert_allclose(compiled.predict_proba(rows), pipeline.predict_proba(rows), atol=TOLERANCE)
+
+
+def test_compiled_model_scores_booking_dicts(bookings, tmp_path):
+    pipeline = _pipeline('lr', bookings)
+    path = str(tmp_path / 'model.npz')
+    export(pipeline, path, rows=check_rows(300, seed=0))
+    compiled = CompiledModel.load(path)
+    rows = bookings.head(20)
+    records = rows.astype(object).where(rows.notna(), None).to_dict('records')
+    np.testing.assert_allclose(compiled.predict_proba(records), compiled.predict_proba(rows), atol=1e-12)
+
+
+def test_compiled_copy_goes_stale_with_its_source(bookings, tmp_path):
+    pipeline = _pipeline('lr', bookings)
+    model_path, compiled_path = str(tmp_path / 'best_model.joblib'), str(tmp_path / 'best_model.npz')
+    save_best_model(pipeline, model_path)
+    export(pipeline, compiled_path, rows=check_rows(300, seed=0), source_path=model_path)
+    assert compiled_is_current(compiled_path, model_path)
+
+    forest = _pipeline('rf', bookings)
+    save_artifact(forest, model_path)
+    assert not compiled_is_current(compiled_path, model_path)
+
+    save_best_model(forest, model_path)
+    assert not (tmp_path / 'best_model.npz').exists()
+    assert not compiled_is_current(compiled_path, model_path)
+
+
+def test_cached_compiled_model_falls_back_to_the_retrained_joblib(bookings, tmp_path):
+    model_path, compiled_path = str(tmp_path / 'best_model.joblib'), str(tmp_path / 'best_model.npz')
+    linear = _pipeline('lr', bookings)
+    save_best_model(linear, model_path)
+    export(linear, compiled_path, rows=check_rows(300, seed=0), source_path=model_path)
+    scorer = CachedPipeline.from_path(compiled_path, PredictionCache(), check_interval=0.0)
+    rows = check_rows(200, seed=2)
+    np.testing.assert_allclose(scorer.predict_proba(rows), linear.predict_proba(rows), atol=TOLERANCE)
+
+    forest = _pipeline('rf', bookings)
+    save_best_model(forest, model_path)
+    np.testing.assert_allclose(scorer.predict_proba(rows), forest.predict_proba(rows), atol=1e-12)
+    assert scorer.path == model_path
+    assert scorer.cache.metrics()['hits'] == 0
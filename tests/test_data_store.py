@@ -0,0 +1,81 @@
+import json
+import os
+import pytest
+import data_store
+from data_store import cache_is_fresh, cache_paths, dataset_hash, load_dataset, save_dataset
+
+
+@pytest.fixture
+def csv_path(bookings, tmp_path):
+    path = str(tmp_path / 'bookings.csv')
+    bookings.head(200).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Paths passed to data_store.build_cache"""
+    calls = []
+    build_cache = data_store.build_cache
+
+    def counting_build_cache(csv_path, typed=False):
+        calls.append(csv_path)
+        build_cache(csv_path, typed)
+
+    monkeypatch.setattr(data_store, 'build_cache', counting_build_cache)
+    return calls
+
+
+def test_cache_is_built_once_and_reused(csv_path, builds):
+    first = load_dataset(csv_path)
+    second = load_dataset(csv_path, columns=['hotel', 'lead_time'])
+    assert len(builds) == 1
+    assert list(second.columns) == ['hotel', 'lead_time']
+    assert second['lead_time'].tolist() == first['lead_time'].tolist()
+
+
+def test_changed_contents_rebuild_the_cache(csv_path, bookings, builds):
+    load_dataset(csv_path)
+    bookings.iloc[200:250].to_csv(csv_path, index=False)
+    df = load_dataset(csv_path)
+    assert len(builds) == 2
+    assert df['lead_time'].tolist() == bookings['lead_time'].iloc[200:250].tolist()
+
+
+def test_new_mtime_with_same_contents_keeps_the_cache(csv_path, builds):
+    digest = dataset_hash(csv_path)
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    # Same size, new mtime: the contents are hashed, found unchanged, and the
+    # recorded mtime is refreshed
+    assert cache_is_fresh(csv_path)
+    with open(cache_paths(csv_path)[1]) as f:
+        assert json.load(f)['mtime_ns'] == stat.st_mtime_ns + 10**9
+    assert dataset_hash(csv_path) == digest
+    assert len(builds) == 1
+
+
+def test_typed_and_untyped_caches_are_told_apart(csv_path, builds):
+    untyped = load_dataset(csv_path)
+    typed = load_dataset(csv_path, typed=True)
+    assert len(builds) == 2
+    assert untyped['lead_time'].dtype == 'int64'
+    assert typed['lead_time'].dtype == 'int16'
+    assert load_dataset(csv_path, typed=True)['lead_time'].dtype == 'int16'
+    assert len(builds) == 2
+
+
+def test_corrupt_meta_rebuilds(csv_path, builds):
+    load_dataset(csv_path)
+    with open(cache_paths(csv_path)[1], 'w') as f:
+        f.write('{not json')
+    load_dataset(csv_path)
+    assert len(builds) == 2
+
+
+def test_save_dataset_primes_the_cache(bookings, tmp_path, builds):
+    path = str(tmp_path / 'explored.csv')
+    save_dataset(bookings.head(50), path, typed=True)
+    assert cache_is_fresh(path, typed=True)
+    assert len(load_dataset(path, typed=True)) == 50
+    assert builds == []
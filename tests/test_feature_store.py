@@ -0,0 +1,24 @@
+import numpy as np
+from feature_store import FEATURE_DTYPE, finish_matrices, load_matrices, open_matrices, save_matrices
+
+
+def test_matrices_filled_chunk_by_chunk_match_save_matrices(tmp_path):
+    rng = np.random.default_rng(0)
+    X_train, X_test = rng.normal(size=(50, 4)), rng.normal(size=(20, 4))
+    y_train, y_test = rng.integers(0, 2, 50), rng.integers(0, 2, 20)
+    names = ['a', 'b', 'c', 'd']
+    save_matrices(X_train, X_test, y_train, y_test, names, np.arange(50), np.arange(50, 70),
+                  out_dir=str(tmp_path / 'whole'))
+
+    matrices = open_matrices(50, 20, 4, str(tmp_path / 'chunked'))
+    for lo in range(0, 50, 15):
+        matrices['X_train'][lo:lo + 15] = X_train[lo:lo + 15]
+    matrices['X_test'][:] = X_test
+    finish_matrices(matrices, y_train, y_test, names, np.arange(50), np.arange(50, 70),
+                    out_dir=str(tmp_path / 'chunked'))
+
+    whole, chunked = load_matrices(str(tmp_path / 'whole')), load_matrices(str(tmp_path / 'chunked'))
+    assert chunked['metadata'] == whole['metadata']
+    assert chunked['X_train'].dtype == FEATURE_DTYPE
+    for name in ('X_train', 'X_test', 'y_train', 'y_test', 'train_index', 'test_index'):
+        np.testing.assert_array_equal(chunked[name], whole[name])
@@ -0,0 +1,90 @@
+import joblib
+import numpy as np
+import pandas as pd
+import incremental_refresh
+import streaming
+from features import required_columns
+from incremental_refresh import TARGET, _anchor, baseline_state, log_end, read_new_rows, split_holdout
+from preprocessing import BookingPreprocessor
+
+COLUMNS = required_columns() + [TARGET]
+
+
+def _write_log(path, df):
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_read_new_rows_returns_only_appended_rows(bookings, tmp_path):
+    path = _write_log(tmp_path / 'log.csv', bookings.iloc[:100])
+    offset = log_end(path)
+    bookings.iloc[100:130].to_csv(path, mode='a', header=False, index=False)
+
+    df, end = read_new_rows(path, offset, COLUMNS)
+    assert len(df) == 30
+    assert end == path.stat().st_size
+    assert df['lead_time'].tolist() == bookings['lead_time'].iloc[100:130].tolist()
+    assert df['lead_time'].dtype == bookings['lead_time'].dtype
+    assert isinstance(df['hotel'].dtype, pd.CategoricalDtype)
+
+
+def test_partial_last_line_is_left_for_the_next_run(bookings, tmp_path):
+    path = _write_log(tmp_path / 'log.csv', bookings.iloc[:10])
+    offset = log_end(path)
+    bookings.iloc[10:12].to_csv(path, mode='a', header=False, index=False)
+    complete = path.stat().st_size
+    with open(path, 'a') as f:
+        f.write('City Hotel,0,12')
+
+    assert log_end(path) == complete
+    df, end = read_new_rows(path, offset, COLUMNS)
+    assert (len(df), end) == (2, complete)
+
+
+def test_nothing_appended_reads_no_rows(bookings, tmp_path):
+    path = _write_log(tmp_path / 'log.csv', bookings.iloc[:10])
+    df, end = read_new_rows(path, log_end(path), COLUMNS)
+    assert df.empty
+    assert end == log_end(path)
+
+
+def test_anchor_detects_rewritten_history(bookings, tmp_path):
+    path = _write_log(tmp_path / 'log.csv', bookings.iloc[:20])
+    state = baseline_state(str(path))
+    bookings.iloc[20:25].to_csv(path, mode='a', header=False, index=False)
+    assert _anchor(path, state['offset']) == state['anchor']
+
+    data = path.read_bytes()
+    path.write_bytes(data.replace(b'City Hotel', b'Town Hotel', 1))
+    assert _anchor(path, state['offset']) != state['anchor']
+
+
+def test_split_holdout_keeps_the_latest_rows(bookings):
+    train, holdout = split_holdout(bookings.iloc[:100], 0.2)
+    assert (len(train), len(holdout)) == (80, 20)
+    assert holdout.index.tolist() == bookings.index[80:100].tolist()
+    train, holdout = split_holdout(bookings.iloc[:100], 0.0)
+    assert (len(train), len(holdout)) == (100, 0)
+
+
+def test_promote_trains_on_the_held_out_rows_it_moves_past(bookings, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(incremental_refresh, 'MODEL_PATH', str(tmp_path / 'artifacts' / 'best_model.joblib'))
+    base = bookings.iloc[:1000]
+    preprocessor = BookingPreprocessor().fit(base)
+    model = streaming.fit_sgd(preprocessor.transform(base), base[TARGET].to_numpy(), epochs=1)
+    (tmp_path / 'artifacts').mkdir()
+    joblib.dump(preprocessor, incremental_refresh.BASE_PREPROCESSOR)
+    joblib.dump(model, incremental_refresh.BASE_MODEL)
+    path = _write_log(tmp_path / 'log.csv', base)
+    incremental_refresh.main(['--data', str(path)])
+    bookings.iloc[1000:1500].to_csv(path, mode='a', header=False, index=False)
+
+    incremental_refresh.main(['--data', str(path), '--promote', '--holdout', '0.2'])
+    state = incremental_refresh.read_state()
+    record = state['history'][-1]
+    assert (record['rows'], record['holdout_rows'], state['offset']) == (500, 100, log_end(path))
+    saved = joblib.load(state['model']).named_steps['preprocessor']
+    assert saved.n_samples_seen_ == 1500
+    np.testing.assert_allclose(saved.mean_, BookingPreprocessor().fit(bookings.iloc[:1500]).mean_,
+                               rtol=1e-9, atol=1e-12)
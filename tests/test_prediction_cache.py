@@ -0,0 +1,89 @@
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from prediction_cache import CachedPipeline, PredictionCache, feature_keys
+from scoring import save_artifact
+
+
+class CountingModel:
+    """predict_proba on a feature matrix, counting the rows it scores"""
+
+    def __init__(self):
+        self.rows_scored = 0
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        self.rows_scored += len(X)
+        p = 1.0 / (1.0 + np.exp(-X.sum(axis=1)))
+        return np.column_stack([1.0 - p, p])
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2)
+    cache.put_many([b'a', b'b'], [0.1, 0.2])
+    assert cache.get_many([b'a']) == [0.1]
+    cache.put_many([b'c'], [0.3])
+    assert cache.get_many([b'a', b'b', b'c']) == [0.1, None, 0.3]
+    metrics = cache.metrics()
+    assert metrics['evictions'] == 1
+    assert (metrics['hits'], metrics['misses']) == (3, 1)
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl=0.01)
+    cache.put_many([b'a'], [0.5])
+    time.sleep(0.05)
+    assert cache.get_many([b'a']) == [None]
+    assert cache.metrics()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_results_of_an_outdated_model_are_not_stored():
+    cache = PredictionCache(model_version='v2')
+    cache.put_many([b'a'], [0.5], model_version='v1')
+    assert len(cache) == 0
+    cache.invalidate('v3')
+    cache.put_many([b'a'], [0.5], model_version='v3')
+    assert cache.get_many([b'a']) == [0.5]
+
+
+def test_memory_bound_caps_entries():
+    cache = PredictionCache(max_entries=10**9, max_bytes=10_000)
+    assert 0 < cache.max_entries < 10**9
+
+
+def test_feature_keys_ignore_sign_of_zero():
+    assert feature_keys([[0.0, 1.0]]) == feature_keys([[-0.0, 1.0]])
+    assert feature_keys([[0.0, 1.0]]) != feature_keys([[0.0, 2.0]])
+
+
+def test_cached_pipeline_scores_only_misses():
+    model = CountingModel()
+    scorer = CachedPipeline(model, PredictionCache())
+    X = np.random.default_rng(0).normal(size=(20, 3))
+    first = scorer.predict_proba(X)
+    assert model.rows_scored == 20
+    second = scorer.predict_proba(np.vstack([X, X[:1] + 1.0]))
+    assert model.rows_scored == 21
+    np.testing.assert_allclose(first, CountingModel().predict_proba(X))
+    np.testing.assert_allclose(second[:20], first)
+
+
+def test_cached_pipeline_reloads_when_the_artifact_changes(pipeline, bookings, tmp_path):
+    path = str(tmp_path / 'best_model.joblib')
+    save_artifact(pipeline, path)
+    scorer = CachedPipeline.from_path(path, PredictionCache(), check_interval=0.0)
+    rows = bookings.head(50)
+    np.testing.assert_allclose(scorer.predict_proba(rows), pipeline.predict_proba(rows))
+    old_version = scorer.cache.model_version
+
+    preprocessor = pipeline.named_steps['preprocessor']
+    model = clone(pipeline.named_steps['model']).set_params(C=0.01)
+    model.fit(preprocessor.transform(bookings), bookings['is_canceled'])
+    retrained = Pipeline([('preprocessor', preprocessor), ('model', model)])
+    save_artifact(retrained, path)
+
+    np.testing.assert_allclose(scorer.predict_proba(rows), retrained.predict_proba(rows))
+    assert scorer.cache.model_version != old_version
+    assert scorer.cache.metrics()['hits'] == 0
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from features import build_features, take_rows
+from preprocessing import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, BookingPreprocessor
+from scoring import load_pipeline, save_artifact
+
+
+def test_transform_is_standardized(bookings):
+    preprocessor = BookingPreprocessor().fit(bookings)
+    X = preprocessor.transform(bookings)
+    assert X.shape == (len(bookings), len(FEATURE_COLUMNS))
+    assert X.dtype == np.float64
+    varying = preprocessor.var_ > 0
+    np.testing.assert_allclose(X.mean(axis=0), 0.0, atol=1e-9)
+    np.testing.assert_allclose(X[:, varying].std(axis=0), 1.0, rtol=1e-9)
+
+
+def test_unseen_and_missing_categories_get_code_minus_one(bookings):
+    preprocessor = BookingPreprocessor(scale=False).fit(bookings)
+    rows = bookings.head(3).copy()
+    rows['meal'] = rows['meal'].astype(object)
+    rows.loc[rows.index[0], 'meal'] = 'Unseen'
+    rows.loc[rows.index[1], 'meal'] = None
+    codes = preprocessor.transform(rows)[:, FEATURE_COLUMNS.index('meal')]
+    assert codes[0] == -1
+    assert codes[1] == -1
+    assert codes[2] == preprocessor.categories_['meal'].get_loc(rows['meal'].iloc[2])
+
+
+@pytest.mark.parametrize('extra_features', [False, True])
+def test_prebuilt_features_match_raw_rows(bookings, extra_features):
+    positions = np.arange(0, len(bookings), 3)
+    rows = bookings.iloc[positions]
+    cols = take_rows(build_features(bookings, extra_features), positions)
+    from_rows = BookingPreprocessor(extra_features=extra_features).fit(rows)
+    from_cols = BookingPreprocessor(extra_features=extra_features).fit(cols)
+    np.testing.assert_array_equal(from_cols.mean_, from_rows.mean_)
+    np.testing.assert_array_equal(from_cols.transform(cols), from_rows.transform(rows))
+
+
+def test_partial_fit_matches_fit_on_all_rows(bookings):
+    first, second = bookings.iloc[:1200], bookings.iloc[1200:]
+    full = BookingPreprocessor().fit(bookings)
+    incremental = BookingPreprocessor().fit(first).partial_fit(second)
+    assert incremental.n_samples_seen_ == len(bookings)
+    np.testing.assert_allclose(incremental.mean_, full.mean_, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(incremental.var_, full.var_, rtol=1e-9, atol=1e-12)
+
+
+def test_partial_fit_appends_new_categories(bookings):
+    preprocessor = BookingPreprocessor().fit(bookings.iloc[:1000])
+    known = {col: list(preprocessor.categories_[col]) for col in CATEGORICAL_COLUMNS}
+    new_rows = bookings.iloc[1000:].copy()
+    new_rows['meal'] = new_rows['meal'].astype(object)
+    new_rows.loc[new_rows.index[0], 'meal'] = 'Brand new'
+    preprocessor.partial_fit(new_rows)
+    meal = list(preprocessor.categories_['meal'])
+    assert meal[:len(known['meal'])] == known['meal']
+    assert meal[-1] == 'Brand new'
+
+
+def test_partial_fit_on_unfitted_preprocessor_fits(bookings):
+    preprocessor = BookingPreprocessor().partial_fit(bookings)
+    np.testing.assert_allclose(preprocessor.mean_, BookingPreprocessor().fit(bookings).mean_)
+
+
+def test_categorical_codes_match_restored_codes(bookings):
+    preprocessor = BookingPreprocessor().fit(bookings)
+    codes = preprocessor.with_categorical_codes().transform(bookings)
+    restored = preprocessor.restore_codes(preprocessor.transform(bookings))
+    np.testing.assert_array_equal(codes, restored)
+    mask = preprocessor.categorical_mask()
+    assert mask.sum() == len(CATEGORICAL_COLUMNS)
+    meal = codes[:, FEATURE_COLUMNS.index('meal')]
+    np.testing.assert_array_equal(meal, preprocessor.categories_['meal'].get_indexer(bookings['meal'].astype(str)))
+    assert preprocessor.categorical_codes is False
+
+
+def test_chunked_encoding_matches_transform(bookings):
+    # As 02_feature_engineering.py: fit on training chunks, encode test rows
+    # with their own categories and recode them at the end
+    train, test = bookings.iloc[:1500], bookings.iloc[1500:].copy()
+    test['meal'] = test['meal'].astype(object)
+    test.loc[test.index[250], 'meal'] = 'Unseen'
+    preprocessor, vocabulary = BookingPreprocessor(), BookingPreprocessor(scale=False)
+    X_train, X_test = [], []
+    for lo in range(0, 1500, 400):
+        chunk = train.iloc[lo:lo + 400]
+        X_train.append(preprocessor.partial_fit(chunk).encode(chunk))
+    for lo in range(0, 500, 200):
+        chunk = test.iloc[lo:lo + 200]
+        X_test.append(vocabulary.partial_fit(chunk).encode(chunk))
+    X_train = preprocessor.scale_encoded(np.vstack(X_train))
+    X_test = preprocessor.scale_encoded(preprocessor.recode(np.vstack(X_test), vocabulary.categories_))
+    np.testing.assert_allclose(X_train, preprocessor.transform(train), atol=1e-12)
+    np.testing.assert_allclose(X_test, preprocessor.transform(test), atol=1e-12)
+    assert preprocessor.restore_codes(X_test)[250, FEATURE_COLUMNS.index('meal')] == -1
+
+
+def test_missing_required_column_is_rejected(bookings):
+    with pytest.raises((KeyError, ValueError)):
+        BookingPreprocessor().fit(bookings.drop(columns=['lead_time']))
+
+
+def test_saved_pipeline_scores_raw_rows_like_the_fitted_one(pipeline, bookings, tmp_path):
+    path = str(tmp_path / 'best_model.joblib')
+    save_artifact(pipeline, path)
+    rows = bookings.head(100)
+    np.testing.assert_array_equal(load_pipeline(path).predict_proba(rows), pipeline.predict_proba(rows))
@@ -0,0 +1,86 @@
+import re
+import pytest
+import run_pipeline
+from run_pipeline import Stage
+
+SCRIPT = '''
+with open('in.txt') as f:
+    text = f.read()
+with open('out.txt', 'w') as f:
+    f.write(text.upper())
+with open('runs.log', 'a') as f:
+    f.write('run\\n')
+'''
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A one-stage pipeline (in.txt -> out.txt) in a scratch working directory"""
+    script = tmp_path / 'stage.py'
+    script.write_text(SCRIPT)
+    (tmp_path / 'in.txt').write_text('hello')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_pipeline, 'STAGES',
+                        [Stage('upper', str(script), inputs=['in.txt'], outputs=['out.txt'])])
+    return tmp_path
+
+
+def run(capsys, *argv):
+    """Run the pipeline; returns the stage's action"""
+    run_pipeline.main(list(argv))
+    return re.search(r'1\. upper: (\w+)', capsys.readouterr().out).group(1)
+
+
+def runs(project):
+    return (project / 'runs.log').read_text().count('run')
+
+
+def test_unchanged_stage_is_skipped(project, capsys):
+    assert run(capsys) == 'run'
+    assert run(capsys) == 'skip'
+    assert runs(project) == 1
+    assert (project / 'out.txt').read_text() == 'HELLO'
+
+
+def test_reverted_input_is_restored_from_the_cache(project, capsys):
+    run(capsys)
+    (project / 'in.txt').write_text('changed')
+    assert run(capsys) == 'run'
+    assert (project / 'out.txt').read_text() == 'CHANGED'
+    (project / 'in.txt').write_text('hello')
+    assert run(capsys) == 'restore'
+    assert (project / 'out.txt').read_text() == 'HELLO'
+    assert runs(project) == 2
+
+
+def test_deleted_output_is_restored(project, capsys):
+    run(capsys)
+    (project / 'out.txt').unlink()
+    assert run(capsys) == 'restore'
+    assert (project / 'out.txt').read_text() == 'HELLO'
+
+
+def test_output_changed_outside_the_pipeline_is_kept(project, capsys):
+    run(capsys)
+    (project / 'out.txt').write_text('promoted elsewhere')
+    assert run(capsys) == 'keep'
+    (project / 'in.txt').write_text('new data')
+    assert run(capsys) == 'keep'
+    assert (project / 'out.txt').read_text() == 'promoted elsewhere'
+    assert runs(project) == 1
+
+    assert run(capsys, '--force', 'upper') == 'run'
+    assert (project / 'out.txt').read_text() == 'NEW DATA'
+    assert run(capsys) == 'skip'
+
+
+def test_code_change_reruns_the_stage(project, capsys):
+    run(capsys)
+    (project / 'stage.py').write_text(SCRIPT + '\n# edited\n')
+    assert run(capsys) == 'run'
+
+
+def test_stage_args_are_part_of_the_fingerprint(project, capsys):
+    run(capsys)
+    assert run(capsys, '--stage-args', 'upper=--flag') == 'run'
+    assert run(capsys, '--stage-args', 'upper=--flag') == 'skip'
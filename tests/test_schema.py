@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from schema import MONTH_NAMES, SchemaError, apply_schema, check_booking
+from scoring import booking_rows
+
+
+def _raw(bookings):
+    """Untyped copy of a few rows, as read_csv returns them"""
+    return bookings.head(50).astype(object)
+
+
+def test_apply_schema_casts_declared_columns(bookings):
+    df = apply_schema(_raw(bookings))
+    assert df['lead_time'].dtype == np.int16
+    assert df['is_canceled'].dtype == np.int8
+    assert df['adr'].dtype == np.float32
+    assert df['hotel'].dtype == 'category'
+    assert list(df['arrival_date_month'].cat.categories) == MONTH_NAMES
+    assert df['arrival_date_month'].cat.ordered
+
+
+@pytest.mark.parametrize('col, value, message', [
+    ('lead_time', 'soon', 'non-numeric'),
+    ('lead_time', -1, 'outside'),
+    ('adults', 1e6, 'outside'),
+    ('lead_time', None, 'missing'),
+    ('babies', 1.5, 'non-integer'),
+    ('arrival_date_month', 'Smarch', 'unknown'),
+])
+def test_apply_schema_rejects_bad_values(bookings, col, value, message):
+    df = _raw(bookings)
+    df.loc[df.index[3], col] = value
+    with pytest.raises(SchemaError, match=f'{col}: .*{message}'):
+        apply_schema(df)
+
+
+def test_apply_schema_allows_missing_nullable_values(bookings):
+    df = _raw(bookings)
+    df.loc[df.index[0], 'children'] = None
+    assert pd.isna(apply_schema(df)['children'].iloc[0])
+
+
+def test_check_booking_casts_like_apply_schema(bookings):
+    typed = apply_schema(_raw(bookings))
+    for i, record in enumerate(_raw(bookings).head(10).to_dict('records')):
+        checked = check_booking(record)
+        row = typed.iloc[i]
+        assert checked['lead_time'] == row['lead_time'] and isinstance(checked['lead_time'], int)
+        assert checked['adr'] == float(row['adr'])
+
+
+@pytest.mark.parametrize('col, value', [
+    ('lead_time', 'soon'), ('lead_time', -5), ('adults', None), ('babies', 0.5),
+    ('arrival_date_month', 'Smarch'), ('hotel', ['City Hotel']), ('meal', {'a': 1}),
+])
+def test_check_booking_rejects_bad_values(bookings, col, value):
+    record = _raw(bookings).to_dict('records')[0]
+    record[col] = value
+    with pytest.raises(SchemaError, match=col):
+        check_booking(record)
+
+
+def test_check_booking_keeps_missing_nullable_and_unknown_columns():
+    checked = check_booking({'children': None, 'agent': float('nan'), 'note': 'vip'})
+    assert checked == {'children': None, 'agent': None, 'note': 'vip'}
+
+
+def test_service_rows_score_like_loaded_rows(pipeline, bookings, booking_dicts):
+    rows = booking_rows(booking_dicts, pipeline)
+    np.testing.assert_array_equal(pipeline.predict_proba(rows), pipeline.predict_proba(bookings.head(20)))
@@ -0,0 +1,86 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from scoring_service import MicroBatcher, ScoringServer
+
+
+@pytest.fixture
+def server(poisoned_pipeline):
+    batcher = MicroBatcher(poisoned_pipeline, max_batch_size=64, max_wait=0.05)
+    server = ScoringServer(('127.0.0.1', 0), batcher)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, path, body):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    data = body if isinstance(body, bytes) else json.dumps(body).encode()
+    connection.request('POST', path, data, {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    status, payload = response.status, json.loads(response.read())
+    connection.close()
+    return status, payload
+
+
+def test_single_predictions_match_the_pipeline(server, pipeline, bookings, booking_dicts):
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda b: post(server, '/predict', b), booking_dicts))
+    assert [status for status, _ in results] == [200] * len(booking_dicts)
+    probs = [body['cancellation_probability'] for _, body in results]
+    np.testing.assert_allclose(probs, pipeline.predict_proba(bookings.head(20))[:, 1], atol=1e-6)
+
+
+def test_invalid_booking_gets_its_own_400(server, booking_dicts):
+    bad = dict(booking_dicts[0], lead_time='soon')
+    requests = booking_dicts[:8] + [bad]
+    with ThreadPoolExecutor(9) as pool:
+        statuses = [status for status, _ in pool.map(lambda b: post(server, '/predict', b), requests)]
+    assert statuses == [200] * 8 + [400]
+
+
+def test_failing_booking_fails_alone_in_its_micro_batch(server, poisoned_pipeline, booking_dicts):
+    poisoned = dict(booking_dicts[0], lead_time=poisoned_pipeline.POISON_LEAD_TIME)
+    requests = booking_dicts[:8] + [poisoned]
+    with ThreadPoolExecutor(9) as pool:
+        statuses = [status for status, _ in pool.map(lambda b: post(server, '/predict', b), requests)]
+    assert statuses == [200] * 8 + [500]
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'{not json', 'Invalid JSON'),
+    ([1, 2], 'Expected'),
+    ({'lead_time': 5}, 'Missing required columns'),
+])
+def test_malformed_single_requests_get_400(server, body, message):
+    status, payload = post(server, '/predict', body)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_batch_endpoint_names_the_bad_booking(server, booking_dicts):
+    status, payload = post(server, '/predict/batch', {'bookings': booking_dicts[:3]})
+    assert status == 200 and len(payload['predictions']) == 3
+    bad = dict(booking_dicts[1], adults=-1)
+    status, payload = post(server, '/predict/batch', {'bookings': [booking_dicts[0], bad]})
+    assert status == 400
+    assert payload['error'].startswith('Booking 1: adults')
+
+
+def test_latency_percentiles_count_only_successful_requests(server, booking_dicts):
+    post(server, '/predict', booking_dicts[0])
+    post(server, '/predict', b'{not json')
+    post(server, '/predict', {'lead_time': 5})
+    # Requests are recorded just after their response is written
+    tracker = server.single_latency
+    deadline = time.monotonic() + 5
+    while tracker.count + tracker.errors < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    metrics = server.metrics()['predict']
+    assert (metrics['count'], metrics['errors']) == (1, 2)
@@ -0,0 +1,110 @@
+import glob
+import json
+import os
+import pandas as pd
+import pytest
+import sql_runner
+import synthetic
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+-- 1. CANCELLATION BY HOTEL
+SELECT hotel, COUNT(*) AS bookings, SUM(is_canceled) AS canceled
+FROM hotel_bookings
+GROUP BY hotel
+ORDER BY hotel;
+
+-- 2. LONG LEAD TIMES
+SELECT COUNT(*) AS bookings -- trailing comment
+FROM hotel_bookings
+WHERE lead_time > 100;
+"""
+
+
+@pytest.fixture
+def project(bookings, tmp_path):
+    """Bookings CSV and one SQL script in a temp folder"""
+    csv_path = tmp_path / 'data' / 'bookings.csv'
+    csv_path.parent.mkdir()
+    bookings.to_csv(csv_path, index=False)
+    script = tmp_path / 'analysis.sql'
+    script.write_text(SCRIPT)
+    return {'data': str(csv_path), 'script': str(script), 'out': str(tmp_path / 'reports')}
+
+
+def run(project, *extra):
+    sql_runner.main([project['script'], '--data', project['data'], '--out', project['out'],
+                     '--workers', '1', *extra])
+    with open(os.path.join(project['out'], 'timings.json')) as f:
+        return json.load(f)
+
+
+def test_split_queries_names_statements_by_their_headers():
+    queries = sql_runner.split_queries(SCRIPT)
+    assert [(number, title) for number, title, _ in queries] == [
+        (1, 'CANCELLATION BY HOTEL'), (2, 'LONG LEAD TIMES')]
+    assert all(sql.rstrip().endswith(';') for _, _, sql in queries)
+
+
+def test_referenced_columns_keep_dataset_order(bookings):
+    queries = sql_runner.split_queries(SCRIPT)
+    assert sql_runner.referenced_columns(queries, list(bookings.columns)) == [
+        col for col in bookings.columns if col in ('hotel', 'is_canceled', 'lead_time')]
+
+
+def test_results_match_pandas(project, bookings):
+    run(project)
+    stem = os.path.join(project['out'], 'analysis')
+    by_hotel = pd.read_csv(os.path.join(stem, '01_cancellation_by_hotel.csv'))
+    expected = bookings.groupby('hotel', observed=True)['is_canceled'].agg(['count', 'sum'])
+    assert by_hotel['bookings'].tolist() == expected['count'].tolist()
+    assert by_hotel['canceled'].tolist() == expected['sum'].tolist()
+    long_lead = pd.read_csv(os.path.join(stem, '02_long_lead_times.csv'))
+    assert long_lead['bookings'].iloc[0] == int((bookings['lead_time'] > 100).sum())
+
+
+def test_unchanged_queries_are_not_rerun(project):
+    first = run(project)
+    assert first['build_seconds'] is not None
+    assert not any(q['cached'] for q in first['queries'])
+
+    second = run(project)
+    assert second['build_seconds'] is None
+    assert all(q['cached'] for q in second['queries'])
+
+    with open(project['script'], 'w') as f:
+        f.write(SCRIPT.replace('lead_time > 100', 'lead_time > 200'))
+    third = run(project)
+    assert [q['cached'] for q in third['queries']] == [True, False]
+    assert [q['cached'] for q in run(project, '--force')['queries']] == [False, False]
+
+
+def test_database_is_rebuilt_when_the_data_changes(project, bookings):
+    run(project)
+    bookings.head(300).to_csv(project['data'], index=False)
+    report = run(project)
+    assert report['build_seconds'] is not None
+    assert report['rows'] == 300
+    assert not any(q['cached'] for q in report['queries'])
+
+
+def test_feather_input_and_worker_pool(project, tmp_path):
+    path = synthetic.write(synthetic.default_profile(), 1500, str(tmp_path / 'data' / 'b.feather'),
+                           chunksize=600, seed=1)
+    project = {**project, 'data': path}
+    sql_runner.main([project['script'], '--data', path, '--out', project['out'], '--workers', '2'])
+    by_hotel = pd.read_csv(os.path.join(project['out'], 'analysis', '01_cancellation_by_hotel.csv'))
+    assert by_hotel['bookings'].sum() == 1500
+
+
+def test_repository_scripts_run(bookings, tmp_path):
+    csv_path = tmp_path / 'bookings.csv'
+    bookings.to_csv(csv_path, index=False)
+    scripts = sorted(glob.glob(os.path.join(PROJECT_DIR, 'sql', '*.sql')))
+    sql_runner.main([*scripts, '--data', str(csv_path), '--out', str(tmp_path / 'reports'),
+                     '--workers', '1'])
+    with open(tmp_path / 'reports' / 'timings.json') as f:
+        report = json.load(f)
+    assert len(report['queries']) == sum(len(sql_runner.read_queries(s)) for s in scripts)
+    assert all(os.path.exists(q['output']) for q in report['queries'])
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+import streaming
+from scoring import labels_from_proba
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 5)).astype(np.float32)
+    y = (X @ np.array([1.5, -1.0, 0.5, 0.0, 2.0]) + rng.normal(size=3000) > 0.5).astype(np.int8)
+    return X, y
+
+
+def test_chunk_bounds_cover_every_row():
+    assert streaming.chunk_bounds(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert streaming.chunk_bounds(0, 4) == []
+
+
+def test_fit_sgd_learns_with_any_chunk_size(data):
+    X, y = data
+    small = streaming.fit_sgd(X, y, chunk_rows=500, epochs=3)
+    large = streaming.fit_sgd(X, y, chunk_rows=3000, epochs=3)
+    for model in (small, large):
+        assert streaming.evaluate(model, X, y, 0.5, chunk_rows=700)['accuracy'] > 0.8
+
+
+def test_evaluate_matches_sklearn_metrics(data):
+    X, y = data
+    model = streaming.fit_sgd(X, y, chunk_rows=1000, epochs=2)
+    metrics = streaming.evaluate(model, X, y, 0.5, chunk_rows=700)
+    labels = labels_from_proba(model.predict_proba(X.astype(np.float64))[:, 1], 0.5)
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y, labels))
+    assert metrics['f1'] == pytest.approx(f1_score(y, labels))
+
+
+def test_balanced_weights(data):
+    _, y = data
+    weights = streaming.balanced_weights(y, chunk_rows=700)
+    counts = np.bincount(y)
+    np.testing.assert_allclose(weights, len(y) / (2.0 * counts))
+
+
+def test_rescale_inputs_keeps_predictions(data):
+    X, y = data
+    raw = X.astype(np.float64) * np.array([1.0, 3.0, 0.5, 2.0, 1.0]) + 4.0
+    old_mean, old_scale = raw[:1000].mean(axis=0), raw[:1000].std(axis=0)
+    new_mean, new_scale = raw.mean(axis=0), raw.std(axis=0)
+    model = SGDClassifier(**streaming.SGD_PARAMS).fit((raw - old_mean) / old_scale, y)
+    before = model.predict_proba((raw - old_mean) / old_scale)
+    streaming.rescale_inputs(model, old_mean, old_scale, new_mean, new_scale)
+    np.testing.assert_allclose(model.predict_proba((raw - new_mean) / new_scale), before, atol=1e-10)
+
+
+def test_set_coefficients_resumes_partial_fit_from_new_weights(data):
+    X, y = data
+    model = streaming.fit_sgd(X, y, chunk_rows=1000, epochs=1)
+    streaming.set_coefficients(model, np.zeros(X.shape[1]), 0.0)
+    model.partial_fit(X[:1].astype(np.float64), y[:1])
+    assert np.abs(model.coef_).max() < 0.5
+
+
+def test_set_coefficients_refuses_untested_sklearn(data, monkeypatch):
+    X, y = data
+    model = streaming.fit_sgd(X, y, chunk_rows=1000, epochs=1)
+    monkeypatch.setattr(streaming.sklearn, '__version__', '1.10.0')
+    with pytest.raises(RuntimeError, match='scikit-learn'):
+        streaming.set_coefficients(model, model.coef_, model.intercept_)
+
+
+def test_set_coefficients_rejects_a_write_partial_fit_does_not_resume_from(data):
+    X, y = data
+    model = streaming.fit_sgd(X, y, chunk_rows=1000, epochs=1)
+    coef, intercept = np.zeros((1, X.shape[1])), np.zeros(1)
+    # Public attributes only: predictions change, partial_fit resumes from the old weights
+    model.coef_, model.intercept_ = coef, intercept
+    with pytest.raises(RuntimeError, match='does not continue'):
+        streaming.check_resumes(model, coef, intercept)
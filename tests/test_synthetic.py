@@ -0,0 +1,57 @@
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+import synthetic
+from schema import apply_schema
+
+
+@pytest.fixture(scope='module')
+def profile():
+    return synthetic.default_profile()
+
+
+def concat(chunks):
+    return pd.concat(list(chunks), ignore_index=True)
+
+
+def test_chunks_are_reproducible_for_a_fixed_seed_and_chunksize(profile):
+    first = concat(synthetic.generate_chunks(profile, 2500, chunksize=1000, seed=3))
+    second = concat(synthetic.generate_chunks(profile, 2500, chunksize=1000, seed=3))
+    assert len(first) == 2500
+    pd.testing.assert_frame_equal(first, second)
+    other_seed = concat(synthetic.generate_chunks(profile, 2500, chunksize=1000, seed=4))
+    assert not first.equals(other_seed)
+
+
+def test_chunk_sizes(profile):
+    sizes = [len(chunk) for chunk in synthetic.generate_chunks(profile, 2500, chunksize=1000)]
+    assert sizes == [1000, 1000, 500]
+
+
+def test_zero_rows_yield_one_empty_chunk_with_all_columns(profile):
+    chunks = list(synthetic.generate_chunks(profile, 0, chunksize=1000))
+    assert len(chunks) == 1
+    assert chunks[0].empty
+    assert list(chunks[0].columns) == synthetic.COLUMNS
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.feather'])
+@pytest.mark.parametrize('rows', ['0', '2500'])
+def test_cli_writes_rows_in_chunks(tmp_path, suffix, rows):
+    out = str(tmp_path / f'bookings{suffix}')
+    synthetic.main(['--rows', rows, '--out', out, '--chunksize', '1000', '--seed', '3'])
+    df = pd.read_csv(out) if suffix == '.csv' else feather.read_feather(out)
+    assert len(df) == int(rows)
+    assert list(df.columns) == synthetic.COLUMNS
+    if int(rows):
+        apply_schema(df)  # generated values pass the booking schema
+
+
+def test_csv_and_feather_hold_the_same_rows(profile, tmp_path):
+    csv_path = synthetic.write(profile, 1500, str(tmp_path / 'b.csv'), chunksize=700, seed=1)
+    feather_path = synthetic.write(profile, 1500, str(tmp_path / 'b.feather'), chunksize=700, seed=1)
+    from_csv = pd.read_csv(csv_path)
+    from_feather = feather.read_feather(feather_path)
+    for col in ['lead_time', 'is_canceled', 'adr']:
+        pd.testing.assert_series_equal(from_csv[col], from_feather[col], check_dtype=False)
+    assert (from_csv['hotel'] == from_feather['hotel'].astype(str)).all()
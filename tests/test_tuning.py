@@ -0,0 +1,71 @@
+import json
+import pytest
+import tuning
+from feature_store import save_matrices
+from preprocessing import model_features
+
+MODEL = 'Logistic Regression'
+SEARCH = dict(n_candidates=4, n_splits=2, factor=2, min_resources=500, workers=1, verbose=False)
+
+
+@pytest.fixture
+def feature_dir(pipeline, bookings, tmp_path):
+    X = pipeline.named_steps['preprocessor'].transform(bookings)
+    y = bookings['is_canceled']
+    out = str(tmp_path / 'features')
+    save_matrices(X[:1600], X[1600:], y[:1600], y[1600:], model_features(),
+                  train_index=range(1600), test_index=range(1600, len(y)), out_dir=out)
+    return out
+
+
+def read_log(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def read_log_lenient(path):
+    """Records of the log, skipping lines that are not valid JSON"""
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+    return records
+
+
+def test_rerun_resumes_every_fold_from_the_log(feature_dir, tmp_path):
+    log = str(tmp_path / 'tuning_results.jsonl')
+    first = tuning.tune(MODEL, feature_dir, log, **SEARCH)
+    records = read_log(log)
+    assert len(records) == sum(r['candidates'] for r in first['rungs']) * SEARCH['n_splits']
+
+    second = tuning.tune(MODEL, feature_dir, log, **SEARCH)
+    assert second == first
+    assert len(read_log(log)) == len(records)
+
+
+def test_interrupted_search_refits_only_the_missing_folds(feature_dir, tmp_path):
+    log = str(tmp_path / 'tuning_results.jsonl')
+    first = tuning.tune(MODEL, feature_dir, log, **SEARCH)
+    with open(log) as f:
+        lines = f.readlines()
+    # Drop the last three folds and leave a half-written line behind
+    with open(log, 'w') as f:
+        f.writelines(lines[:-3])
+        f.write(lines[-3][:20])
+
+    resumed = tuning.tune(MODEL, feature_dir, log, **SEARCH)
+    assert resumed == first
+    assert len(read_log_lenient(log)) == len(lines)
+
+
+def test_results_of_another_search_are_not_reused(feature_dir, tmp_path):
+    log = str(tmp_path / 'tuning_results.jsonl')
+    tuning.tune(MODEL, feature_dir, log, **SEARCH)
+    n_first = len(read_log(log))
+    tuning.tune(MODEL, feature_dir, log, **{**SEARCH, 'seed': 7})
+    searches = {record['search'] for record in read_log(log)}
+    assert len(searches) == 2
+    assert len(read_log(log)) > n_first